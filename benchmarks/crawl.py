@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+"""
+End-to-end crawl benchmark of the news_crawler spiders against a synthetic local news site, without network access.
+
+Usage:
+    python -m benchmarks.crawl [cnn axios ...] [--articles N] [--fanout N] [--output results.json] [--baseline results.json]
+
+Each spider crawls its outlet of the synthetic site in a separate process, with the project settings (pipelines and
+extensions included), and the pages/s, items/s, CPU time per page, and peak RSS of the crawl are reported.
+"""
+
+import os
+import sys
+import json
+import shutil
+import argparse
+import resource
+import importlib
+import multiprocessing
+from time import perf_counter
+from scrapy.spiders import Rule
+from scrapy.crawler import CrawlerProcess
+from scrapy.utils.project import get_project_settings
+from news_crawler.linkextractors import CompiledLinkExtractor
+from news_crawler.spiderloader import LazySpiderLoader
+from benchmarks.synthetic import ArticleTemplate, SyntheticSite, serve
+from typing import Dict, List
+
+# Settings module of the benchmarked crawls, used by every component of the crawl
+SETTINGS_MODULE = 'benchmarks.settings'
+
+# Reported metrics of each crawl
+METRICS = ('pages/s', 'items/s', 'cpu ms/page', 'peak rss MB')
+
+
+def load_spiders(names: List[str]) -> Dict[str, type]:
+    """ Returns the spider classes of the given outlets (all outlets, if none is given). """
+    loader = LazySpiderLoader.from_settings(get_project_settings())
+    spiders = dict()
+    for name in names or loader.list():
+        try:
+            spiders[name] = loader.load(name)
+        except KeyError:
+            raise SystemExit('Unknown spider: {}'.format(name))
+    return spiders
+
+
+def run_crawl(spider_name: str, base_url: str, settings: Dict, results):
+    """ Crawls the spider's outlet of the synthetic site, and puts the crawl's metrics in the results queue. """
+    os.environ['SCRAPY_SETTINGS_MODULE'] = SETTINGS_MODULE
+    spidercls = LazySpiderLoader.from_settings(get_project_settings()).load(spider_name)
+
+    class BenchmarkSpider(spidercls):
+        allowed_domains = ['127.0.0.1', 'localhost']
+        start_urls = [base_url + '/{}/'.format(spider_name)]
+        rules = (Rule(CompiledLinkExtractor(allow=(r'\/{}\/'.format(spider_name),)), callback='parse_item', follow=True),)
+
+    project_settings = get_project_settings()
+    for name, value in settings.items():
+        project_settings.set(name, value)
+    process = CrawlerProcess(project_settings, install_root_handler=False)
+    crawler = process.create_crawler(BenchmarkSpider)
+    process.crawl(crawler)
+
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    start = perf_counter()
+    process.start()
+    elapsed = perf_counter() - start
+    end_usage = resource.getrusage(resource.RUSAGE_SELF)
+
+    stats = crawler.stats.get_stats()
+    pages = stats.get('response_received_count', 0)
+    items = stats.get('item_scraped_count', 0)
+    cpu = (end_usage.ru_utime - usage.ru_utime) + (end_usage.ru_stime - usage.ru_stime)
+    results.put({
+            'pages': pages,
+            'items': items,
+            'seconds': round(elapsed, 3),
+            'pages/s': round(pages / elapsed, 2),
+            'items/s': round(items / elapsed, 2),
+            'cpu ms/page': round(1000 * cpu / max(pages, 1), 3),
+            'peak rss MB': round(end_usage.ru_maxrss / 1024, 1)
+            })
+
+
+def main():
+    parser = argparse.ArgumentParser(description='End-to-end crawl benchmark against a synthetic local news site.')
+    parser.add_argument('spiders', nargs='*', help='outlets to benchmark (default: all)')
+    parser.add_argument('--articles', type=int, default=500, help='articles per outlet (default: 500)')
+    parser.add_argument('--fanout', type=int, default=20, help='articles linked from each hub page (default: 20)')
+    parser.add_argument('--paragraphs', type=int, default=12, help='paragraphs per article (default: 12)')
+    parser.add_argument('--paragraph-tokens', type=int, default=60, help='tokens per paragraph (default: 60)')
+    parser.add_argument('--keyword-density', type=float, default=0.005, help='fraction of tokens starting a keyword (default: 0.005)')
+    parser.add_argument('--out-of-range', type=float, default=0.1, help='fraction of articles dated outside the crawled range (default: 0.1)')
+    parser.add_argument('--padding', type=int, default=50000, help='bytes of inline script per article (default: 50000)')
+    parser.add_argument('--concurrency', type=int, default=16, help='concurrent requests (default: 16)')
+    parser.add_argument('--port', type=int, default=8770, help='port of the synthetic site (default: 8770)')
+    parser.add_argument('--output', help='write the results to this json file')
+    parser.add_argument('--baseline', help='compare the results with a previous json file')
+    parser.add_argument('--keep', action='store_true', help='keep the crawled data in data/benchmark')
+    args = parser.parse_args()
+
+    spiders = load_spiders(args.spiders)
+    templates = dict()
+    for name, spidercls in spiders.items():
+        template = ArticleTemplate.for_spider(spidercls)
+        if template is None:
+            print('Skipping {}: its spider rejects the synthetic articles'.format(name), file=sys.stderr)
+        else:
+            templates[name] = template
+
+    site = SyntheticSite(templates, articles=args.articles, fanout=args.fanout, paragraphs=args.paragraphs, paragraph_tokens=args.paragraph_tokens,
+            keyword_density=args.keyword_density, out_of_range=args.out_of_range, padding=args.padding)
+
+    # Fork the server once the site is set up; the crawls run in fresh processes, such that their peak RSS is their own
+    context = multiprocessing.get_context('fork')
+    ready = context.Event()
+    server = context.Process(target=serve, args=(site, '127.0.0.1', args.port, ready.set), daemon=True)
+    server.start()
+    ready.wait(10)
+
+    data_folder = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', 'data', importlib.import_module(SETTINGS_MODULE).TOPIC)
+    settings = {'CONCURRENT_REQUESTS': args.concurrency}
+    spawn = multiprocessing.get_context('spawn')
+    results = dict()
+    try:
+        for name in templates:
+            if os.path.isdir(data_folder) and not args.keep:
+                shutil.rmtree(data_folder)
+            queue = spawn.Queue()
+            crawl = spawn.Process(target=run_crawl, args=(name, 'http://127.0.0.1:{}'.format(args.port), settings, queue))
+            crawl.start()
+            crawl.join()
+            if queue.empty():
+                print('Crawl of {} failed'.format(name), file=sys.stderr)
+                continue
+            results[name] = queue.get()
+    finally:
+        server.terminate()
+        if os.path.isdir(data_folder) and not args.keep:
+            shutil.rmtree(data_folder)
+
+    baseline = dict()
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+
+    print('{:<24}{:>8}{:>8}'.format('spider', 'pages', 'items') + ''.join('{:>20}'.format(metric) for metric in METRICS))
+    for name, result in results.items():
+        row = '{:<24}{:>8}{:>8}'.format(name, result['pages'], result['items'])
+        for metric in METRICS:
+            cell = '{:g}'.format(result[metric])
+            if name in baseline and baseline[name].get(metric):
+                cell += ' ({:+.0%})'.format(result[metric] / baseline[name][metric] - 1)
+            row += '{:>20}'.format(cell)
+        print(row)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'parameters': vars(args), 'results': results}, f, indent=2, sort_keys=True)
+
+
+if __name__ == '__main__':
+    main()
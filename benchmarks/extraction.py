@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""
+Per-outlet extraction benchmark: times each spider's `parse_item` on fixture pages, without network access.
+
+Usage:
+    python -m benchmarks.extraction [cnn axios ...] [--record data/$TOPIC] [--output results.json] [--baseline results.json]
+
+The fixture pages of an outlet are stored in `benchmarks/fixtures/$OUTLET` (recorded from the HTML archive of a crawl
+with `--record`). Outlets without recorded pages fall back to pages of the synthetic news site, which are rendered from
+the spider's own XPaths and thus cannot catch regressions on the outlet's real markup; they are marked in the output, and
+skipped with `--recorded-only`. The ms/page, the peak memory allocated per page, and the number of extracted items are
+reported for each outlet.
+"""
+
+import os
+import sys
+import json
+import argparse
+import tracemalloc
+from itertools import islice
+from scrapy.http import HtmlResponse
+from news_crawler.archive import iter_html_archive
+from benchmarks.crawl import load_spiders
+from benchmarks.micro import measure
+from benchmarks.synthetic import ArticleTemplate, SyntheticSite
+from typing import List, Tuple
+
+# Folder of the fixture pages, one subfolder per outlet
+FIXTURES_FOLDER = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'fixtures')
+
+# Fixture page: url and body
+Fixture = Tuple[str, bytes]
+
+
+def load_fixtures(outlet: str) -> List[Fixture]:
+    """ Returns the fixture pages of the outlet, in the order they were recorded. """
+    folder = os.path.join(FIXTURES_FOLDER, outlet)
+    if not os.path.exists(os.path.join(folder, 'urls.json')):
+        return list()
+    with open(os.path.join(folder, 'urls.json')) as f:
+        urls = json.load(f)
+    fixtures = list()
+    for file, url in urls.items():
+        with open(os.path.join(folder, file), 'rb') as f:
+            fixtures.append((url, f.read()))
+    return fixtures
+
+
+def record_fixtures(outlet: str, folder: str, pages: int) -> int:
+    """ Stores the first pages of the outlet's HTML archive (i.e. `$FOLDER/$OUTLET`) as its fixtures. """
+    archive = os.path.join(folder, outlet)
+    if not os.path.isdir(os.path.join(archive, 'html')):
+        return 0
+    fixtures_folder = os.path.join(FIXTURES_FOLDER, outlet)
+    if not os.path.isdir(fixtures_folder):
+        os.makedirs(fixtures_folder)
+    urls = dict()
+    for i, (url, _, body) in enumerate(islice(iter_html_archive(archive), pages)):
+        file = '{}.html'.format(i)
+        with open(os.path.join(fixtures_folder, file), 'wb') as f:
+            f.write(body)
+        urls[file] = url
+    with open(os.path.join(fixtures_folder, 'urls.json'), 'w') as f:
+        json.dump(urls, f, indent=2)
+    return len(urls)
+
+
+def synthetic_fixtures(spidercls, pages: int) -> List[Fixture]:
+    """ Returns pages of the synthetic news site for the outlet, or no pages if its spider rejects them. """
+    template = ArticleTemplate.for_spider(spidercls)
+    if template is None:
+        return list()
+    site = SyntheticSite({spidercls.name: template}, articles=pages, out_of_range=0)
+    paths = ['/{}/article/{}.html'.format(spidercls.name, i) for i in range(pages)]
+    return [('http://localhost' + path, site.page(path)[1]) for path in paths]
+
+
+def parse(spider, fixtures: List[Fixture]) -> int:
+    """ Runs the spider's `parse_item` on fresh responses of the fixtures, and returns the number of items. """
+    items = 0
+    for url, body in fixtures:
+        items += len(list(spider.parse_item(HtmlResponse(url=url, body=body, encoding='utf-8')) or ()))
+    return items
+
+
+def peak_allocations(spider, fixtures: List[Fixture]) -> float:
+    """ Returns the mean peak memory (in KiB) allocated while parsing a fixture. """
+    tracemalloc.start()
+    total = 0
+    for fixture in fixtures:
+        tracemalloc.reset_peak()
+        current = tracemalloc.get_traced_memory()[0]
+        parse(spider, [fixture])
+        total += tracemalloc.get_traced_memory()[1] - current
+    tracemalloc.stop()
+    return total / len(fixtures) / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-outlet benchmark of the spiders' parse_item on fixture pages.")
+    parser.add_argument('spiders', nargs='*', help='outlets to benchmark (default: all)')
+    parser.add_argument('--record', metavar='FOLDER', help='record the fixtures from the HTML archive of a crawl (e.g. data/$TOPIC), then benchmark them')
+    parser.add_argument('--recorded-only', action='store_true', help='skip the outlets without recorded fixtures, instead of using synthetic pages')
+    parser.add_argument('--pages', type=int, default=5, help='fixture pages per outlet, recorded or synthetic (default: 5)')
+    parser.add_argument('--min-time', type=float, default=0.2, help='minimum seconds per measurement (default: 0.2)')
+    parser.add_argument('--output', help='write the results to this json file')
+    parser.add_argument('--baseline', help='compare the results with a previous json file')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='maximum slowdown relative to the baseline (default: 0.25)')
+    args = parser.parse_args()
+
+    baseline = dict()
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+
+    results, failures, synthetic = dict(), list(), list()
+    print('{:<24}{:>10}{:>8}{:>8}{:>16}{:>16}'.format('spider', 'fixtures', 'pages', 'items', 'ms/page', 'peak KiB/page'))
+    for name, spidercls in load_spiders(args.spiders).items():
+        if args.record:
+            record_fixtures(name, args.record, args.pages)
+        fixtures, source = load_fixtures(name), 'recorded'
+        if not fixtures and not args.recorded_only:
+            fixtures, source = synthetic_fixtures(spidercls, args.pages), 'synthetic'
+        if not fixtures:
+            print('Skipping {}: no {}fixtures'.format(name, 'recorded ' if args.recorded_only else ''), file=sys.stderr)
+            continue
+        if source == 'synthetic':
+            synthetic.append(name)
+
+        spider = spidercls()
+        try:
+            items = parse(spider, fixtures)
+        except Exception as e:
+            failures.append('{}: parse_item raised {!r}'.format(name, e))
+            print('{:<24}{:>10}{:>8}{:>8}{:>16}'.format(name, source + ('*' if source == 'synthetic' else ''), len(fixtures), '-', 'error'))
+            continue
+        ms = 1000 * measure(lambda: parse(spider, fixtures), args.min_time) / len(fixtures)
+        allocated = peak_allocations(spider, fixtures)
+        results[name] = {'fixtures': source, 'pages': len(fixtures), 'items': items, 'ms/page': round(ms, 3), 'peak KiB/page': round(allocated, 1)}
+
+        change = ''
+        if name in baseline and baseline[name]['fixtures'] == source:
+            change = ' ({:+.0%})'.format(ms / baseline[name]['ms/page'] - 1)
+            if ms > baseline[name]['ms/page'] * (1 + args.tolerance):
+                failures.append('{}: {:.3f} ms/page, {:.0%} slower than the baseline'.format(name, ms, ms / baseline[name]['ms/page'] - 1))
+        print('{:<24}{:>10}{:>8}{:>8}{:>16}{:>16.1f}'.format(name, source + ('*' if source == 'synthetic' else ''), len(fixtures), items, '{:.3f}{}'.format(ms, change), allocated))
+
+    if synthetic:
+        print('* No recorded fixtures: benchmarked on synthetic pages rendered from the spider\'s XPaths, which do not '
+              'reflect the outlet\'s markup ({}). Record them with --record data/$TOPIC.'.format(', '.join(synthetic)), file=sys.stderr)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'parameters': vars(args), 'results': results}, f, indent=2, sort_keys=True)
+
+    for failure in failures:
+        print('FAIL ' + failure, file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
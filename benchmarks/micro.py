@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+"""
+Micro-benchmarks of the article validation and body segmentation of the news_crawler spiders.
+
+Usage:
+    python -m benchmarks.micro [--sizes 100 1000 ...] [--recorded data/$TOPIC] [--output results.json] [--baseline results.json]
+
+Each benchmark runs on generated texts of increasing size, with several keyword densities, with and without compound
+keywords. The ops/s of each run and the scaling exponent of each benchmark (i.e. the slope of the run time over the
+number of tokens, on a log-log scale) are reported. The suite fails if an exponent exceeds `--max-exponent` (e.g. a
+quadratic regression), or if a run is slower than its baseline by more than `--tolerance`.
+"""
+
+import os
+import sys
+import json
+import glob
+import math
+import argparse
+from random import Random
+from time import perf_counter
+from lxml import html
+from scrapy.utils.project import get_project_settings
+from news_crawler.spiders import BaseSpider
+from news_crawler.keywords import KeywordMatcher
+from news_crawler.extraction import segment_paragraphs
+from benchmarks.synthetic import generate_text
+from typing import Callable, Dict, List, Tuple
+
+# Tokens per generated paragraph, and paragraphs per generated section (i.e. between two headlines)
+PARAGRAPH_TOKENS = 50
+SECTION_PARAGRAPHS = 5
+
+
+class BenchmarkSpider(BaseSpider):
+    """ Spider validating the benchmarked texts with the project's keywords and thresholds. """
+    name = 'benchmark'
+
+
+def measure(function: Callable[[], object], min_time: float = 0.2, repeat: int = 3) -> float:
+    """ Returns the best time (in seconds) of a call, over `repeat` rounds of at least `min_time` seconds. """
+    number = 1
+    while True:
+        start = perf_counter()
+        for _ in range(number):
+            function()
+        elapsed = perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 2 if elapsed == 0 else max(2, int(min_time / elapsed))
+
+    best = elapsed / number
+    for _ in range(repeat - 1):
+        start = perf_counter()
+        for _ in range(number):
+            function()
+        best = min(best, (perf_counter() - start) / number)
+    return best
+
+
+def scaling_exponent(points: List[Tuple[int, float]]) -> float:
+    """ Returns the least-squares slope of log(time) over log(tokens). """
+    xs = [math.log(tokens) for (tokens, _) in points]
+    ys = [math.log(seconds) for (_, seconds) in points]
+    mean_x, mean_y = sum(xs) / len(xs), sum(ys) / len(ys)
+    variance = sum((x - mean_x) ** 2 for x in xs)
+    return sum((x - mean_x) * (y - mean_y) for (x, y) in zip(xs, ys)) / variance if variance else 0.0
+
+
+def configure_keywords(spider: BenchmarkSpider, keywords: List[str], compound: bool):
+    """ Sets the keywords of the spider's topics, keeping or leaving out the compound ones. """
+    for profile in spider.topics:
+        profile.compound_keywords = [keyword for keyword in keywords if len(keyword.split()) > 1] if compound else list()
+        profile.keywords = [keyword for keyword in keywords if len(keyword.split()) == 1]
+    spider.keyword_matcher = KeywordMatcher(spider.topics)
+
+
+def validation(spider: BenchmarkSpider, check: Callable[[object], bool], text: object) -> Callable[[], bool]:
+    """ Returns a call of the spider's validation method on the text as a new article, i.e. with all topics as candidates. """
+    def call():
+        spider.start_article()
+        return check(text)
+    return call
+
+
+def segmentation_input(tokens: List[str]) -> Tuple[List, List]:
+    """ Renders the tokens as paragraphs with a headline before every section, and returns the body and headline nodes. """
+    paragraphs = [' '.join(tokens[i:i+PARAGRAPH_TOKENS]) for i in range(0, len(tokens), PARAGRAPH_TOKENS)]
+    markup = ''.join(('<h2>Section {}</h2>'.format(i // SECTION_PARAGRAPHS) if i % SECTION_PARAGRAPHS == 0 else '') + '<p>{}</p>'.format(paragraph)
+            for (i, paragraph) in enumerate(paragraphs))
+    root = html.fromstring('<html><body>{}</body></html>'.format(markup))
+    return root.xpath('//p | //h2'), root.xpath('//h2')
+
+
+def benchmarks(spider: BenchmarkSpider, tokens: List[str]) -> Dict[str, Callable[[], object]]:
+    """ Returns the benchmarked calls on the given text. """
+    text = ' '.join(tokens)
+    lowercased = text.lower().split()
+    nodes, headline_nodes = segmentation_input(tokens)
+    return {
+            'has_valid_keywords': validation(spider, spider.has_valid_keywords, text),
+            '_has_valid_keywords': validation(spider, spider._has_valid_keywords, lowercased),
+            'has_min_length': validation(spider, spider.has_min_length, text),
+            'segment_paragraphs': lambda: segment_paragraphs(nodes, headline_nodes)
+            }
+
+
+def recorded_texts(folder: str) -> List[List[str]]:
+    """ Returns the tokens of the articles stored by the :obj:`JsonWriterPipeline` in the given topic or outlet folder. """
+    texts = list()
+    for path in sorted(glob.glob(os.path.join(folder, '**', 'json', '*.json'), recursive=True)):
+        with open(path) as f:
+            item = json.load(f)
+        paragraphs = [paragraph for paragraphs in item['content']['body'].values() for paragraph in paragraphs]
+        texts.append(' '.join(paragraphs).split())
+    return texts
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Micro-benchmarks of the article validation and body segmentation.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 5000, 20000, 50000], help='tokens of the generated texts (default: 100 to 50000)')
+    parser.add_argument('--densities', type=float, nargs='+', default=[0.001, 0.01], help='keyword densities of the generated texts (default: 0.001 0.01)')
+    parser.add_argument('--recorded', help='folder of stored articles (e.g. data/$TOPIC), benchmarked in addition to the generated texts')
+    parser.add_argument('--min-time', type=float, default=0.2, help='minimum seconds per measurement (default: 0.2)')
+    parser.add_argument('--max-exponent', type=float, default=1.3, help='maximum scaling exponent over texts of at least 1000 tokens (default: 1.3)')
+    parser.add_argument('--output', help='write the results to this json file')
+    parser.add_argument('--baseline', help='compare the results with a previous json file')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='maximum slowdown relative to the baseline (default: 0.25)')
+    args = parser.parse_args()
+
+    settings = get_project_settings()
+    keywords = settings.getlist('KEYWORDS')
+    spider = BenchmarkSpider()
+    results, failures = dict(), list()
+
+    print('{:<48}{:>10}{:>16}'.format('benchmark', 'tokens', 'ops/s'))
+    for compound in (False, True):
+        configure_keywords(spider, keywords, compound)
+        for density in args.densities:
+            points = dict()
+            for size in sorted(args.sizes):
+                tokens = generate_text(Random(size), size, keywords, density)
+                for name, function in benchmarks(spider, tokens).items():
+                    key = '{} density={:g}{}'.format(name, density, ' compound' if compound else '')
+                    seconds = measure(function, args.min_time)
+                    points.setdefault(key, list()).append((size, seconds))
+                    results['{} tokens={}'.format(key, size)] = round(1 / seconds, 2)
+                    print('{:<48}{:>10}{:>16.2f}'.format(key, size, 1 / seconds))
+
+            for key, key_points in points.items():
+                exponent = scaling_exponent([(size, seconds) for (size, seconds) in key_points if size >= 1000])
+                results['{} exponent'.format(key)] = round(exponent, 3)
+                status = 'ok' if exponent <= args.max_exponent else 'FAIL'
+                print('{:<48}{:>26}'.format(key, 'exponent {:.2f} {}'.format(exponent, status)))
+                if exponent > args.max_exponent:
+                    failures.append('{}: scaling exponent {:.2f} exceeds {:g}'.format(key, exponent, args.max_exponent))
+
+    if args.recorded:
+        texts = recorded_texts(args.recorded)
+        if texts:
+            configure_keywords(spider, keywords, True)
+            num_tokens = sum(len(tokens) for tokens in texts)
+            calls = [benchmarks(spider, tokens) for tokens in texts]
+            for name in calls[0]:
+                seconds = measure(lambda: [functions[name]() for functions in calls], args.min_time)
+                key = '{} recorded'.format(name)
+                results['{} tokens={}'.format(key, num_tokens)] = round(len(texts) / seconds, 2)
+                print('{:<48}{:>10}{:>16.2f}'.format(key, num_tokens, len(texts) / seconds))
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+        for key, ops in results.items():
+            if key.endswith('exponent') or key not in baseline:
+                continue
+            if ops < baseline[key] * (1 - args.tolerance):
+                failures.append('{}: {:.2f} ops/s, {:.0%} slower than the baseline'.format(key, ops, 1 - ops / baseline[key]))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'parameters': vars(args), 'results': results}, f, indent=2, sort_keys=True)
+
+    for failure in failures:
+        print('FAIL ' + failure, file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
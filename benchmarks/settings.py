@@ -0,0 +1,12 @@
+# -*- coding: utf-8 -*-
+# Settings of the benchmarked crawls: the project settings, with the crawled data stored in data/benchmark
+
+from news_crawler.settings import *
+
+TOPIC = 'benchmark'
+
+DOWNLOAD_DELAY = 0
+AUTOTHROTTLE_ENABLED = False
+HTTPCACHE_ENABLED = False
+TELNETCONSOLE_ENABLED = False
+LOG_LEVEL = 'WARNING'
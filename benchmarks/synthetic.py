@@ -0,0 +1,383 @@
+# -*- coding: utf-8 -*-
+# Synthetic news site for the news_crawler benchmarks
+
+import re
+import json
+import inspect
+from html import escape
+from random import Random
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from scrapy.http import HtmlResponse
+from scrapy.utils.project import get_project_settings
+from news_crawler.utils import DATE_FORMAT, parse_date
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Words of the generated texts; none of them contains a keyword stem
+VOCABULARY = (
+        'the of and to in a is that for it as was with be by on not he this are or his from at which but have an they '
+        'you were her she there one all we their been has when who will more no if out so said what up its about into '
+        'than them can only other new some could time these two may then do first any my now such like our over man me '
+        'even most made after also did many before must through back years where much your way well down should because '
+        'each just those people how too little state good very make world still own see men work long get here between '
+        'both life being under never day same another know while last might us great old year off come since against go '
+        'came right used take three government policy city council report week minister official border court law vote '
+        'election economy budget health school family police support public country service plan group party members'
+        ).split()
+
+# Fields rendered as dates and names
+DATE_FIELDS = ('creation_date', 'last_modified')
+AUTHOR_FIELDS = ('authors',)
+
+# Date formats tried for every outlet, in addition to the formats found in its spider's source
+DATE_RENDERINGS = ('%Y-%m-%dT%H:%M:%S+00:00', '%Y-%m-%d', '%Y-%m-%dT%H:%M:%SZ', '%B %d, %Y', '%B %d, %Y, %I:%M %p', '%d.%m.%Y')
+
+# HTML elements without content
+VOID_ELEMENTS = {'meta', 'link', 'img', 'br', 'hr', 'input'}
+
+
+def generate_text(rng: Random, num_tokens: int, keywords: List[str], keyword_density: float) -> List[str]:
+    """
+    Generates the tokens of an article, with keywords spread at random positions.
+
+    Args:
+        rng (:obj:`Random`):
+            The random number generator.
+        num_tokens (:obj:`int`):
+            Number of tokens of the text.
+        keywords (:obj:`List[str]`):
+            The keywords (single or compound) inserted in the text.
+        keyword_density (:obj:`float`):
+            Fraction of the tokens starting a keyword.
+
+    Returns:
+        :obj:`List[str]`:
+            The tokens of the text.
+    """
+    tokens = [rng.choice(VOCABULARY) for _ in range(num_tokens)]
+    num_keywords = int(round(num_tokens * keyword_density))
+    for i, position in enumerate(sorted(rng.sample(range(num_tokens), min(num_keywords, num_tokens)))):
+        keyword = keywords[i % len(keywords)].split()
+        tokens[position:position+len(keyword)] = keyword
+    return tokens[:num_tokens]
+
+
+def _split_outside(expression: str, separators: Tuple[str, ...]) -> List[str]:
+    """ Splits an XPath expression on the given separators, outside of predicates, parentheses, and string literals. """
+    parts, depth, quote, start, i = list(), 0, None, 0, 0
+    while i < len(expression):
+        char = expression[i]
+        if quote:
+            quote = None if char == quote else quote
+        elif char in '"\'':
+            quote = char
+        elif char in '[(':
+            depth += 1
+        elif char in '])':
+            depth -= 1
+        elif depth == 0:
+            separator = next((s for s in separators if expression.startswith(s, i)), None)
+            if separator:
+                parts.append(expression[start:i])
+                i += len(separator)
+                start = i
+                continue
+        i += 1
+    parts.append(expression[start:])
+    return parts
+
+
+class ElementPath(object):
+    """
+    Markup matched by the first alternative of an XPath expression, i.e. the nested elements with the attributes
+    required by its predicates, and the attribute or text holding the value. Negated predicates are ignored.
+
+    Args:
+        expression (:obj:`str`):
+            The XPath expression (e.g. `//div[@class="entry-content"]/p` or `//meta[@name="author"]/@content`).
+    """
+
+    def __init__(self, expression: str):
+        self.elements: List[Tuple[str, Dict[str, str]]] = list()
+        self.attribute: Optional[str] = None
+
+        branch = _split_outside(expression, ('|',))[0].strip()
+        for step in _split_outside(branch, ('//', '/')):
+            step = step.strip()
+            if not step:
+                continue
+            if step.startswith('@'):
+                self.attribute = step[1:]
+            elif step != 'text()':
+                name, predicates = (step.split('[', 1) + [''])[:2]
+                name = name.replace('child::', '').strip()
+                self.elements.append(('div' if name == '*' else name, self._attributes('[' + predicates if predicates else '')))
+
+    @staticmethod
+    def _attributes(predicates: str) -> Dict[str, str]:
+        attributes = dict()
+        for predicate in re.findall(r'\[(.*?)\](?=\[|$)', predicates):
+            for term in _split_outside(predicate, (' and ',)):
+                term = _split_outside(term.strip(), (' or ',))[0].strip()
+                match = re.match(r'^@\s*([\w:-]+)\s*=\s*["\'](.*)["\']$', term) or re.match(r'^contains\(\s*@([\w:-]+)\s*,\s*["\'](.*)["\']\s*\)$', term)
+                if match:
+                    name, value = match.groups()
+                    attributes[name] = (attributes[name] + ' ' + value) if name in attributes else value
+                elif re.match(r'^@[\w:-]+$', term):
+                    attributes[term[1:]] = term[1:]
+        return attributes
+
+    @property
+    def in_head(self) -> bool:
+        return bool(self.elements) and self.elements[0][0] == 'meta'
+
+    def render(self, values: List[str]) -> str:
+        """ Renders the markup holding the values; multiple values repeat the innermost element. """
+        if not self.elements:
+            return ''
+        *parents, (tag, attributes) = self.elements
+        leaves = list()
+        for value in values:
+            leaf_attributes = dict(attributes)
+            if self.attribute:
+                leaf_attributes[self.attribute] = value
+            content = '' if self.attribute else escape(value)
+            leaves.append(self._element(tag, leaf_attributes, content))
+        markup = ''.join(leaves)
+        for tag, attributes in reversed(parents):
+            markup = self._element(tag, attributes, markup)
+        return markup
+
+    @staticmethod
+    def _element(tag: str, attributes: Dict[str, str], content: str) -> str:
+        attributes = ''.join(' {}="{}"'.format(name, escape(value)) for (name, value) in attributes.items())
+        if tag in VOID_ELEMENTS:
+            return '<{}{}>'.format(tag, attributes)
+        return '<{0}{1}>{2}</{0}>'.format(tag, attributes, content)
+
+
+class ArticleTemplate(object):
+    """
+    Article page of an outlet, rendered with the markup its spider's extraction spec expects, and the JSON-LD
+    object for the fields mapped to structured data.
+
+    Args:
+        spidercls (:obj:`type`):
+            The spider class of the outlet.
+        date_format (:obj:`str`):
+            Format of the rendered dates.
+    """
+
+    def __init__(self, spidercls, date_format: str):
+        self.spidercls = spidercls
+        self.date_format = date_format
+        self.paths = {field: ElementPath(expression) for (field, expression) in spidercls.extraction_spec.items() if field not in ('body', 'headlines')}
+        self.properties = dict(spidercls.structured_data_spec)
+
+    @classmethod
+    def for_spider(cls, spidercls, settings=None) -> Optional['ArticleTemplate']:
+        """
+        Finds a date format for which the spider accepts the rendered articles.
+
+        Returns:
+            :obj:`Optional[ArticleTemplate]`:
+                The template of the outlet, or :obj:`None` if its spider rejects all rendered articles
+                (e.g. its XPaths depend on the document structure).
+        """
+        settings = settings or get_project_settings()
+        spider = spidercls()
+        date = parse_date(settings.get('START_DATE'), DATE_FORMAT) + timedelta(days=1)
+        tokens = generate_text(Random(0), 2000, settings.getlist('KEYWORDS'), 0.01)
+        paragraphs = [' '.join(tokens[i:i+100]) for i in range(0, len(tokens), 100)]
+
+        source_formats = re.findall(r'["\'](%[^"\']*%[^"\']*)["\']', inspect.getsource(inspect.getmodule(spidercls)))
+        for date_format in list(dict.fromkeys(source_formats)) + list(DATE_RENDERINGS):
+            template = cls(spidercls, date_format)
+            page = template.render('http://localhost/article.html', date, paragraphs, 'Jane Doe', 'A synthetic article', ['http://localhost/related.html'])
+            try:
+                items = list(spider.parse_item(HtmlResponse(url='http://localhost/article.html', body=page, encoding='utf-8')) or ())
+            except Exception:
+                continue
+            if items:
+                return template
+        return None
+
+    def render(self, url: str, date: datetime, paragraphs: List[str], author: str, title: str, links: List[str], padding: int = 0) -> bytes:
+        """
+        Renders an article page.
+
+        Args:
+            url (:obj:`str`):
+                The URL of the article.
+            date (:obj:`datetime`):
+                The publication and modification date.
+            paragraphs (:obj:`List[str]`):
+                The paragraphs of the body.
+            author (:obj:`str`):
+                The author's name.
+            title (:obj:`str`):
+                The title (also used as description).
+            links (:obj:`List[str]`):
+                URLs of related pages.
+            padding (:obj:`int`):
+                Size (in bytes) of the inline script added to the page, such as the scripts and styles of real pages.
+
+        Returns:
+            :obj:`bytes`:
+                The HTML page.
+        """
+        rendered_date = date.strftime(self.date_format)
+        values = {
+                'paragraphs': paragraphs,
+                'authors': [author],
+                'news_keywords': ['politics, world'],
+                'title': [title],
+                'description': [title],
+                'recommendations': links
+                }
+        head, body = list(), list()
+        for field, path in self.paths.items():
+            if field in DATE_FIELDS:
+                field_values = [rendered_date]
+            elif any(tag == 'script' for (tag, _) in path.elements):
+                # Embedded data (e.g. the page state) is outlet-specific, and left empty
+                field_values = ['']
+            else:
+                field_values = values.get(field, [title])
+            (head if path.in_head else body).append(path.render(field_values))
+
+        if self.properties:
+            data = {'@context': 'https://schema.org', '@type': 'NewsArticle', 'url': url}
+            for field, name in self.properties.items():
+                if field in DATE_FIELDS:
+                    data[name] = rendered_date
+                elif field in AUTHOR_FIELDS:
+                    data[name] = [{'@type': 'Person', 'name': author}]
+                else:
+                    data[name] = values.get(field, [title])
+            head.append('<script type="application/ld+json">{}</script>'.format(json.dumps(data)))
+
+        if padding:
+            head.append('<script>{}</script>'.format(('var x=0;' * (padding // 8 + 1))[:padding]))
+        related = ''.join('<li><a href="{}">{}</a></li>'.format(link, escape(title)) for link in links)
+        return '<!DOCTYPE html><html><head><meta charset="utf-8"><title>{}</title>{}</head><body>{}<section class="related"><ul>{}</ul></section></body></html>'.format(
+                escape(title), ''.join(head), ''.join(body), related).encode('utf-8')
+
+
+class SyntheticSite(object):
+    """
+    Synthetic news site of several outlets, served under `/$OUTLET/`. Each outlet has hub pages (`/$OUTLET/`,
+    `/$OUTLET/section/$N.html`), article pages (`/$OUTLET/article/$N.html`), and a sitemap (`/$OUTLET/sitemap.xml`).
+    Pages are generated deterministically from their URL, such that no page is stored.
+
+    Args:
+        templates (:obj:`Dict[str, ArticleTemplate]`):
+            The article template of each outlet.
+        articles (:obj:`int`):
+            Number of articles per outlet.
+        fanout (:obj:`int`):
+            Number of articles linked from each hub page; articles link to a quarter as many related articles.
+        paragraphs (:obj:`int`):
+            Number of paragraphs per article.
+        paragraph_tokens (:obj:`int`):
+            Number of tokens per paragraph.
+        keyword_density (:obj:`float`):
+            Fraction of the tokens starting a keyword.
+        out_of_range (:obj:`float`):
+            Fraction of the articles dated outside the crawled date range.
+        padding (:obj:`int`):
+            Size (in bytes) of the inline script of each article.
+        seed (:obj:`int`):
+            Seed of the generated content.
+        settings (:obj:`Settings`):
+            The project settings (date range and keywords).
+    """
+
+    def __init__(self, templates: Dict[str, ArticleTemplate], articles: int = 500, fanout: int = 20, paragraphs: int = 12, paragraph_tokens: int = 60,
+            keyword_density: float = 0.005, out_of_range: float = 0.1, padding: int = 50000, seed: int = 0, settings=None):
+        settings = settings or get_project_settings()
+        self.templates = templates
+        self.articles = articles
+        self.fanout = fanout
+        self.paragraphs = paragraphs
+        self.paragraph_tokens = paragraph_tokens
+        self.keyword_density = keyword_density
+        self.out_of_range = out_of_range
+        self.padding = padding
+        self.seed = seed
+        self.keywords = settings.getlist('KEYWORDS')
+        self.start_date = parse_date(settings.get('START_DATE'), DATE_FORMAT)
+        self.end_date = parse_date(settings.get('END_DATE'), DATE_FORMAT)
+        self.hubs = max(1, -(-articles // fanout))
+
+    def page(self, path: str) -> Optional[Tuple[str, bytes]]:
+        """ Returns the content type and the content of the page, or :obj:`None` if there is no such page. """
+        if path == '/robots.txt':
+            sitemaps = ''.join('Sitemap: /{}/sitemap.xml\n'.format(outlet) for outlet in self.templates)
+            return 'text/plain', ('User-agent: *\nAllow: /\n' + sitemaps).encode('utf-8')
+
+        match = re.match(r'^/([\w-]+)/(?:(section|article)/(\d+)\.html|(sitemap\.xml))?$', path)
+        if not match or match.group(1) not in self.templates:
+            return None
+        outlet, kind, number, sitemap = match.groups()
+        number = int(number or 0)
+        if sitemap:
+            return 'application/xml', self._sitemap(outlet)
+        if kind == 'article':
+            return ('text/html', self._article(outlet, number)) if number < self.articles else None
+        return ('text/html', self._hub(outlet, number)) if number < self.hubs else None
+
+    def _rng(self, outlet: str, number: int) -> Random:
+        return Random('{}/{}/{}'.format(self.seed, outlet, number))
+
+    def _date(self, outlet: str, number: int) -> datetime:
+        rng = self._rng(outlet, -number - 1)
+        days = (self.end_date - self.start_date).days
+        if rng.random() < self.out_of_range:
+            return self.start_date - timedelta(days=rng.randint(1, days + 1))
+        return self.start_date + timedelta(days=rng.randint(0, days))
+
+    def _article(self, outlet: str, number: int) -> bytes:
+        rng = self._rng(outlet, number)
+        tokens = generate_text(rng, self.paragraphs * self.paragraph_tokens, self.keywords, self.keyword_density)
+        paragraphs = [' '.join(tokens[i:i+self.paragraph_tokens]) for i in range(0, len(tokens), self.paragraph_tokens)]
+        links = ['/{}/article/{}.html'.format(outlet, rng.randrange(self.articles)) for _ in range(max(1, self.fanout // 4))]
+        title = ' '.join(rng.choice(VOCABULARY) for _ in range(8)).capitalize()
+        return self.templates[outlet].render('/{}/article/{}.html'.format(outlet, number), self._date(outlet, number), paragraphs, 'Jane Doe', title, links, self.padding)
+
+    def _hub(self, outlet: str, number: int) -> bytes:
+        articles = range(number * self.fanout, min((number + 1) * self.fanout, self.articles))
+        links = ['/{}/article/{}.html'.format(outlet, i) for i in articles]
+        links += ['/{}/section/{}.html'.format(outlet, i) for i in (number + 1, number + 2) if i < self.hubs]
+        items = ''.join('<li><a href="{0}">{0}</a></li>'.format(link) for link in links)
+        return '<!DOCTYPE html><html><head><title>{0}</title></head><body><main><h1>{0}</h1><ul>{1}</ul></main></body></html>'.format(outlet, items).encode('utf-8')
+
+    def _sitemap(self, outlet: str) -> bytes:
+        urls = ''.join('<url><loc>/{}/article/{}.html</loc><lastmod>{}</lastmod></url>'.format(outlet, i, self._date(outlet, i).strftime('%Y-%m-%d')) for i in range(self.articles))
+        return '<?xml version="1.0" encoding="UTF-8"?><urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{}</urlset>'.format(urls).encode('utf-8')
+
+
+def serve(site: SyntheticSite, host: str = '127.0.0.1', port: int = 8770, ready: Optional[Callable[[], None]] = None):
+    """ Serves the synthetic site until the process is terminated. """
+
+    class Handler(BaseHTTPRequestHandler):
+
+        def do_GET(self):
+            page = site.page(self.path.split('?')[0])
+            if page is None:
+                self.send_error(404)
+                return
+            content_type, content = page
+            self.send_response(200)
+            self.send_header('Content-Type', content_type + '; charset=utf-8')
+            self.send_header('Content-Length', str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    if ready:
+        ready()
+    server.serve_forever()
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+# Readers of archived responses for news_crawler project
+
+import os
+import gzip
+import json
+import zlib
+from typing import Dict, Iterator, Optional, Tuple
+
+# Archived response: url, headers (if available), and body
+ArchivedResponse = Tuple[str, Optional[Dict[bytes, bytes]], bytes]
+
+
+def iter_html_archive(folder: str) -> Iterator[ArchivedResponse]:
+    """
+    Iterates over the pages stored by the :obj:`HtmlWriterPipeline`. The URL of each page is read from the
+    item with the same number stored by the :obj:`JsonWriterPipeline`.
+
+    Args:
+        folder (:obj:`str`):
+            The data folder of the spider (i.e. `data/$TOPIC/$OUTLET`).
+
+    Returns:
+        :obj:`Iterator[ArchivedResponse]`:
+            The archived responses.
+    """
+    html_folder = os.path.join(folder, 'html')
+    json_folder = os.path.join(folder, 'json')
+    files = sorted((file for file in os.listdir(html_folder) if file.endswith('.html')), key=lambda file: int(file.split('.')[0]))
+    for file in files:
+        json_path = os.path.join(json_folder, file.replace('.html', '.json'))
+        if not os.path.exists(json_path):
+            continue
+        with open(json_path) as f:
+            url = json.load(f)['provenance']
+        with open(os.path.join(html_folder, file), 'rb') as f:
+            body = f.read()
+        yield url, None, body
+
+
+def decode_content(headers: Dict[bytes, bytes], body: bytes) -> bytes:
+    """
+    Undo the content encoding (i.e. gzip or deflate compression) of an HTTP response body.
+
+    Args:
+        headers (:obj:`Dict[bytes, bytes]`):
+            The response headers, with lowercase names.
+        body (:obj:`bytes`):
+            The response body, as received.
+
+    Returns:
+        :obj:`bytes`:
+            The decoded body.
+    """
+    encoding = headers.get(b'content-encoding', b'').lower()
+    if encoding in (b'gzip', b'x-gzip'):
+        body = gzip.decompress(body)
+    elif encoding == b'deflate':
+        try:
+            body = zlib.decompress(body)
+        except zlib.error:
+            # Some servers send raw deflate data, without zlib header
+            body = zlib.decompress(body, -zlib.MAX_WBITS)
+    return body
+
+
+def _decode_http_body(headers: Dict[bytes, bytes], body: bytes) -> bytes:
+    """ Undo the transfer and content encodings of an HTTP response body, as recorded in a WARC file. """
+    if headers.get(b'transfer-encoding', b'').lower() == b'chunked':
+        decoded, pos = b'', 0
+        while True:
+            end = body.find(b'\r\n', pos)
+            if end < 0:
+                break
+            size = int(body[pos:end].split(b';')[0] or b'0', 16)
+            if size == 0:
+                break
+            decoded += body[end+2:end+2+size]
+            pos = end + 2 + size + 2
+        body = decoded
+    return decode_content(headers, body)
+
+
+def iter_cache_archive(responses) -> Iterator[ArchivedResponse]:
+    """
+    Iterates over cached responses as archived responses. The HTTP cache stores the bodies before the
+    :obj:`HttpCompressionMiddleware` decompresses them, so their content encoding is undone here.
+
+    Args:
+        responses (:obj:`Iterator[Response]`):
+            The cached responses (see :obj:`iter_cached_responses`).
+
+    Returns:
+        :obj:`Iterator[ArchivedResponse]`:
+            The archived responses, with decoded bodies.
+    """
+    for response in responses:
+        headers = {name.lower(): b', '.join(values) for (name, values) in response.headers.items()}
+        yield response.url, headers, decode_content(headers, response.body)
+
+
+def iter_warc(path: str) -> Iterator[ArchivedResponse]:
+    """
+    Iterates over the HTTP responses recorded in a WARC file (optionally gzip-compressed).
+
+    Args:
+        path (:obj:`str`):
+            The WARC file.
+
+    Returns:
+        :obj:`Iterator[ArchivedResponse]`:
+            The archived responses with status 200.
+    """
+    with (gzip.open(path, 'rb') if path.endswith('.gz') else open(path, 'rb')) as f:
+        while True:
+            line = f.readline()
+            if not line:
+                return
+            if not line.startswith(b'WARC/'):
+                continue
+
+            # Read the WARC record headers
+            warc_headers = dict()
+            for line in iter(f.readline, b'\r\n'):
+                if not line:
+                    return
+                name, _, value = line.partition(b':')
+                warc_headers[name.strip().lower()] = value.strip()
+            block = f.read(int(warc_headers.get(b'content-length', 0)))
+
+            if warc_headers.get(b'warc-type') != b'response' or not block.startswith(b'HTTP/'):
+                continue
+
+            # Parse the HTTP response
+            head, _, body = block.partition(b'\r\n\r\n')
+            status_line, *header_lines = head.split(b'\r\n')
+            if status_line.split()[1] != b'200':
+                continue
+            headers = dict()
+            for header_line in header_lines:
+                name, _, value = header_line.partition(b':')
+                headers[name.strip().lower()] = value.strip()
+
+            yield warc_headers[b'warc-target-uri'].strip(b'<>').decode('utf-8'), headers, _decode_http_body(headers, body)
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+# Byline parsing for news_crawler project
+
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+# Known organizations (e.g. wire services, outlets, editorial boards) appearing in bylines, and their canonical names
+ORGANIZATIONS = {
+        'ap': 'The Associated Press',
+        'associated press': 'The Associated Press',
+        'the associated press': 'The Associated Press',
+        'reuters': 'Reuters',
+        'afp': 'AFP',
+        'agence france-presse': 'AFP',
+        'bloomberg': 'Bloomberg',
+        'axios': 'Axios',
+        'cnn': 'CNN',
+        'fox news': 'Fox News',
+        'common dreams': 'Common Dreams',
+        'current affairs': 'Current Affairs',
+        'redneck revolt': 'Redneck Revolt',
+        'washington examiner': 'Washington Examiner',
+        'western journal': 'The Western Journal',
+        'the western journal': 'The Western Journal',
+        "readers' forum": "Readers' Forum",
+        }
+
+# Endings of organization names not listed above (e.g. `Vox Staff`, `Post Editorial Board`)
+ORGANIZATION_SUFFIXES = (' staff', ' editorial board', ' editors', ' newsroom')
+
+# Roles following the author's name (e.g. `Jane Doe, opinion contributor`), which are not authors themselves
+ROLES = {'opinion contributor', 'contributor', 'contributors', 'contributing writer', 'staff writer', 'senior writer', 'correspondent', 'columnist'}
+
+# Prefixes of bylines (e.g. `By`, `Written by`, `Opinion by`)
+PREFIX_RE = re.compile(r'^(?:(?:written|opinion|analysis|commentary|reporting|story)\s+)?by\s+', re.IGNORECASE)
+
+# Separators between the authors of a byline
+SEPARATOR_RE = re.compile(r',?\s+and\s+|\s*[,&|/]\s*', re.IGNORECASE)
+
+
+class BylineParser(object):
+    """
+    Splits bylines into the persons and organizations authoring an article. Since the same bylines repeat across
+    the articles of an outlet, the parsed bylines are memoized.
+
+    Args:
+        organizations (:obj:`Dict[str, str]`):
+            The known organizations (lowercased) and their canonical names.
+        cache_size (:obj:`int`):
+            Maximum number of memoized bylines.
+    """
+
+    def __init__(self, organizations: Dict[str, str] = ORGANIZATIONS, cache_size: int = 10000):
+        self.organizations = organizations
+        self.parse = lru_cache(maxsize=cache_size)(self.parse)
+
+    def __call__(self, authors: Union[str, Iterable[str], None]) -> Tuple[List[str], List[str]]:
+        """
+        Args:
+            authors (:obj:`Union[str, Iterable[str], None]`):
+                A byline, or the bylines of the article (e.g. one per author).
+
+        Returns:
+            :obj:`Tuple[List[str], List[str]]`:
+                The persons and the organizations authoring the article, without duplicates.
+        """
+        if not authors:
+            return list(), list()
+        if isinstance(authors, str):
+            authors = [authors]
+
+        persons, organizations = dict(), dict()
+        for byline in authors:
+            parsed_persons, parsed_organizations = self.parse(byline)
+            persons.update(dict.fromkeys(parsed_persons))
+            organizations.update(dict.fromkeys(parsed_organizations))
+        return list(persons), list(organizations)
+
+    def parse(self, byline: str) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+        """
+        Parses a single byline, e.g. `By Jane Doe, John Roe and The Associated Press`.
+
+        Args:
+            byline (:obj:`str`):
+                The byline.
+
+        Returns:
+            :obj:`Tuple[Tuple[str, ...], Tuple[str, ...]]`:
+                The persons and the organizations named in the byline.
+        """
+        # Anything after a semicolon credits other contributions (e.g. `Written by Jane Doe; Photographs by John Roe`)
+        byline = byline.split(';')[0].strip()
+
+        persons, organizations = list(), list()
+        for author in SEPARATOR_RE.split(PREFIX_RE.sub('', byline)):
+            author = PREFIX_RE.sub('', author.strip())
+            if not author or author.lower() in ROLES:
+                continue
+            organization = self._organization(author)
+            if organization:
+                organizations.append(organization)
+            else:
+                persons.append(author)
+        return tuple(persons), tuple(organizations)
+
+    def _organization(self, author: str) -> Optional[str]:
+        """ Returns the canonical name of the organization, or :obj:`None` if the author is a person. """
+        name = author.lower()
+        if name in self.organizations:
+            return self.organizations[name]
+        if name.endswith(ORGANIZATION_SUFFIXES):
+            return author
+        return None
+
+
+# Parses the bylines of an article into persons and organizations
+parse_authors = BylineParser()
@@ -0,0 +1,2 @@
+# -*- coding: utf-8 -*-
+# Custom scrapy commands for news_crawler project
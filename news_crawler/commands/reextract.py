@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import logging
+from multiprocessing import Pool
+from scrapy.commands import ScrapyCommand
+from scrapy.exceptions import UsageError
+from scrapy.http import HtmlResponse
+from scrapy.utils.project import data_path
+
+from news_crawler.archive import iter_html_archive, iter_warc, iter_cache_archive
+from news_crawler.httpcache import iter_cached_responses
+from news_crawler.pipelines import item_to_json
+
+logger = logging.getLogger(__name__)
+
+# Spider instance of each worker process
+_spider = None
+
+
+def _init_worker(spidercls):
+    global _spider
+    _spider = spidercls()
+
+
+def _extract(archived):
+    """ Run the spider's `parse_item` on an archived response, and return the extracted items. """
+    url, headers, body = archived
+    if headers:
+        # The body is decoded when read from the archive (i.e. decompressed), so its encoding headers no longer apply
+        headers = {name: value for (name, value) in headers.items() if name.lower() not in (b'content-encoding', b'transfer-encoding', b'content-length')}
+    response = HtmlResponse(url=url, headers=headers, body=body)
+    try:
+        items = list(_spider.parse_item(response) or ())
+    except Exception as e:
+        return url, None, repr(e)
+
+    # Items are stored as by the JsonWriterPipeline of a crawl
+    several_topics = len(_spider.topics) > 1
+    return url, [item_to_json(item, several_topics) for item in items], None
+
+
+class Command(ScrapyCommand):
+
+    requires_project = True
+
+    def syntax(self):
+        return "[options] <spider>"
+
+    def short_desc(self):
+        return "Run a spider's parse_item over archived responses, without network access"
+
+    def add_options(self, parser):
+        ScrapyCommand.add_options(self, parser)
+        parser.add_argument("--source", dest="source", default="html", choices=["html", "cache", "warc"],
+                            help="archived responses: stored html pages, http cache, or warc files (default: html)")
+        parser.add_argument("--path", dest="path", default=None,
+                            help="folder of the archived responses, or warc file(s) (default: data folder or cache folder of the spider)")
+        parser.add_argument("--output", dest="output", default=None,
+                            help="folder for the extracted items (default: data/$TOPIC/$OUTLET/reextracted/json)")
+        parser.add_argument("--processes", dest="processes", type=int, default=os.cpu_count(),
+                            help="number of worker processes (default: number of cores)")
+
+    def run(self, args, opts):
+        if len(args) != 1:
+            raise UsageError()
+        spidercls = self.crawler_process.spider_loader.load(args[0])
+        spider_folder = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', '..', 'data', self.settings.get('TOPIC'), spidercls.name)
+
+        # Select the archived responses
+        if opts.source == 'html':
+            archived = iter_html_archive(opts.path or spider_folder)
+        elif opts.source == 'cache':
+            responses = iter_cached_responses(opts.path or os.path.join(data_path(self.settings['HTTPCACHE_DIR']), spidercls.name))
+            archived = iter_cache_archive(response for response in responses if response.status == 200)
+        else:
+            if not opts.path:
+                raise UsageError("--path is required for warc files")
+            paths = [os.path.join(opts.path, file) for file in sorted(os.listdir(opts.path)) if '.warc' in file] if os.path.isdir(opts.path) else [opts.path]
+            archived = (response for path in paths for response in iter_warc(path))
+
+        output = opts.output or os.path.join(spider_folder, 'reextracted', 'json')
+        if not os.path.isdir(output):
+            os.makedirs(output)
+
+        # Extract the items in parallel, and write them in the order of the archive
+        pages, errors, article_num = 0, 0, 0
+        with Pool(opts.processes, initializer=_init_worker, initargs=(spidercls,)) as pool:
+            for url, items, error in pool.imap(_extract, archived, chunksize=16):
+                pages += 1
+                if error:
+                    errors += 1
+                    logger.warning("Could not extract %(url)s: %(error)s", {'url': url, 'error': error})
+                    continue
+                for item in items:
+                    article_num += 1
+                    with open(os.path.join(output, str(article_num) + '.json'), 'w') as f:
+                        json.dump(item, f)
+
+        logger.info("Re-extracted %(items)d items from %(pages)d pages (%(errors)d errors) into %(output)s",
+                {'items': article_num, 'pages': pages, 'errors': errors, 'output': output})
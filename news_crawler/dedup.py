@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+# Near-duplicate detection for news_crawler project
+
+import os
+import json
+import hashlib
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+
+
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+class MinHasher(object):
+    """
+    Computes MinHash signatures of texts from their word n-gram shingles.
+    The fraction of equal signature values estimates the Jaccard similarity between the shingle sets of two texts.
+
+    Args:
+        num_perm (:obj:`int`):
+            Number of hash permutations, i.e. length of the signatures.
+        ngram (:obj:`int`):
+            Number of tokens per shingle.
+        seed (:obj:`int`):
+            Seed of the hash permutations; signatures are only comparable if computed with the same seed.
+    """
+
+    def __init__(self, num_perm: int = 128, ngram: int = 3, seed: int = 1):
+        self.num_perm = num_perm
+        self.ngram = ngram
+        generator = np.random.RandomState(seed)
+        self.a = generator.randint(1, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self.b = generator.randint(0, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+
+    def signature(self, text: str) -> np.ndarray:
+        """
+        Args:
+            text (:obj:`str`):
+                The text to fingerprint.
+
+        Returns:
+            :obj:`np.ndarray`:
+                The MinHash signature of the text.
+        """
+        tokens = text.lower().split()
+        shingles = {' '.join(tokens[i:i+self.ngram]) for i in range(max(len(tokens) - self.ngram + 1, 1))}
+        hashes = np.array([int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=4).digest(), 'big') for shingle in shingles], dtype=np.uint64)
+
+        # Apply all permutations to all shingle hashes at once, and keep the minimum value per permutation
+        permuted = (np.outer(hashes, self.a) + self.b) % MERSENNE_PRIME & MAX_HASH
+        return permuted.min(axis=0).astype(np.uint32)
+
+
+def lsh_parameters(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """
+    Chooses the number of bands and rows per band, such that signatures with an estimated Jaccard similarity
+    around the threshold are likely to share at least one band.
+
+    Returns:
+        :obj:`Tuple[int, int]`:
+            The number of bands and of rows per band.
+    """
+    candidates = [(num_perm // rows, rows) for rows in range(1, num_perm + 1) if num_perm % rows == 0]
+
+    # Place the steepest part of the LSH S-curve slightly below the threshold, to favour recall; candidates are verified afterwards
+    return min(candidates, key=lambda params: abs((1 / params[0]) ** (1 / params[1]) - threshold * 0.85))
+
+
+class MinHashLSHIndex(object):
+    """
+    Locality-sensitive index of MinHash signatures. The signatures are split into bands, and only the signatures
+    sharing an identical band with the queried one are compared.
+
+    The index is persisted as an append-only file, such that it is shared across spiders and crawls. Each provenance
+    (i.e. URL) is indexed once: a signature added again for the same provenance (e.g. on a recrawl of a modified page)
+    replaces the previous one, also when the file is read.
+
+    Args:
+        path (:obj:`str`):
+            The file storing the indexed signatures.
+        threshold (:obj:`float`):
+            Minimum estimated Jaccard similarity between the shingles of near-duplicate texts.
+        num_perm (:obj:`int`):
+            Length of the signatures.
+    """
+
+    def __init__(self, path: Optional[str] = None, threshold: float = 0.8, num_perm: int = 128):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.num_bands, self.rows = lsh_parameters(num_perm, threshold)
+        self.buckets: List[Dict[bytes, List[int]]] = [dict() for _ in range(self.num_bands)]
+        self.signatures: List[np.ndarray] = list()
+        self.provenances: List[str] = list()
+        self.positions: Dict[str, int] = dict()
+
+        self.file = None
+        if path:
+            if os.path.exists(path):
+                with open(path) as f:
+                    for line in f:
+                        try:
+                            entry = json.loads(line)
+                            signature = np.frombuffer(bytes.fromhex(entry['signature']), dtype=np.uint32)
+                        except ValueError:
+                            # Skip an incomplete last entry written during a crash
+                            continue
+                        if len(signature) == num_perm:
+                            self._insert(signature, entry['provenance'])
+            self.file = open(path, 'a')
+
+    def __len__(self) -> int:
+        return len(self.signatures)
+
+    def _keys(self, signature: np.ndarray) -> List[bytes]:
+        return [signature[band*self.rows:(band+1)*self.rows].tobytes() for band in range(self.num_bands)]
+
+    def _insert(self, signature: np.ndarray, provenance: str):
+        idx = self.positions.get(provenance)
+        if idx is None:
+            idx = len(self.signatures)
+            self.positions[provenance] = idx
+            self.signatures.append(signature)
+            self.provenances.append(provenance)
+        else:
+            # Replace the previous signature of the provenance
+            for bucket, key in zip(self.buckets, self._keys(self.signatures[idx])):
+                bucket[key].remove(idx)
+                if not bucket[key]:
+                    del bucket[key]
+            self.signatures[idx] = signature
+        for bucket, key in zip(self.buckets, self._keys(signature)):
+            bucket.setdefault(key, list()).append(idx)
+
+    def query(self, signature: np.ndarray, provenance: Optional[str] = None) -> Optional[str]:
+        """
+        Args:
+            signature (:obj:`np.ndarray`):
+                The signature to look up.
+            provenance (:obj:`Optional[str]`):
+                The provenance of the looked up text, which is not its own near-duplicate (e.g. when an outlet is crawled again).
+
+        Returns:
+            :obj:`Optional[str]`:
+                The provenance of the most similar indexed near-duplicate, or :obj:`None` if there is none.
+        """
+        candidates = set()
+        for bucket, key in zip(self.buckets, self._keys(signature)):
+            candidates.update(bucket.get(key, ()))
+        candidates.discard(self.positions.get(provenance))
+        if not candidates:
+            return None
+
+        candidates = list(candidates)
+        similarities = (np.stack([self.signatures[idx] for idx in candidates]) == signature).mean(axis=1)
+        best = int(similarities.argmax())
+        return self.provenances[candidates[best]] if similarities[best] >= self.threshold else None
+
+    def add(self, signature: np.ndarray, provenance: str, **metadata):
+        """ Index the signature (replacing the one previously indexed for the provenance, if any) and append it to the index file. """
+        self._insert(signature, provenance)
+        if self.file:
+            entry = dict(signature=signature.tobytes().hex(), provenance=provenance, **metadata)
+            self.file.write(json.dumps(entry) + '\n')
+            self.file.flush()
+
+    def close(self):
+        if self.file:
+            self.file.close()
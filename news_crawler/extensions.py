@@ -1,24 +1,59 @@
 # -*- coding: utf-8 -*-
 
 import os
+import re
+import sys
 import json
-from scrapy import signals
+import pickle
+import pstats
+import cProfile
+import logging
+import resource
+import tracemalloc
+from random import random
+from time import perf_counter, time
+from datetime import datetime, timezone
+from urllib.parse import urlparse
+from twisted.internet import task
+from twisted.web.server import Site
+from twisted.web.resource import Resource
+from scrapy import signals, Request
 from scrapy.exceptions import NotConfigured
-from scrapy.utils.project import get_project_settings
-from typing import Dict
+from scrapy.utils.reactor import listen_tcp
+from scrapy.utils.request import request_from_dict
+from scrapy.utils.trackref import live_refs
+from news_crawler.timing import StageTimings
+from typing import Dict, List
 
+logger = logging.getLogger(__name__)
 
 class PersistStatsExtension(object):
     """ 
     Persists spider core stats to json file. 
 
+    The stats are also flushed periodically, such that a crashed or killed crawl keeps its stats: `core_stats.json`
+    is rewritten with the current stats, and a timestamped snapshot is appended to the `stats_series.jsonl` time series.
+    Each snapshot holds the numeric stats and the throughput since the previous snapshot (items, responses, and bytes per minute).
+
     Args:
-        stats (:obj:`Dict`):
-            The crawler statistics.
+        crawler (:obj:`Crawler`):
+            The crawler running the spider.
+        interval (:obj:`float`):
+            Number of seconds between two consecutive snapshots.
     """
 
-    def __init__(self, stats: Dict):
-        self.stats = stats
+    # Throughput reported in each snapshot, computed from the deltas of these stats
+    RATES = {
+            'items/min': 'item_scraped_count',
+            'responses/min': 'response_received_count',
+            'bytes/min': 'downloader/response_bytes'
+            }
+
+    def __init__(self, crawler, interval: float):
+        self.crawler = crawler
+        self.stats = crawler.stats
+        self.interval = interval
+        self.task = None
     
     @classmethod
     def from_crawler(cls, crawler):
@@ -27,23 +62,807 @@ class PersistStatsExtension(object):
             raise NotConfigured
 
         # Instatiate extension object
-        ext =  cls(crawler.stats)
+        ext =  cls(crawler, crawler.settings.getfloat('PERSIST_STATS_INTERVAL', 60))
+
+        # Connect the extension object to signals
+        crawler.signals.connect(ext.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(ext.spider_closed, signal=signals.spider_closed)
+        crawler.signals.connect(ext.engine_started, signal=signals.engine_started)
+        # Return the extension object
+        return ext
+
+    def spider_opened(self, spider):
+        # Check if directory exists for the given spider, and create it if it does not
+        topic = self.crawler.settings.get('TOPIC')
+        self.folder = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', 'data', topic, spider.name)
+        if not os.path.isdir(self.folder):
+            os.makedirs(self.folder)
+
+        # A resumed crawl continues the time series of the interrupted one
+        self.series_file = open(os.path.join(self.folder, 'stats_series.jsonl'), 'a' if getattr(spider, 'resume', False) else 'w')
+        self.last_time = time()
+        self.last_values = {rate: 0 for rate in self.RATES}
+
+    def engine_started(self):
+        # The stats of a resumed crawl are restored when the spider opens, and are not part of the first delta
+        stats = self.stats.get_stats()
+        self.last_time = time()
+        self.last_values = {rate: stats.get(key, 0) for (rate, key) in self.RATES.items()}
+
+        if self.interval > 0:
+            self.task = task.LoopingCall(self.flush)
+            self.task.start(self.interval, now=False)
+
+    def spider_closed(self, spider):
+        if self.task and self.task.running:
+            self.task.stop()
+        self.flush()
+        self.series_file.close()
+
+    def flush(self):
+        """ Append a snapshot to the time series, and rewrite the core stats. """
+        stats = self.stats.get_stats()
+        now = time()
+        minutes = max(now - self.last_time, 1e-6) / 60
+
+        snapshot = {
+                'timestamp': datetime.fromtimestamp(now, timezone.utc).isoformat(timespec='seconds'),
+                'interval': round(now - self.last_time, 3),
+                'stats': {key: value for (key, value) in stats.items() if isinstance(value, (int, float)) and not isinstance(value, bool)}
+                }
+        for rate, key in self.RATES.items():
+            value = stats.get(key, 0)
+            snapshot[rate] = round((value - self.last_values[rate]) / minutes, 3)
+            self.last_values[rate] = value
+        self.last_time = now
+
+        self.series_file.write(json.dumps(snapshot, sort_keys=True) + '\n')
+        self.series_file.flush()
+
+        # Replace the core stats atomically, such that a crash while writing keeps the previous ones
+        tmp_path = os.path.join(self.folder, 'core_stats.json.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(stats, f, sort_keys=True, default=str)
+        os.replace(tmp_path, os.path.join(self.folder, 'core_stats.json'))
+
+
+class CheckpointExtension(object):
+    """
+    Periodically checkpoints the crawl state (frontier, seen requests, pipeline counters, and stats),
+    so that a crashed or interrupted crawl can be resumed with `scrapy crawl $OUTLET -a resume=true`.
+
+    The frontier and the seen requests are stored as append-only journals, such that each checkpoint
+    only writes the requests scheduled or completed since the previous one. The frontier journal is
+    compacted once the completed requests outnumber the pending ones by `compaction_ratio`.
+
+    Args:
+        crawler (:obj:`Crawler`):
+            The crawler running the spider.
+        interval (:obj:`float`):
+            Number of seconds between two consecutive checkpoints.
+        compaction_ratio (:obj:`int`):
+            Ratio between journal entries and pending requests which triggers the frontier compaction.
+    """
+
+    # Prefixes of the stats counting events (i.e. accumulated over the resumed runs)
+    COUNTER_STATS = ('funnel/', 'downloader/', 'scheduler/', 'dupefilter/', 'httpcache/', 'httpcompression/', 'httperror/', 'offsite/',
+            'robotstxt/', 'retry/', 'log_count/', 'spider_exceptions/', 'urllength/', 'request_depth_count/', 'response_received_count',
+            'item_scraped_count', 'item_dropped_count', 'item_dropped_reasons_count/', 'near_duplicate/', 'conditional_recrawl/',
+            'profiling/sampled', 'memory/paused', 'checkpoint/')
+
+    def __init__(self, crawler, interval: float, compaction_ratio: int):
+        self.crawler = crawler
+        self.stats = crawler.stats
+        self.interval = interval
+        self.compaction_ratio = compaction_ratio
+        self.pending = set()
+        self.journal_entries = 0
+        self.task = None
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        # Check if the extension is enabled and raise NotConfigured otherwise
+        if not crawler.settings.getbool('CHECKPOINT_ENABLED'):
+            raise NotConfigured
+
+        # Instatiate extension object
+        ext = cls(crawler, crawler.settings.getfloat('CHECKPOINT_INTERVAL', 600), crawler.settings.getint('CHECKPOINT_COMPACTION_RATIO', 4))
+
+        # Connect the extension object to signals
+        crawler.signals.connect(ext.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(ext.spider_closed, signal=signals.spider_closed)
+        crawler.signals.connect(ext.request_scheduled, signal=signals.request_scheduled)
+        crawler.signals.connect(ext.response_received, signal=signals.response_received)
+
+        # Return the extension object
+        return ext
+
+    def spider_opened(self, spider):
+        # Check if directory exists for the given spider, and create it if it does not
+        topic = self.crawler.settings.get('TOPIC')
+        self.folder = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', 'data', topic, spider.name, 'checkpoint')
+        if not os.path.isdir(self.folder):
+            os.makedirs(self.folder)
+
+        self.spider = spider
+        self.dupefilter = self.crawler.engine.slot.scheduler.df
+
+        # Restore the previous crawl state, or start a new checkpoint otherwise
+        resume = getattr(spider, 'resume', False) and os.path.exists(os.path.join(self.folder, 'state.json'))
+        if resume:
+            requests = self._restore()
+        else:
+            requests = list()
+            for file in ['state.json', 'seen.log', 'frontier.log']:
+                if os.path.exists(os.path.join(self.folder, file)):
+                    os.remove(os.path.join(self.folder, file))
+
+        self.seen_file = open(os.path.join(self.folder, 'seen.log'), 'a')
+        self.frontier_file = open(os.path.join(self.folder, 'frontier.log'), 'ab')
+
+        # Reschedule the pending requests of the resumed crawl; they were already marked as seen
+        for request in requests:
+            self.crawler.engine.crawl(request.replace(dont_filter=True))
+
+        self.task = task.LoopingCall(self.checkpoint)
+        self.task.start(self.interval, now=False)
+
+    def spider_closed(self, spider):
+        if self.task and self.task.running:
+            self.task.stop()
+        self.checkpoint()
+        self.seen_file.close()
+        self.frontier_file.close()
+
+    def request_scheduled(self, request, spider):
+        """ Journal newly scheduled requests; duplicates are dropped by the scheduler and therefore skipped. """
+        fp = self.dupefilter.request_fingerprint(request)
+        if fp in self.dupefilter.fingerprints:
+            if not request.dont_filter or fp in self.pending:
+                return
+        else:
+            self.seen_file.write(fp + '\n')
+        self.pending.add(fp)
+        self._journal(('S', fp, request.to_dict(spider=spider)))
+
+    def response_received(self, response, request, spider):
+        fp = self.dupefilter.request_fingerprint(request)
+        if fp in self.pending:
+            self.pending.discard(fp)
+            self._journal(('C', fp))
+
+    def checkpoint(self):
+        """ Flush the journals and write the pipeline counters and crawl stats to the checkpoint. """
+        self.seen_file.flush()
+        os.fsync(self.seen_file.fileno())
+
+        if self.journal_entries > self.compaction_ratio * max(len(self.pending), 1):
+            self._compact()
+        self.frontier_file.flush()
+        os.fsync(self.frontier_file.fileno())
+
+        self.stats.inc_value('checkpoint/count')
+        state = {
+                'pipelines': {type(pipe).__name__: pipe.checkpoint_state() for pipe in self._pipelines() if hasattr(pipe, 'checkpoint_state')},
+                'stats': self.stats.get_stats()
+                }
+        tmp_path = os.path.join(self.folder, 'state.json.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f, sort_keys=True, default=str)
+        os.replace(tmp_path, os.path.join(self.folder, 'state.json'))
+
+    def _pipelines(self):
+        return self.crawler.engine.scraper.itemproc.middlewares
+
+    def _journal(self, entry):
+        pickle.dump(entry, self.frontier_file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.journal_entries += 1
+
+    def _read_journal(self, path: str):
+        """ Yield the journal entries, ignoring an incomplete last entry written during a crash. """
+        with open(path, 'rb') as f:
+            while True:
+                try:
+                    yield pickle.load(f)
+                except (EOFError, pickle.UnpicklingError, ValueError):
+                    return
+
+    def _compact(self):
+        """ Rewrite the frontier journal, keeping only the requests which are still pending. """
+        self.frontier_file.close()
+        path = os.path.join(self.folder, 'frontier.log')
+        with open(path + '.tmp', 'wb') as f:
+            for entry in self._read_journal(path):
+                if entry[0] == 'S' and entry[1] in self.pending:
+                    pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(path + '.tmp', path)
+        self.frontier_file = open(path, 'ab')
+        self.journal_entries = len(self.pending)
+
+    def _restore(self) -> List[Request]:
+        """ Restore the seen requests, pipeline counters, and stats, and return the pending requests. """
+        with open(os.path.join(self.folder, 'state.json')) as f:
+            state = json.load(f)
+
+        for pipe in self._pipelines():
+            if hasattr(pipe, 'restore_checkpoint_state'):
+                pipe.restore_checkpoint_state(state['pipelines'].get(type(pipe).__name__, {}))
+
+        # Accumulate the counters of the previous runs, and restore the other numeric stats (e.g. latency percentiles or
+        # ratios) until they are updated; memory usage is measured per run
+        for key, value in state['stats'].items():
+            if not isinstance(value, (int, float)) or isinstance(value, bool):
+                continue
+            if key.startswith(self.COUNTER_STATS):
+                self.stats.inc_value(key, value)
+            elif not key.startswith(('memusage/', 'memory/')):
+                self.stats.set_value(key, value)
+        self.stats.inc_value('checkpoint/resumed')
+
+        # Restore the seen requests
+        seen_path = os.path.join(self.folder, 'seen.log')
+        if os.path.exists(seen_path):
+            with open(seen_path) as f:
+                self.dupefilter.fingerprints.update(line.rstrip() for line in f if len(line) > 1)
+
+        # Replay the frontier journal to find the requests which were still pending
+        frontier_path = os.path.join(self.folder, 'frontier.log')
+        pending = dict()
+        if os.path.exists(frontier_path):
+            for entry in self._read_journal(frontier_path):
+                self.journal_entries += 1
+                if entry[0] == 'S':
+                    pending[entry[1]] = entry[2]
+                else:
+                    pending.pop(entry[1], None)
+
+        requests = [request_from_dict(d, spider=self.spider) for d in pending.values()]
+        self.stats.set_value('checkpoint/restored_requests', len(requests))
+        return requests
+
+
+class StageTimingExtension(object):
+    """
+    Times the stages each article goes through: download, selector construction, date gate, field and paragraph
+    extraction, length check, keyword validation, item building, and each pipeline's `process_item`.
+    The count, total, maximum, and percentile latencies of each stage are added to the crawler stats (e.g.
+    `timing/keywords/p99`) when the spider closes.
+
+    Latencies are recorded in constant-size histograms, such that the timing can stay enabled in production.
+    Stages may nest, e.g. the selector is constructed while extracting the first field.
+
+    Args:
+        crawler (:obj:`Crawler`):
+            The crawler running the spider.
+    """
+
+    def __init__(self, crawler):
+        self.crawler = crawler
+        self.stats = crawler.stats
+        self.timings = StageTimings()
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        # Check if the extension is enabled and raise NotConfigured otherwise
+        if not crawler.settings.getbool('TIMING_ENABLED'):
+            raise NotConfigured
+
+        # Instatiate extension object
+        ext = cls(crawler)
+
+        # Connect the extension object to signals
+        crawler.signals.connect(ext.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(ext.spider_closed, signal=signals.spider_closed)
+        crawler.signals.connect(ext.response_received, signal=signals.response_received)
+
+        # Return the extension object
+        return ext
+
+    def spider_opened(self, spider):
+        spider.timings = self.timings
+
+        # Time each pipeline's process_item
+        methods = self.crawler.engine.scraper.itemproc.methods['process_item']
+        for i, process_item in enumerate(methods):
+            methods[i] = self._timed_pipeline(process_item)
+
+    def spider_closed(self, spider):
+        for key, value in self.timings.summary().items():
+            self.stats.set_value(key, value, spider=spider)
+
+    def response_received(self, response, request, spider):
+        # Cached responses are not downloaded, and have no latency
+        latency = request.meta.get('download_latency')
+        if latency is not None:
+            self.timings.record('download', latency)
+
+    def _timed_pipeline(self, process_item):
+        # Scrapy wraps the pipelines' methods to support coroutines
+        method = getattr(process_item, '__wrapped__', process_item)
+        stage = 'pipeline/' + type(getattr(method, '__self__', method)).__name__
+
+        def timed_process_item(item, spider):
+            start = perf_counter()
+            try:
+                return process_item(item, spider)
+            finally:
+                self.timings.record(stage, perf_counter() - start)
+        return timed_process_item
+
+
+class MetricsExtension(Resource):
+    """
+    Serves the live metrics of the crawl over a local HTTP endpoint (`http://$METRICS_HOST:$PORT/metrics`) in the
+    Prometheus text format:
+
+    - `news_crawler_stat`: the numeric crawler stats, labeled by spider and stat (e.g. `item_scraped_count`).
+    - `news_crawler_scheduler_queue_size`, `news_crawler_inflight_requests`, and `news_crawler_inflight_items`:
+      gauges of the pending requests, the requests being downloaded, and the items being processed by the pipelines.
+    - `news_crawler_stage_latency_seconds`: histograms of the stage latencies recorded by the :obj:`StageTimingExtension`
+      (e.g. download, keyword validation, and each pipeline).
+
+    The first free port of `METRICS_PORT` (a range, as for the telnet console) is used, such that several spiders
+    can be monitored on the same machine.
+
+    Args:
+        crawler (:obj:`Crawler`):
+            The crawler running the spider.
+        portrange (:obj:`List[int]`):
+            The range of ports to listen on.
+        host (:obj:`str`):
+            The interface to listen on.
+        buckets (:obj:`List[float]`):
+            The upper bounds (in seconds) of the latency histogram buckets.
+    """
+
+    isLeaf = True
+
+    def __init__(self, crawler, portrange: List[int], host: str, buckets: List[float]):
+        super().__init__()
+        self.crawler = crawler
+        self.stats = crawler.stats
+        self.portrange = portrange
+        self.host = host
+        self.buckets = sorted(buckets)
+        self.spider = None
+        self.port = None
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        # Check if the extension is enabled and raise NotConfigured otherwise
+        if not crawler.settings.getbool('METRICS_ENABLED'):
+            raise NotConfigured
+
+        # Instatiate extension object
+        ext = cls(
+                crawler,
+                [int(port) for port in crawler.settings.getlist('METRICS_PORT', [9410, 9460])],
+                crawler.settings.get('METRICS_HOST', '127.0.0.1'),
+                [float(bound) for bound in crawler.settings.getlist('METRICS_BUCKETS', [0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10])]
+                )
+
+        # Connect the extension object to signals
+        crawler.signals.connect(ext.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(ext.spider_closed, signal=signals.spider_closed)
+
+        # Return the extension object
+        return ext
+
+    def spider_opened(self, spider):
+        self.spider = spider
+        self.port = listen_tcp(self.portrange, self.host, Site(self))
+        host = self.port.getHost()
+        logger.info("Metrics endpoint listening on http://%(host)s:%(port)d/metrics", {'host': host.host, 'port': host.port}, extra={'spider': spider})
+
+    def spider_closed(self, spider):
+        if self.port is not None:
+            self.port.stopListening()
+
+    def render_GET(self, request) -> bytes:
+        request.setHeader(b'Content-Type', b'text/plain; version=0.0.4; charset=utf-8')
+        return self.metrics().encode('utf-8')
+
+    def metrics(self) -> str:
+        """ Returns the metrics of the crawl in the Prometheus text format. """
+        spider = self._escape(self.spider.name if self.spider else '')
+        lines = list()
+
+        lines.append('# HELP news_crawler_stat Numeric crawler stats.')
+        lines.append('# TYPE news_crawler_stat untyped')
+        for key, value in sorted(self.stats.get_stats().items()):
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                lines.append('news_crawler_stat{{spider="{}",stat="{}"}} {}'.format(spider, self._escape(key), value))
+
+        for name, help, value in self._gauges():
+            lines.append('# HELP news_crawler_{} {}'.format(name, help))
+            lines.append('# TYPE news_crawler_{} gauge'.format(name))
+            lines.append('news_crawler_{}{{spider="{}"}} {}'.format(name, spider, value))
+
+        timings = getattr(self.spider, 'timings', None)
+        if timings is not None:
+            lines.append('# HELP news_crawler_stage_latency_seconds Latency of the article processing stages.')
+            lines.append('# TYPE news_crawler_stage_latency_seconds histogram')
+            for stage, histogram in sorted(timings.stages.items()):
+                labels = 'spider="{}",stage="{}"'.format(spider, self._escape(stage))
+                for bound, count in zip(self.buckets, histogram.cumulative_counts(self.buckets)):
+                    lines.append('news_crawler_stage_latency_seconds_bucket{{{},le="{}"}} {}'.format(labels, bound, count))
+                lines.append('news_crawler_stage_latency_seconds_bucket{{{},le="+Inf"}} {}'.format(labels, histogram.count))
+                lines.append('news_crawler_stage_latency_seconds_sum{{{}}} {}'.format(labels, histogram.total))
+                lines.append('news_crawler_stage_latency_seconds_count{{{}}} {}'.format(labels, histogram.count))
+        return '\n'.join(lines) + '\n'
+
+    def _gauges(self):
+        engine = self.crawler.engine
+        slot = getattr(engine, 'slot', None) if engine else None
+        scraper_slot = getattr(engine.scraper, 'slot', None) if engine else None
+        yield 'scheduler_queue_size', 'Number of requests waiting in the scheduler.', len(slot.scheduler) if slot else 0
+        yield 'inflight_requests', 'Number of requests being downloaded.', len(engine.downloader.active) if engine else 0
+        yield 'inflight_items', 'Number of items being processed by the pipelines.', scraper_slot.itemproc_size if scraper_slot else 0
+
+    @staticmethod
+    def _escape(value: str) -> str:
+        return re.sub(r'(["\\])', r'\\\1', value).replace('\n', '\\n')
+
+
+class ProfilingExtension(object):
+    """
+    Profiles a sample of the article callbacks (i.e. `parse_item`) and pipeline invocations with :obj:`cProfile`,
+    such that the hotspots of a production crawl can be inspected without reproducing it.
+
+    The profiles of the sampled calls are aggregated, and written to `data/$TOPIC/$OUTLET/profile.pstats` (to be
+    loaded with :obj:`pstats.Stats`, e.g. by snakeviz) and `profile.txt` (functions sorted by cumulative time),
+    periodically and when the spider closes. It can be enabled for a single spider with `-s PROFILING_ENABLED=true`.
+
+    Args:
+        crawler (:obj:`Crawler`):
+            The crawler running the spider.
+        sample_rate (:obj:`float`):
+            Fraction of the calls which are profiled.
+        interval (:obj:`float`):
+            Number of seconds between two consecutive writes of the profile.
+    """
+
+    # Number of functions listed in the profile summary
+    SUMMARY_SIZE = 50
+
+    def __init__(self, crawler, sample_rate: float, interval: float):
+        self.crawler = crawler
+        self.stats = crawler.stats
+        self.sample_rate = sample_rate
+        self.interval = interval
+        self.profiler = cProfile.Profile()
+        self.profiling = False
+        self.task = None
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        # Check if the extension is enabled and raise NotConfigured otherwise
+        if not crawler.settings.getbool('PROFILING_ENABLED'):
+            raise NotConfigured
+
+        # Instatiate extension object
+        ext = cls(crawler, crawler.settings.getfloat('PROFILING_SAMPLE_RATE', 0.01), crawler.settings.getfloat('PROFILING_INTERVAL', 600))
 
         # Connect the extension object to signals
         crawler.signals.connect(ext.spider_opened, signal=signals.spider_opened)
         crawler.signals.connect(ext.spider_closed, signal=signals.spider_closed)
+
         # Return the extension object
         return ext
 
     def spider_opened(self, spider):
         # Check if directory exists for the given spider, and create it if it does not
-        settings = get_project_settings()
-        topic = settings.get('TOPIC')
-        folder = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', 'data', topic, spider.name)
-        if not os.path.isdir(folder):
+        topic = self.crawler.settings.get('TOPIC')
+        self.folder = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', 'data', topic, spider.name)
+        if not os.path.isdir(self.folder):
             os.makedirs(self.folder)
-        self.file = open(os.path.join(folder, 'core_stats.json'), 'w')
+
+        # The rules of a crawl spider hold their callbacks, bound when the spider is created
+        for rule in getattr(spider, '_rules', []):
+            if rule.callback is not None:
+                rule.callback = self._sampled(rule.callback, 'callback', materialize=True)
+
+        methods = self.crawler.engine.scraper.itemproc.methods['process_item']
+        for i, process_item in enumerate(methods):
+            methods[i] = self._sampled(process_item, 'pipeline')
+
+        if self.interval > 0:
+            self.task = task.LoopingCall(self.write)
+            self.task.start(self.interval, now=False)
 
     def spider_closed(self, spider):
-        json.dump(self.stats.get_stats(), self.file, sort_keys=True, default=str)
-        self.file.close()
+        if self.task and self.task.running:
+            self.task.stop()
+        self.write()
+
+    def write(self):
+        """ Write the aggregated profile of the sampled calls. """
+        if not self.stats.get_value('profiling/sampled'):
+            return
+        stats = pstats.Stats(self.profiler)
+        stats.dump_stats(os.path.join(self.folder, 'profile.pstats'))
+        with open(os.path.join(self.folder, 'profile.txt'), 'w') as f:
+            stats.stream = f
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.SUMMARY_SIZE)
+
+    def _sampled(self, method, kind: str, materialize: bool = False):
+        """ Wraps the method, such that a sample of its calls is profiled; the output of generators is materialized while profiling. """
+        def sampled_method(*args, **kwargs):
+            if self.profiling or random() >= self.sample_rate:
+                return method(*args, **kwargs)
+            self.profiling = True
+            self.profiler.enable()
+            try:
+                result = method(*args, **kwargs)
+                if materialize and result is not None and not isinstance(result, (dict, Request)):
+                    result = list(result)
+                return result
+            finally:
+                self.profiler.disable()
+                self.profiling = False
+                self.stats.inc_value('profiling/sampled')
+                self.stats.inc_value('profiling/sampled/' + kind)
+        return sampled_method
+
+
+class MemoryTrackingExtension(object):
+    """
+    Tracks the memory usage of the crawl at regular intervals, and records it in the crawler stats (persisted
+    with the other stats):
+
+    - `memory/rss` and `memory/rss/max`: the current and maximum resident set size (in bytes).
+    - `memory/live/$CLASS` and `memory/live/$CLASS/max`: the number of live requests, responses, selectors, and items
+      (e.g. `memory/live/NewsCrawlerItem`), which grows when responses or parsed documents are kept alive.
+    - `memory/top_allocations`: the source lines allocating most memory, if `MEMORY_TRACEMALLOC` is enabled
+      (which slows down the crawl).
+
+    If a soft limit is set and the resident set size exceeds it, the engine stops scheduling new requests until the
+    requests being downloaded and the items being processed are drained, such that the crawl sheds load before the
+    OOM killer ends it. The scheduling is never resumed on the resident set size alone. Since it rarely shrinks once the
+    memory is freed, the limit then has a hysteresis: while the resident set size stays above the resume limit, the
+    scheduling is only paused again after it grew by the difference between the two limits, instead of at every measurement.
+
+    Args:
+        crawler (:obj:`Crawler`):
+            The crawler running the spider.
+        interval (:obj:`float`):
+            Number of seconds between two consecutive measurements.
+        soft_limit (:obj:`int`):
+            Resident set size (in megabytes) above which the scheduling is paused, or 0 to never pause it.
+        resume_ratio (:obj:`float`):
+            Fraction of the soft limit below which the resident set size must fall for the soft limit to apply again.
+        tracemalloc_top (:obj:`int`):
+            Number of allocation sites recorded, or 0 to disable tracemalloc.
+    """
+
+    def __init__(self, crawler, interval: float, soft_limit: int, tracemalloc_top: int, resume_ratio: float = 0.9):
+        self.crawler = crawler
+        self.stats = crawler.stats
+        self.interval = interval
+        self.soft_limit = soft_limit * 1024 * 1024
+        self.resume_limit = self.soft_limit * min(resume_ratio, 1)
+
+        # Resident set size above which the scheduling is paused, raised while the memory is not given back
+        self.pause_limit = self.soft_limit
+        self.tracemalloc_top = tracemalloc_top
+        self.paused = False
+        self.task = None
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        # Check if the extension is enabled and raise NotConfigured otherwise
+        if not crawler.settings.getbool('MEMORY_TRACKING_ENABLED'):
+            raise NotConfigured
+
+        # Instatiate extension object
+        ext = cls(
+                crawler,
+                crawler.settings.getfloat('MEMORY_TRACKING_INTERVAL', 60),
+                crawler.settings.getint('MEMORY_SOFT_LIMIT_MB', 0),
+                crawler.settings.getint('MEMORY_TRACEMALLOC_TOP', 10) if crawler.settings.getbool('MEMORY_TRACEMALLOC') else 0,
+                crawler.settings.getfloat('MEMORY_RESUME_RATIO', 0.9)
+                )
+
+        # Connect the extension object to signals
+        crawler.signals.connect(ext.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(ext.spider_closed, signal=signals.spider_closed)
+
+        # Return the extension object
+        return ext
+
+    def spider_opened(self, spider):
+        if self.tracemalloc_top and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self.task = task.LoopingCall(self.track)
+        self.task.start(self.interval, now=True)
+
+    def spider_closed(self, spider):
+        if self.task and self.task.running:
+            self.task.stop()
+        self.track()
+        if self.tracemalloc_top and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def track(self):
+        """ Measure the memory usage, and pause or resume the scheduling of requests. """
+        rss = self._rss()
+        self.stats.set_value('memory/rss', rss)
+        self.stats.max_value('memory/rss/max', rss)
+
+        for cls, instances in list(live_refs.items()):
+            self.stats.set_value('memory/live/' + cls.__name__, len(instances))
+            self.stats.max_value('memory/live/{}/max'.format(cls.__name__), len(instances))
+
+        if self.tracemalloc_top and tracemalloc.is_tracing():
+            statistics = tracemalloc.take_snapshot().statistics('lineno')[:self.tracemalloc_top]
+            self.stats.set_value('memory/top_allocations', ['{}: {:.1f} KiB in {} blocks'.format(stat.traceback[0], stat.size / 1024, stat.count) for stat in statistics])
+
+        if self.soft_limit:
+            self._shed_load(rss)
+
+    def _shed_load(self, rss: int):
+        engine = self.crawler.engine
+        if engine is None or engine.slot is None:
+            return
+        if not self.paused:
+            if rss < self.resume_limit:
+                self.pause_limit = self.soft_limit
+            if rss > self.pause_limit:
+                logger.warning("Memory usage of %(rss)dM exceeds the soft limit of %(limit)dM, pausing the scheduling of requests",
+                        {'rss': rss / 1024 / 1024, 'limit': self.pause_limit / 1024 / 1024}, extra={'spider': engine.spider})
+                engine.pause()
+                self.paused = True
+                self.stats.inc_value('memory/paused')
+        elif not engine.downloader.active and not engine.scraper.slot.itemproc_size:
+            # The resident set size rarely shrinks, so the scheduling is resumed once the in-flight work is drained, and
+            # only paused again once the memory grew by the hysteresis band, unless it falls below the resume limit
+            logger.info("In-flight requests and items drained, resuming the scheduling of requests", extra={'spider': engine.spider})
+            engine.unpause()
+            self.paused = False
+            if rss > self.resume_limit:
+                self.pause_limit = max(self.soft_limit, rss + self.soft_limit - self.resume_limit)
+
+    @staticmethod
+    def _rss() -> int:
+        """ Returns the current resident set size in bytes (the maximum one, where the current one is not available). """
+        try:
+            with open('/proc/self/statm') as f:
+                return int(f.read().split()[1]) * resource.getpagesize()
+        except (OSError, IndexError, ValueError):
+            # Maximum resident set size, in kilobytes on Linux and bytes on macOS
+            maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            return maxrss if sys.platform == 'darwin' else maxrss * 1024
+
+
+class CrawlEfficiencyExtension(object):
+    """
+    Reports the cost of the crawl per kept article: the requests made, bytes downloaded (i.e. the response bodies as
+    received, before decompression), pages parsed (i.e. passed to `parse_item`), and items scraped, per URL section of the outlet (e.g. `/politics`) and in total.
+
+    The report is written to `data/$TOPIC/$OUTLET/efficiency.json` when the spider closes (and periodically, if an
+    interval is set), with the sections sorted by downloaded bytes. The totals are also added to the crawler stats
+    (e.g. `efficiency/bytes_per_item`).
+
+    Args:
+        crawler (:obj:`Crawler`):
+            The crawler running the spider.
+        interval (:obj:`float`):
+            Number of seconds between two consecutive reports, or 0 to report only when the spider closes.
+        section_depth (:obj:`int`):
+            Number of path segments (ignoring numeric ones, e.g. dates) identifying a section.
+        max_sections (:obj:`int`):
+            Maximum number of sections reported; the pages of further sections are counted under `other`.
+    """
+
+    COUNTERS = ('requests', 'bytes', 'pages_parsed', 'items')
+
+    def __init__(self, crawler, interval: float, section_depth: int, max_sections: int):
+        self.crawler = crawler
+        self.stats = crawler.stats
+        self.interval = interval
+        self.section_depth = section_depth
+        self.max_sections = max_sections
+        self.sections: Dict[str, Dict[str, int]] = dict()
+        self.task = None
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        # Check if the extension is enabled and raise NotConfigured otherwise
+        if not crawler.settings.getbool('EFFICIENCY_REPORT_ENABLED'):
+            raise NotConfigured
+
+        # Instatiate extension object
+        ext = cls(
+                crawler,
+                crawler.settings.getfloat('EFFICIENCY_REPORT_INTERVAL', 0),
+                crawler.settings.getint('EFFICIENCY_SECTION_DEPTH', 1),
+                crawler.settings.getint('EFFICIENCY_MAX_SECTIONS', 100)
+                )
+
+        # Connect the extension object to signals
+        crawler.signals.connect(ext.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(ext.spider_closed, signal=signals.spider_closed)
+        crawler.signals.connect(ext.request_reached_downloader, signal=signals.request_reached_downloader)
+        crawler.signals.connect(ext.bytes_received, signal=signals.bytes_received)
+        crawler.signals.connect(ext.response_received, signal=signals.response_received)
+        crawler.signals.connect(ext.item_scraped, signal=signals.item_scraped)
+
+        # Return the extension object
+        return ext
+
+    def spider_opened(self, spider):
+        # Check if directory exists for the given spider, and create it if it does not
+        topic = self.crawler.settings.get('TOPIC')
+        self.folder = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', 'data', topic, spider.name)
+        if not os.path.isdir(self.folder):
+            os.makedirs(self.folder)
+
+        self.spider = spider
+        if self.interval > 0:
+            self.task = task.LoopingCall(self.report)
+            self.task.start(self.interval, now=False)
+
+    def spider_closed(self, spider):
+        if self.task and self.task.running:
+            self.task.stop()
+        totals = self.report()
+        for key in ('requests_per_item', 'bytes_per_item', 'acceptance_rate'):
+            if totals[key] is not None:
+                self.stats.set_value('efficiency/' + key, totals[key], spider=spider)
+
+    def request_reached_downloader(self, request, spider):
+        self._count(request.url, 'requests')
+
+    def bytes_received(self, data, request, spider):
+        # Count the body as received from the network, i.e. before the HttpCompressionMiddleware decompresses it
+        self._count(request.url, 'bytes', len(data))
+
+    def response_received(self, response, request, spider):
+        # Pages following a rule with a callback (i.e. `parse_item`) are parsed as articles
+        rules = getattr(spider, '_rules', [])
+        rule = request.meta.get('rule')
+        if rule is not None and rule < len(rules) and rules[rule].callback is not None:
+            self._count(response.url, 'pages_parsed')
+
+    def item_scraped(self, item, response, spider):
+        self._count(response.url, 'items')
+
+    def report(self) -> Dict:
+        """ Writes the efficiency report, and returns its totals. """
+        totals = self._ratios({counter: sum(section[counter] for section in self.sections.values()) for counter in self.COUNTERS})
+        sections = sorted(self.sections.items(), key=lambda section: section[1]['bytes'], reverse=True)
+        report = {'spider': self.spider.name, 'total': totals, 'sections': {name: self._ratios(dict(counters)) for (name, counters) in sections}}
+
+        tmp_path = os.path.join(self.folder, 'efficiency.json.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(report, f, indent=2)
+        os.replace(tmp_path, os.path.join(self.folder, 'efficiency.json'))
+        return totals
+
+    def _count(self, url: str, counter: str, value: int = 1) -> Dict[str, int]:
+        name = self._section(url)
+        if name not in self.sections:
+            if len(self.sections) >= self.max_sections:
+                name = 'other'
+            if name not in self.sections:
+                self.sections[name] = dict.fromkeys(self.COUNTERS, 0)
+        section = self.sections[name]
+        section[counter] += value
+        return section
+
+    def _section(self, url: str) -> str:
+        """ Returns the section of the URL, i.e. its first non-numeric path segments (e.g. `/politics`). """
+        segments = [segment for segment in urlparse(url).path.split('/') if segment and not segment.isdigit()]
+        # The last segment of a path is the page itself, unless it is a section page (e.g. `/politics/`)
+        if segments and not url.endswith('/'):
+            segments = segments[:-1]
+        return '/' + '/'.join(segments[:self.section_depth])
+
+    @staticmethod
+    def _ratios(counters: Dict) -> Dict:
+        """ Adds the cost per kept article and the acceptance rate of the parsed pages to the counters. """
+        items = counters['items']
+        counters['requests_per_item'] = round(counters['requests'] / items, 2) if items else None
+        counters['bytes_per_item'] = round(counters['bytes'] / items) if items else None
+        counters['acceptance_rate'] = round(items / counters['pages_parsed'], 4) if counters['pages_parsed'] else None
+        return counters
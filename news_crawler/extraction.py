@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+# Declarative extraction of article fields for news_crawler project
+
+from functools import lru_cache
+from lxml import etree
+from typing import Callable, Dict, List, Optional
+from news_crawler.utils import remove_empty_paragraphs
+from news_crawler.structured_data import find_article, property_values
+from news_crawler.timing import StageTimings
+
+
+@lru_cache(maxsize=None)
+def compile_xpath(expression: str) -> etree.XPath:
+    """
+    Compiles an XPath expression once, such that it is not parsed again for every response.
+
+    Args:
+        expression (:obj:`str`):
+            The XPath expression.
+
+    Returns:
+        :obj:`etree.XPath`:
+            The compiled XPath expression.
+    """
+    return etree.XPath(expression, smart_strings=False)
+
+
+STRING_XPATH = compile_xpath('string()')
+
+
+def segment_paragraphs(nodes: List, headline_nodes: List, normalize: Optional[Callable[[str], str]] = None) -> Dict[str, List[str]]:
+    """
+    Groups the paragraphs of an article by their preceding headline, in a single pass over the nodes in document order.
+    Headlines are recognized by node identity rather than by text, such that a headline repeating another headline or
+    a paragraph is not misplaced. Paragraphs under repeated headlines are merged into the same section.
+
+    Args:
+        nodes (:obj:`List`):
+            The paragraph and headline nodes of the article, in document order.
+        headline_nodes (:obj:`List`):
+            The headline nodes of the article.
+        normalize (:obj:`Optional[Callable[[str], str]]`):
+            Function applied to the text of each paragraph.
+
+    Returns:
+        :obj:`Dict[str, List[str]]`:
+            The body as dictionary: key = headline (empty string for the paragraphs before the first headline),
+            values = list of corresponding paragraphs.
+    """
+    headline_nodes = set(headline_nodes)
+    body = {'': list()}
+    section = body['']
+    for node in nodes:
+        text = STRING_XPATH(node).strip()
+        if node in headline_nodes and text:
+            section = body.setdefault(text, list())
+        else:
+            section.append(normalize(text) if normalize else text)
+    return {headline: remove_empty_paragraphs(paragraphs) for (headline, paragraphs) in body.items()}
+
+
+class ExtractionSpec(object):
+    """
+    Declarative specification of the fields extracted from an outlet's articles, i.e. a mapping from field names to XPath expressions.
+    The expressions are compiled once, when the spec is created.
+
+    Fields can also be mapped to properties of the article's structured data (i.e. JSON-LD), which are found without parsing the HTML.
+    If the structured data has a value for such a field, its XPath is not evaluated.
+
+    Args:
+        fields (:obj:`Dict[str, str]`):
+            The XPath expression of each field.
+        properties (:obj:`Dict[str, str]`):
+            The JSON-LD property of each field (e.g. `datePublished`), if any.
+    """
+
+    def __init__(self, fields: Dict[str, str], properties: Optional[Dict[str, str]] = None):
+        self.fields = fields
+        self.xpaths = {field: compile_xpath(expression) for (field, expression) in fields.items()}
+        self.properties = properties or dict()
+
+    def __call__(self, response, timings: Optional[StageTimings] = None) -> 'Extraction':
+        """ Run the spec on a response; fields are evaluated lazily, such that rejected articles are not fully extracted. """
+        return Extraction(self, response, timings)
+
+
+class Extraction(object):
+    """
+    Fields extracted from a response according to an extraction spec. Each field is evaluated at most once.
+
+    Args:
+        spec (:obj:`ExtractionSpec`):
+            The extraction spec of the outlet.
+        response (:obj:`Response`):
+            The article's response.
+        timings (:obj:`Optional[StageTimings]`):
+            The timings of the spider, if its stages are timed.
+    """
+
+    def __init__(self, spec: ExtractionSpec, response, timings: Optional[StageTimings] = None):
+        self.spec = spec
+        self.response = response
+        self.timings = timings
+        self.results = dict()
+        self._structured_data = False
+
+    @property
+    def root(self):
+        """ The parsed HTML document, built on first use. """
+        if self.timings is not None and getattr(self.response, '_cached_selector', None) is None:
+            with self.timings.time('selector'):
+                return self.response.selector.root
+        return self.response.selector.root
+
+    @property
+    def structured_data(self) -> Optional[Dict]:
+        """ The JSON-LD object describing the article, if any. """
+        if self._structured_data is False:
+            self._structured_data = find_article(self.response.body)
+        return self._structured_data
+
+    def evaluate(self, field: str) -> List:
+        """ Returns the raw results (i.e. nodes or strings) of the field, preferring its structured data over its XPath. """
+        if field not in self.results:
+            if self.timings is not None and field != 'paragraphs':
+                with self.timings.time('fields'):
+                    self.results[field] = self._evaluate(field)
+            else:
+                self.results[field] = self._evaluate(field)
+        return self.results[field]
+
+    def _evaluate(self, field: str) -> List:
+        results = property_values(self.structured_data, self.spec.properties[field]) if field in self.spec.properties else None
+        if not results:
+            results = self.spec.xpaths[field](self.root) if field in self.spec.xpaths else list()
+        return results
+
+    def exists(self, field: str) -> bool:
+        """ Check if the field's XPath matches anything in the response. """
+        return bool(self.evaluate(field))
+
+    def get(self, field: str) -> Optional[str]:
+        """ Returns the first string (e.g. attribute or text) matched by the field's XPath, or :obj:`None`. """
+        results = self.evaluate(field)
+        return str(results[0]) if results else None
+
+    def getall(self, field: str) -> List[str]:
+        """ Returns all strings (e.g. attributes or texts) matched by the field's XPath. """
+        return [str(result) for result in self.evaluate(field)]
+
+    def texts(self, field: str) -> List[str]:
+        """ Returns the stripped text content of each node matched by the field's XPath. """
+        if self.timings is not None and field == 'paragraphs':
+            with self.timings.time('paragraphs'):
+                return [node.strip() if isinstance(node, str) else STRING_XPATH(node).strip() for node in self.evaluate(field)]
+        return [node.strip() if isinstance(node, str) else STRING_XPATH(node).strip() for node in self.evaluate(field)]
+
+    def sections(self, field: str, headlines: str, normalize: Optional[Callable[[str], str]] = None) -> Dict[str, List[str]]:
+        """ Returns the paragraphs matched by the field's XPath grouped by their preceding headline (see :obj:`segment_paragraphs`). """
+        return segment_paragraphs(self.evaluate(field), self.evaluate(headlines), normalize)
@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+# HTTP cache storage for news_crawler project
+
+import os
+import re
+import zlib
+import pickle
+import struct
+import logging
+from time import time
+from scrapy.http import Headers
+from scrapy.responsetypes import responsetypes
+from scrapy.utils.project import data_path
+from scrapy.utils.request import request_fingerprint
+from typing import Dict, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Index record: request fingerprint, segment number, offset and length of the record in the segment, timestamp
+INDEX_RECORD = struct.Struct('>20sHQII')
+
+
+def read_index(folder: str) -> Dict[bytes, Tuple[int, int, int, int]]:
+    """
+    Reads the index of a spider's segment cache folder; an incomplete last record written during a crash is ignored.
+
+    Args:
+        folder (:obj:`str`):
+            The cache folder of the spider (e.g. `.scrapy/httpcache/$OUTLET`).
+
+    Returns:
+        :obj:`Dict[bytes, Tuple[int, int, int, int]]`:
+            The segment number, offset and length of the record, and timestamp of the latest cached response of each
+            request fingerprint (empty if the folder has no index).
+    """
+    index = dict()
+    index_path = os.path.join(folder, 'index')
+    if os.path.exists(index_path):
+        with open(index_path, 'rb') as f:
+            data = f.read()
+        data = data[:len(data) - len(data) % INDEX_RECORD.size]
+        for (fp, segment, offset, length, timestamp) in INDEX_RECORD.iter_unpack(data):
+            index[fp] = (segment, offset, length, timestamp)
+    return index
+
+
+def segment_path(folder: str, segment: int) -> str:
+    """ Returns the path of the segment file with the given number. """
+    return os.path.join(folder, 'segment-{:05d}'.format(segment))
+
+
+def encode_record(response, compression_level: int = 6) -> bytes:
+    """ Returns the record of the response stored in a segment, i.e. its url, status, headers, and body pickled and compressed. """
+    return zlib.compress(pickle.dumps({
+        'url': response.url,
+        'status': response.status,
+        'headers': dict(response.headers),
+        'body': response.body
+        }, protocol=4), compression_level)
+
+
+def decode_record(record: bytes):
+    """ Returns the response stored in a record of a segment (see :obj:`encode_record`). """
+    metadata = pickle.loads(zlib.decompress(record))
+    headers = Headers(metadata['headers'])
+    respcls = responsetypes.from_args(headers=headers, url=metadata['url'])
+    return respcls(url=metadata['url'], headers=headers, status=metadata['status'], body=metadata['body'])
+
+
+class SegmentCacheStorage(object):
+    """
+    HTTP cache storage which appends the compressed responses to segment files, and keeps a compact binary index
+    of their positions. Each cached page expires according to the first URL class (i.e. regular expression in
+    `HTTPCACHE_TTL_RULES`) it matches, e.g. hub and section pages after minutes, article pages never.
+
+    In replay mode (`HTTPCACHE_REPLAY`), the cache is read-only and no page expires, such that a previous crawl can be
+    replayed offline (together with `HTTPCACHE_IGNORE_MISSING`).
+
+    Args:
+        settings (:obj:`Settings`):
+            The crawler settings.
+    """
+
+    def __init__(self, settings):
+        self.cachedir = data_path(settings['HTTPCACHE_DIR'])
+        self.expiration_secs = settings.getint('HTTPCACHE_EXPIRATION_SECS')
+        self.ttl_rules = [(re.compile(pattern), ttl) for (pattern, ttl) in settings.getlist('HTTPCACHE_TTL_RULES')]
+        self.segment_size = settings.getint('HTTPCACHE_SEGMENT_SIZE', 64*1024*1024)
+        self.compression_level = settings.getint('HTTPCACHE_COMPRESSION_LEVEL', 6)
+        self.replay = settings.getbool('HTTPCACHE_REPLAY')
+
+    def open_spider(self, spider):
+        self.folder = os.path.join(self.cachedir, spider.name)
+        if not os.path.isdir(self.folder):
+            os.makedirs(self.folder)
+
+        self.index = read_index(self.folder)
+
+        self.segments = dict()
+        self.segment = max([segment for (segment, _, _, _) in self.index.values()], default=0)
+        if not self.replay:
+            self.index_file = open(os.path.join(self.folder, 'index'), 'ab')
+            self.segment_file = open(self._segment_path(self.segment), 'ab')
+
+        logger.debug("Using segment cache storage in %(cachedir)s with %(num)d cached pages", {'cachedir': self.folder, 'num': len(self.index)}, extra={'spider': spider})
+
+    def close_spider(self, spider):
+        for f in self.segments.values():
+            f.close()
+        if not self.replay:
+            self.index_file.close()
+            self.segment_file.close()
+
+    def retrieve_response(self, spider, request):
+        """Return response if present in cache and not expired, or None otherwise."""
+        entry = self.index.get(bytes.fromhex(request_fingerprint(request)))
+        if entry is None:
+            return  # not cached
+        segment, offset, length, timestamp = entry
+
+        ttl = self._ttl(request.url)
+        if not self.replay and 0 < ttl < time() - timestamp:
+            return  # expired
+
+        if segment == self.segment and not self.replay:
+            self.segment_file.flush()
+        f = self._open_segment(segment)
+        f.seek(offset)
+        return decode_record(f.read(length))
+
+    def store_response(self, spider, request, response):
+        """Store the given response in the cache."""
+        if self.replay:
+            return
+
+        record = encode_record(response, self.compression_level)
+
+        # Start a new segment once the current one is full
+        offset = self.segment_file.tell()
+        if offset and offset + len(record) > self.segment_size:
+            self.segment_file.close()
+            self.segment += 1
+            self.segment_file = open(self._segment_path(self.segment), 'ab')
+            offset = 0
+
+        self.segment_file.write(record)
+        fp = bytes.fromhex(request_fingerprint(request))
+        self.index[fp] = (self.segment, offset, len(record), int(time()))
+        self.index_file.write(INDEX_RECORD.pack(fp, *self.index[fp]))
+
+    def _ttl(self, url: str) -> int:
+        """ Expiration time of the URL class the URL belongs to; 0 means it never expires. """
+        for (regex, ttl) in self.ttl_rules:
+            if regex.search(url):
+                return ttl
+        return self.expiration_secs
+
+    def _segment_path(self, segment: int) -> str:
+        return segment_path(self.folder, segment)
+
+    def _open_segment(self, segment: int):
+        if segment not in self.segments:
+            self.segments[segment] = open(self._segment_path(segment), 'rb')
+        return self.segments[segment]
+
+
+def iter_cached_responses(folder: str):
+    """
+    Iterates over the latest cached response of each request in a spider's segment cache folder.
+
+    Args:
+        folder (:obj:`str`):
+            The cache folder of the spider (e.g. `.scrapy/httpcache/$OUTLET`).
+
+    Returns:
+        :obj:`Iterator[Response]`:
+            The cached responses, in segment order.
+    """
+    # Read the segments sequentially
+    segment_file, current = None, None
+    for (segment, offset, length, _) in sorted(read_index(folder).values()):
+        if segment != current:
+            if segment_file:
+                segment_file.close()
+            segment_file = open(segment_path(folder, segment), 'rb')
+            current = segment
+        segment_file.seek(offset)
+        yield decode_record(segment_file.read(length))
+    if segment_file:
+        segment_file.close()
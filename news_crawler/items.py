@@ -21,4 +21,6 @@ class NewsCrawlerItem(Item):
     news_keywords = Field()
     recommendations = Field()
     query_keywords = Field()
+    topics = Field() # matched topics, with the query keywords found for each topic
+    near_duplicate_of = Field() # url of the article this one is a near-duplicate of
     response_body = Field() # Stores response body to be saved as html
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+# Keyword matching for news_crawler project
+
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Tuple
+from news_crawler.topics import TopicProfile
+
+
+class PhraseNode(object):
+    """ Node of a :obj:`PhraseTrie`: the next stem of each phrase continuing the node, and the phrases ending at the node. """
+
+    def __init__(self):
+        self.children: Dict[str, 'PhraseNode'] = dict()
+        self.phrases: List[str] = list()
+
+
+class PhraseTrie(object):
+    """
+    Token-level trie of compound keywords (e.g. person seeking asylum), i.e. phrases of keyword stems of any length.
+    A stem matches a token if the token contains it (e.g. `seeking` matches `seeking,`).
+
+    The phrases are matched in a single left-to-right scan of the tokens, advancing every partial match by one token at
+    each step. The partial matches ending at a token are at distinct trie nodes, such that the cost is linear in the
+    number of tokens, whatever the length of the phrases.
+    """
+
+    def __init__(self):
+        self.root = PhraseNode()
+        self.stems = set()
+
+    def add(self, phrase: str):
+        """ Add the phrase, given as stems separated by whitespace. """
+        node = self.root
+        for stem in phrase.split():
+            node = node.children.setdefault(stem, PhraseNode())
+            self.stems.add(stem)
+        node.phrases.append(phrase)
+
+    def scan(self, token_stems: Iterable[FrozenSet[str]]) -> Iterator[Tuple[int, int, str]]:
+        """
+        Find the occurrences of the phrases, given the stems contained in each token.
+
+        Args:
+            token_stems (:obj:`Iterable[FrozenSet[str]]`):
+                The stems of the trie contained in each token of the text.
+
+        Returns:
+            :obj:`Iterator[Tuple[int, int, str]]`:
+                The position of the first token, the number of tokens, and the phrase of each occurrence, in the order the occurrences end.
+        """
+        # Start position and trie node of the partial matches ending at the previous token
+        partial_matches = list()
+        for (pos, stems) in enumerate(token_stems):
+            if not stems:
+                partial_matches = list()
+                continue
+
+            partial_matches.append((pos, self.root))
+            advanced = list()
+            for (start, node) in partial_matches:
+                for stem in stems:
+                    child = node.children.get(stem)
+                    if child is None:
+                        continue
+                    for phrase in child.phrases:
+                        yield (start, pos-start+1, phrase)
+                    if child.children:
+                        advanced.append((start, child))
+            partial_matches = advanced
+
+
+class KeywordMatcher(object):
+    """
+    Matches the single-token and compound keyword stems of several topics in a single scan of an article's tokens.
+
+    Args:
+        profiles (:obj:`List[TopicProfile]`):
+            The profiles of the topics.
+    """
+
+    def __init__(self, profiles: List[TopicProfile]):
+        # Topics of each keyword, such that keywords shared by several topics are matched once
+        self.keyword_topics: Dict[str, List[str]] = dict()
+        self.phrase_topics: Dict[str, List[str]] = dict()
+        self.trie = PhraseTrie()
+        for profile in profiles:
+            for keyword in profile.keywords:
+                self.keyword_topics.setdefault(keyword, list()).append(profile.name)
+            for keyword in profile.compound_keywords:
+                if keyword not in self.phrase_topics:
+                    self.trie.add(keyword)
+                self.phrase_topics.setdefault(keyword, list()).append(profile.name)
+        self.stems = set(self.keyword_topics) | self.trie.stems
+
+    def match(self, tokens: List[str], topics: List[str]) -> Dict[str, Tuple[List[Tuple[int, str]], List[Tuple[int, int, str]]]]:
+        """
+        Find the keyword matches of the given topics.
+
+        Args:
+            tokens (:obj:`List[str]`):
+                The article's body of text as list of tokens.
+            topics (:obj:`List[str]`):
+                The names of the matched topics.
+
+        Returns:
+            :obj:`Dict[str, Tuple[List[Tuple[int, str]], List[Tuple[int, int, str]]]]`:
+                For each topic, the matching positions and tokens of its single-token keywords, and the matching
+                positions, number of tokens, and keywords of its compound keywords.
+        """
+        matches = {name: (list(), list()) for name in topics}
+
+        # Phrase stems and single-token keyword topics of each distinct token, since most tokens of an article are repeated
+        token_matches = dict()
+        token_stems = list()
+        for (pos, token) in enumerate(tokens):
+            if token not in token_matches:
+                stems = frozenset(stem for stem in self.stems if stem in token)
+                token_matches[token] = (stems & self.trie.stems, set(name for stem in stems for name in self.keyword_topics.get(stem, ()) if name in matches))
+            phrase_stems, names = token_matches[token]
+            token_stems.append(phrase_stems)
+            for name in names:
+                matches[name][0].append((pos, token))
+
+        for (start, length, phrase) in self.trie.scan(token_stems):
+            for name in self.phrase_topics[phrase]:
+                if name in matches:
+                    matches[name][1].append((start, length, phrase))
+        return matches
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+# Link extractors for news_crawler project
+
+import re
+from functools import lru_cache
+from itertools import islice
+from urllib.parse import urlparse
+from scrapy.linkextractors import LinkExtractor, _is_valid_url, _matches
+from scrapy.linkextractors.lxmlhtml import LxmlParserLinkExtractor
+from scrapy.utils.misc import arg_to_iter
+from scrapy.utils.python import unique as unique_list
+from scrapy.utils.response import get_base_url
+from scrapy.utils.url import url_is_from_any_domain, url_has_any_extension
+from typing import Dict, FrozenSet, List, Optional, Pattern
+
+# Page regions holding the site chrome (e.g. menus, footers, widgets), which repeats on every page of an outlet
+BOILERPLATE_XPATHS = ('//header', '//nav', '//footer', '//aside')
+
+
+def compile_patterns(regexes: List[Pattern]) -> Optional[Pattern]:
+    """
+    Combines a list of regular expressions into a single alternation, which matches a string if and only if any of the given expressions does.
+
+    Args:
+        regexes (:obj:`List[Pattern]`):
+            The compiled regular expressions.
+
+    Returns:
+        :obj:`Optional[Pattern]`:
+            The combined regular expression, or :obj:`None` if the expressions cannot be safely combined (e.g. different flags, backreferences).
+    """
+    if not regexes or len(set(regex.flags for regex in regexes)) > 1:
+        return None
+
+    # Backreferences would refer to other groups once the expressions are combined
+    if any(re.search(r'\\\d|\(\?P=', regex.pattern) for regex in regexes):
+        return None
+
+    try:
+        return re.compile('|'.join('(?:{})'.format(regex.pattern) for regex in regexes), regexes[0].flags)
+    except re.error:
+        return None
+
+
+class ChromeLinkParser(LxmlParserLinkExtractor):
+    """
+    lxml link parser of the :obj:`CompiledLinkExtractor`, which skips the links of the site chrome already extracted
+    from another page of the domain, unless they also appear outside of the site chrome.
+
+    Attributes:
+        regions (:obj:`FrozenSet`):
+            The root nodes of the site chrome of the parsed page.
+        skipped_hrefs (:obj:`FrozenSet[str]`):
+            The chrome links (i.e. the `href` values, as written in the markup) skipped in these regions.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(ChromeLinkParser, self).__init__(*args, **kwargs)
+        self.regions = frozenset()
+        self.skipped_hrefs = frozenset()
+
+    def _iter_links(self, document):
+        for (el, attrib, value) in super(ChromeLinkParser, self)._iter_links(document):
+            # Only the links already extracted are looked up in the site chrome
+            if value in self.skipped_hrefs and any(ancestor in self.regions for ancestor in el.iterancestors()):
+                continue
+            yield (el, attrib, value)
+
+
+class CompiledLinkExtractor(LinkExtractor):
+    """
+    Link extractor which compiles the `allow` and `deny` regular expressions into a single matcher each,
+    and caches the filtering decision for recently seen URLs.
+
+    The links of the site chrome (i.e. the boilerplate regions) are extracted from the first page of each domain,
+    and skipped in the site chrome of the other pages, such that they are extracted once per domain. Hence, unlike
+    :obj:`LinkExtractor`, the pages after the first one of a domain do not return the chrome links already extracted;
+    all their other links (including the chrome links also found elsewhere in the page, and the chrome links not
+    recorded from the first page) are extracted as usual.
+
+    Args:
+        cache_size (:obj:`int`):
+            Maximum number of URLs for which the filtering decision is cached.
+        boilerplate_xpaths (:obj:`List[str]`):
+            XPaths of the page regions whose links repeat on every page.
+        boilerplate_css (:obj:`List[str]`):
+            CSS selectors of the page regions whose links repeat on every page.
+        max_chrome_links (:obj:`int`):
+            Maximum number of chrome links recorded per domain.
+        max_domains (:obj:`int`):
+            Maximum number of domains whose chrome links are recorded; the least recently recorded one is evicted.
+    """
+
+    def __init__(self, *args, cache_size: int = 10000, boilerplate_xpaths=BOILERPLATE_XPATHS, boilerplate_css=(),
+            max_chrome_links: int = 500, max_domains: int = 100, **kwargs):
+        super(CompiledLinkExtractor, self).__init__(*args, **kwargs)
+        self.allow_re = compile_patterns(self.allow_res)
+        self.deny_re = compile_patterns(self.deny_res)
+        self._url_allowed = lru_cache(maxsize=cache_size)(self._url_allowed)
+
+        boilerplate_xpaths = tuple(arg_to_iter(boilerplate_xpaths)) + tuple(map(self._csstranslator.css_to_xpath, arg_to_iter(boilerplate_css)))
+        self.boilerplate_xpath = ' | '.join(boilerplate_xpaths)
+
+        # Parse the links with the same options, skipping the chrome links already extracted
+        parser = self.link_extractor
+        self.link_extractor = ChromeLinkParser(tag=parser.scan_tag, attr=parser.scan_attr, process=parser.process_attr, unique=parser.unique, strip=parser.strip)
+        self.link_extractor.link_key = parser.link_key
+
+        # Chrome links recorded from the first page of each domain
+        self.max_chrome_links = max_chrome_links
+        self.max_domains = max_domains
+        self.chrome_hrefs: Dict[str, FrozenSet[str]] = dict()
+
+    def extract_links(self, response):
+        """ Extract the links of the page, skipping the chrome links already extracted from another page of the same domain. """
+        if not self.boilerplate_xpath:
+            return super(CompiledLinkExtractor, self).extract_links(response)
+
+        domain = urlparse(response.url).netloc
+        skipped_hrefs = self.chrome_hrefs.get(domain)
+        if skipped_hrefs is None:
+            # First page of the domain: all its links are extracted, and its chrome links are recorded
+            self._record_chrome_links(response, domain)
+            return super(CompiledLinkExtractor, self).extract_links(response)
+
+        docs = [subdoc for xpath in self.restrict_xpaths for subdoc in response.xpath(xpath)] if self.restrict_xpaths else [response.selector]
+
+        if skipped_hrefs:
+            self.link_extractor.regions = frozenset(region.root for region in response.xpath(self.boilerplate_xpath))
+            self.link_extractor.skipped_hrefs = skipped_hrefs
+        try:
+            base_url = get_base_url(response)
+            links = [link for doc in docs for link in self._process_links(self._extract_links(doc, response.url, response.encoding, base_url))]
+        finally:
+            self.link_extractor.regions = frozenset()
+            self.link_extractor.skipped_hrefs = frozenset()
+        return unique_list(links)
+
+    def _record_chrome_links(self, response, domain: str):
+        """ Record the links of the page's site chrome as the chrome links of the domain. """
+        if len(self.chrome_hrefs) >= self.max_domains:
+            del self.chrome_hrefs[next(iter(self.chrome_hrefs))]
+        hrefs = (value for region in response.xpath(self.boilerplate_xpath) for (_, _, value) in self.link_extractor._iter_links(region.root))
+        self.chrome_hrefs[domain] = frozenset(islice(dict.fromkeys(hrefs), self.max_chrome_links))
+
+    def _url_allowed(self, url: str) -> bool:
+        """ Check the URL against the allow and deny expressions, domains, and extensions. """
+        if not _is_valid_url(url):
+            return False
+        if self.allow_res and not (self.allow_re.search(url) if self.allow_re else _matches(url, self.allow_res)):
+            return False
+        if self.deny_res and (self.deny_re.search(url) if self.deny_re else _matches(url, self.deny_res)):
+            return False
+        parsed_url = urlparse(url)
+        if self.allow_domains and not url_is_from_any_domain(parsed_url, self.allow_domains):
+            return False
+        if self.deny_domains and url_is_from_any_domain(parsed_url, self.deny_domains):
+            return False
+        if self.deny_extensions and url_has_any_extension(parsed_url, self.deny_extensions):
+            return False
+        return True
+
+    def _link_allowed(self, link) -> bool:
+        if not self._url_allowed(link.url):
+            return False
+        if self.restrict_text and not _matches(link.text, self.restrict_text):
+            return False
+        return True
@@ -5,9 +5,13 @@
 # See documentation in:
 # http://doc.scrapy.org/en/latest/topics/spider-middleware.html
 
+import os
+import dbm
+import json
+from time import perf_counter
 from random import choice
-from scrapy import signals
-from scrapy.exceptions import NotConfigured
+from scrapy import signals, Item
+from scrapy.exceptions import IgnoreRequest, NotConfigured
 
 
 class RotateUserAgentMiddleware(object):
@@ -35,3 +39,99 @@ class RotateUserAgentMiddleware(object):
         if not self.enabled or not self.user_agents:
             return 
         request.headers['user-agent'] = choice(self.user_agents)
+
+
+class ConditionalRequestMiddleware(object):
+    """
+    Middleware for recrawling only modified pages. Stores the validators (i.e. `ETag` and `Last-Modified` headers) of each downloaded page,
+    and, if the spider runs in recrawl mode, sends conditional requests for article pages downloaded in a previous crawl.
+    Article pages not modified since (i.e. `304 Not Modified` responses) are neither downloaded nor processed again.
+    Start pages and pages whose links are only followed (i.e. requested by a rule without callback, such as hubs and
+    sections) are always downloaded, since their links lead to the new articles.
+    """
+
+    def __init__(self, stats, topic: str):
+        self.stats = stats
+        self.topic = topic
+        self.recrawl = False
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        if not crawler.settings.getbool('CONDITIONAL_RECRAWL_ENABLED'):
+            raise NotConfigured
+        s = cls(crawler.stats, crawler.settings.get('TOPIC'))
+        crawler.signals.connect(s.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(s.spider_closed, signal=signals.spider_closed)
+        return s
+
+    def spider_opened(self, spider):
+        self.recrawl = getattr(spider, 'recrawl', self.recrawl)
+
+        # Validators are stored per spider and kept across crawls
+        folder = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', 'data', self.topic, spider.name)
+        if not os.path.isdir(folder):
+            os.makedirs(folder)
+        self.db = dbm.open(os.path.join(folder, 'validators.db'), 'c')
+
+    def spider_closed(self, spider):
+        self.db.close()
+
+    def process_request(self, request, spider):
+        """Add the validators of the previous crawl to the request"""
+        if not self.recrawl or request.meta.get('dont_conditional') or not self._is_article_request(request, spider):
+            return
+        validators = self.db.get(request.url)
+        if not validators:
+            return
+        validators = json.loads(validators)
+        if validators.get('etag'):
+            request.headers.setdefault('If-None-Match', validators['etag'])
+        if validators.get('last_modified'):
+            request.headers.setdefault('If-Modified-Since', validators['last_modified'])
+
+    @staticmethod
+    def _is_article_request(request, spider) -> bool:
+        """Check if the request was made by a rule of the spider with a callback (i.e. not a start URL nor a link-only page)"""
+        rule = request.meta.get('rule')
+        rules = getattr(spider, '_rules', None)
+        if rule is None or not rules or rule >= len(rules):
+            return False
+        return rules[rule].callback is not None
+
+    def process_response(self, request, response, spider):
+        """Skip unmodified pages, and store the validators of the downloaded ones"""
+        if response.status == 304 and (b'If-None-Match' in request.headers or b'If-Modified-Since' in request.headers):
+            self.stats.inc_value('conditional_recrawl/not_modified', spider=spider)
+            raise IgnoreRequest('Not modified since the previous crawl: {}'.format(request.url))
+
+        if response.status == 200:
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            if etag or last_modified:
+                self.db[request.url] = json.dumps({
+                    'etag': etag.decode('latin-1') if etag else None,
+                    'last_modified': last_modified.decode('latin-1') if last_modified else None
+                    })
+                self.stats.inc_value('conditional_recrawl/stored', spider=spider)
+        return response
+
+
+class StageTimingMiddleware(object):
+    """
+    Spider middleware timing the building of each item, i.e. from the spider's last validation of the article
+    (e.g. the keyword validation) until the item is yielded. The other stages are timed by the :obj:`StageTimingExtension`.
+    """
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        if not crawler.settings.getbool('TIMING_ENABLED'):
+            raise NotConfigured
+        return cls()
+
+    def process_spider_output(self, response, result, spider):
+        timings = getattr(spider, 'timings', None)
+        for element in result:
+            if timings is not None and timings.last_method_end and isinstance(element, (Item, dict)):
+                timings.record('item', perf_counter() - timings.last_method_end)
+                timings.last_method_end = 0.0
+            yield element
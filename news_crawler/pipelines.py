@@ -6,48 +6,230 @@
 # See: http://doc.scrapy.org/en/latest/topics/item-pipeline.html
 import os
 import json
-from scrapy.utils.project import get_project_settings
+from abc import ABC, abstractmethod
+from scrapy.exceptions import DropItem, NotConfigured
+from news_crawler.dedup import MinHasher, MinHashLSHIndex
+from typing import Dict, List
 
 
-class HtmlWriterPipeline(object):
-    """ Creates one directory per spider and stores each scraped page as html. """
+def item_topics(item, default: str) -> List[str]:
+    """
+    Returns the topics of an item, i.e. the topics whose criteria the article meets.
+
+    Args:
+        item (:obj:`NewsCrawlerItem`):
+            The scraped item.
+        default (:obj:`str`):
+            The topic of the crawl, for items without topics.
+
+    Returns:
+        :obj:`List[str]`:
+            The names of the item's topics.
+    """
+    return list(item.get('topics') or ()) or [default]
+
+
+def item_to_json(item, several_topics: bool) -> Dict:
+    """
+    Returns the fields of an item stored in its JSON file, i.e. without the response body, and without the topics in
+    single-topic crawls (such that their files are unchanged).
+
+    Args:
+        item (:obj:`NewsCrawlerItem`):
+            The scraped item.
+        several_topics (:obj:`bool`):
+            Whether several topics are crawled.
+
+    Returns:
+        :obj:`Dict`:
+            The stored fields of the item.
+    """
+    result = dict(item)
+    result.pop('response_body', None)
+    if not several_topics:
+        result.pop('topics', None)
+    return result
+
+
+class NearDuplicatePipeline(object):
+    """ 
+    Detects near-duplicate articles (e.g. syndicated wire pieces) across spiders and crawls, based on MinHash signatures of their body text.
+    Depending on the action, near-duplicates are dropped, flagged, or linked (i.e. stored without body, only referencing the original article).
+    Each topic has its own index; an article is a near-duplicate if it is one in every topic it belongs to, and it is
+    indexed in the topics it is new to.
+
+    Args:
+        stats (:obj:`Dict`):
+            The crawler statistics.
+        action (:obj:`str`):
+            The action taken for near-duplicates: `drop`, `flag`, or `link`.
+        threshold (:obj:`float`):
+            Minimum estimated Jaccard similarity between near-duplicate articles.
+        topic (:obj:`str`):
+            The topic of the crawl, for items without topics.
+    """
+
+    actions = ('drop', 'flag', 'link')
+
+    def __init__(self, stats, action: str, threshold: float, topic: str):
+        if action not in self.actions:
+            raise NotConfigured('NEAR_DUPLICATE_ACTION must be one of {}.'.format(', '.join(self.actions)))
+        self.stats = stats
+        self.action = action
+        self.topic = topic
+        self.threshold = threshold
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        # Check if the pipeline is enabled and raise NotConfigured otherwise
+        if not crawler.settings.getbool('NEAR_DUPLICATE_ENABLED'):
+            raise NotConfigured
+        return cls(crawler.stats, crawler.settings.get('NEAR_DUPLICATE_ACTION', 'flag'), crawler.settings.getfloat('NEAR_DUPLICATE_THRESHOLD', 0.8), crawler.settings.get('TOPIC'))
+
     def open_spider(self, spider):
-        # Create directory for the given spider
-        settings = get_project_settings()
-        topic = settings.get('TOPIC')
-        self.folder = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', 'data', topic, spider.name, 'html')
-        if not os.path.isdir(self.folder):
-            os.makedirs(self.folder)
-        
-        # Keep track of how many articles have been parsed
-        self.article_num = 0
+        self.hasher = MinHasher()
+        self.indexes = dict()
+
+    def close_spider(self, spider):
+        for index in self.indexes.values():
+            index.close()
+
+    def index(self, topic: str) -> MinHashLSHIndex:
+        """ Returns the index of the topic, opened on first use. """
+        if topic not in self.indexes:
+            # The index is shared by all spiders of a topic
+            folder = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', 'data', topic)
+            if not os.path.isdir(folder):
+                os.makedirs(folder)
+            self.indexes[topic] = MinHashLSHIndex(os.path.join(folder, 'near_duplicates.jsonl'), threshold=self.threshold, num_perm=self.hasher.num_perm)
+        return self.indexes[topic]
 
     def process_item(self, item, spider):
-        """ Save article's body in HTML format and pass item to the next pipeline. """
-        self.article_num += 1
-        file = str(self.article_num) + '.html'
-        with open(os.path.join(self.folder, file), 'wb') as f:
-            f.write(item['response_body'])
+        """ Look up the article's body in the indexes of previously stored articles, and index it if it is not a near-duplicate. """
+        text = ' '.join([para for paragraphs in item['content']['body'].values() for para in paragraphs])
+        signature = self.hasher.signature(text)
+        originals = {topic: self.index(topic).query(signature, item['provenance']) for topic in item_topics(item, self.topic)}
+
+        if not all(originals.values()):
+            for topic, original in originals.items():
+                if not original:
+                    self.index(topic).add(signature, item['provenance'], news_outlet=item['news_outlet'])
+            return item
+
+        original = next(iter(originals.values()))
+        self.stats.inc_value('near_duplicate/{}'.format(self.action), spider=spider)
+        if self.action == 'drop':
+            raise DropItem('Near-duplicate of {}'.format(original))
+
+        item['near_duplicate_of'] = original
+        if self.action == 'link':
+            # Store only the metadata of the article, the content is available from the original
+            item['content']['body'] = dict()
+            item['response_body'] = None
         return item
-        
 
-class JsonWriterPipeline(object):
-    """ Creates one directory per spider and writes each item into a new json file. """
+
+class TopicWriterPipeline(ABC):
+    """
+    Base class of the pipelines storing each scraped item in the directory of the spider, for each topic of the item
+    (i.e. `data/$TOPIC/$OUTLET/$FORMAT`). The files of each topic are numbered in the order the items are scraped.
+
+    Args:
+        topic (:obj:`str`):
+            The topic of the crawl, for items without topics.
+    """
+
+    # Subfolder and file extension of the stored items
+    format = ''
+
+    def __init__(self, topic: str):
+        self.topic = topic
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls(crawler.settings.get('TOPIC'))
+
     def open_spider(self, spider):
-        # Create directory for the given spider
-        settings = get_project_settings()
-        topic = settings.get('TOPIC')
-        self.folder = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', 'data', topic, spider.name, 'json')
-        if not os.path.isdir(self.folder):
-            os.makedirs(self.folder)
+        # Directory and number of articles parsed for each topic
+        self.spider_name = spider.name
+        self.folders = dict()
+        self.article_num = dict()
+        self.resumed = False
+
+        # Create directory for the crawl's topic
+        self.folder(self.topic)
 
-        self.article_num = 0
+    def folder(self, topic: str) -> str:
+        """ Returns the directory of the topic, created on first use. """
+        if topic not in self.folders:
+            folder = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', 'data', topic, self.spider_name, self.format)
+            if not os.path.isdir(folder):
+                os.makedirs(folder)
+            self.folders[topic] = folder
+            self.article_num.setdefault(topic, 0)
+            if self.resumed:
+                self._skip_existing_files(topic)
+        return self.folders[topic]
+
+    def checkpoint_state(self):
+        """ Return the counters to be stored in the crawl checkpoint. """
+        return {'article_num': dict(self.article_num)}
+
+    def restore_checkpoint_state(self, state):
+        """ Continue numbering files from the checkpointed counters, so that existing files are not overwritten. """
+        article_num = state.get('article_num', dict())
+        if isinstance(article_num, int):
+            # Checkpoints of single-topic crawls
+            article_num = {self.topic: article_num}
+        self.article_num.update(article_num)
+        self.resumed = True
+
+        for topic in self.folders:
+            self._skip_existing_files(topic)
+
+    def _skip_existing_files(self, topic: str):
+        # Items written after the last checkpoint (i.e. before a crash) are kept as well
+        while os.path.exists(os.path.join(self.folders[topic], str(self.article_num[topic] + 1) + '.' + self.format)):
+            self.article_num[topic] += 1
 
     def process_item(self, item, spider):
+        """ Store the item in the directory of each of its topics, and pass it to the next pipeline. """
+        for topic in item_topics(item, self.topic):
+            folder = self.folder(topic)
+            self.article_num[topic] += 1
+            self.write(item, os.path.join(folder, str(self.article_num[topic]) + '.' + self.format))
+        return item
+
+    @abstractmethod
+    def write(self, item, path: str):
+        """ Store the item in the given file. """
+
+
+class HtmlWriterPipeline(TopicWriterPipeline):
+    """ Creates one directory per spider and topic, and stores each scraped page as html. """
+    format = 'html'
+
+    def write(self, item, path: str):
+        """ Save article's body in HTML format. """
+        if item['response_body'] is None:
+            # Linked near-duplicates are not stored
+            return
+        with open(path, 'wb') as f:
+            f.write(item['response_body'])
+        
+
+class JsonWriterPipeline(TopicWriterPipeline):
+    """
+    Creates one directory per spider and topic, and writes each item into a new json file.
+    The topics of the item are only written in crawls of several topics, such that the files of single-topic crawls are unchanged.
+    """
+    format = 'json'
+
+    def open_spider(self, spider):
+        super(JsonWriterPipeline, self).open_spider(spider)
+        self.several_topics = len(getattr(spider, 'topics', ())) > 1
+
+    def write(self, item, path: str):
         """ Save item in JSON file. """
-        self.article_num += 1
-        file = str(self.article_num) + '.json'
-        result = dict(item)
-        result.pop('response_body')
-        with open(os.path.join(self.folder, file), 'w') as f:
-            json.dump(result, f)
+        with open(path, 'w') as f:
+            json.dump(item_to_json(item, self.several_topics), f)
@@ -13,6 +13,9 @@ BOT_NAME = 'news_crawler'
 
 SPIDER_MODULES = ['news_crawler.spiders']
 NEWSPIDER_MODULE = 'news_crawler.spiders'
+# Import only the module of the crawled spider
+SPIDER_LOADER_CLASS = 'news_crawler.spiderloader.LazySpiderLoader'
+COMMANDS_MODULE = 'news_crawler.commands'
 
 # Run spider until item count or timeout
 CLOSESPIDER_TIMEOUT = 3600*24*10 
@@ -29,6 +32,13 @@ KEYWORDS_MIN_DISTANCE = 50
 
 KEYWORDS = ['refugee', 'immigrant', 'migrant', 'asylum seeker', 'asylum applicant', 'asylee', 'person seeking asylum', 'displaced person', 'displaced people', 'deportation', 'immigration']
 
+# Additional topics collected in the same crawl, each stored in data/$TOPIC (e.g. {'climate_change': {'KEYWORDS': ['climate change', 'global warming'], 'ARTICLE_LENGTH': 300}});
+# the START_DATE, END_DATE, ARTICLE_LENGTH, KEYWORDS, KEYWORDS_MIN_FREQUENCY, and KEYWORDS_MIN_DISTANCE of a topic default to the ones above
+TOPICS = {}
+
+# Number of URLs sampled per rejection reason in the funnel stats (e.g. `funnel/rejected/too_short/samples`)
+FUNNEL_SAMPLE_SIZE = 5
+
 # Crawl responsibly by identifying yourself (and your website) on the user-agent
 #USER_AGENT = 'news_crawler (+http://www.yourdomain.com)'
 
@@ -60,16 +70,20 @@ COOKIES_ENABLED = False
 
 # Enable or disable spider middlewares
 # See http://scrapy.readthedocs.org/en/latest/topics/spider-middleware.html
-#SPIDER_MIDDLEWARES = {
-#    'news_crawler.middlewares.MyCustomSpiderMiddleware': 543,
-#}
+SPIDER_MIDDLEWARES = {
+    'news_crawler.middlewares.StageTimingMiddleware': 950,
+}
 
 # Enable or disable downloader middlewares
 # See http://scrapy.readthedocs.org/en/latest/topics/downloader-middleware.html
 DOWNLOADER_MIDDLEWARES = {
     'news_crawler.middlewares.RotateUserAgentMiddleware': 110,
+    'news_crawler.middlewares.ConditionalRequestMiddleware': 120,
 }
 
+# Store page validators (ETag, Last-Modified), such that a recrawl (`scrapy crawl $OUTLET -a recrawl=true`) skips unmodified pages
+CONDITIONAL_RECRAWL_ENABLED = True
+
 #User agents used for rotation (most common agents)
 USER_AGENT_CHOICES = [
         'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/534.30 (KHTML, like Gecko) Ubuntu/11.04 Chromium/12.0.742.112 Chrome/12.0.742.112 Safari/534.30',
@@ -85,18 +99,71 @@ USER_AGENT_CHOICES = [
 # Enable or disable extensions
 # See http://scrapy.readthedocs.org/en/latest/topics/extensions.html
 PERSIST_STATS_ENABLED = True
+# Number of seconds between two snapshots of the stats time series (`stats_series.jsonl`); 0 writes the stats only when the spider closes
+PERSIST_STATS_INTERVAL = 60
+
+# Checkpoint the crawl state periodically; resume with `scrapy crawl $OUTLET -a resume=true`
+CHECKPOINT_ENABLED = True
+CHECKPOINT_INTERVAL = 600
+CHECKPOINT_COMPACTION_RATIO = 4
+
+# Time the article processing stages (e.g. download, date gate, keyword validation, pipelines), reported as `timing/*` stats
+TIMING_ENABLED = True
+
+# Serve live crawl metrics in the Prometheus text format on the first free port of METRICS_PORT (`http://127.0.0.1:$PORT/metrics`)
+METRICS_ENABLED = False
+METRICS_PORT = [9410, 9460]
+METRICS_HOST = '127.0.0.1'
+
+# Profile a sample of the article callbacks and pipeline invocations, written to `data/$TOPIC/$OUTLET/profile.pstats` and `profile.txt`
+PROFILING_ENABLED = False
+PROFILING_SAMPLE_RATE = 0.01
+PROFILING_INTERVAL = 600
+
+# Track the memory usage (resident set size, live requests, responses, and items), reported as `memory/*` stats
+MEMORY_TRACKING_ENABLED = True
+MEMORY_TRACKING_INTERVAL = 60
+# Pause the scheduling of requests above this resident set size (in megabytes) until the in-flight work is drained; 0 disables it
+MEMORY_SOFT_LIMIT_MB = 0
+# Fraction of the soft limit below which the resident set size must fall before the limit applies again at its full value;
+# if it stays above once the in-flight work is drained, the scheduling is only paused again after it grew by the difference
+MEMORY_RESUME_RATIO = 0.9
+# Record the source lines allocating most memory (slows down the crawl)
+MEMORY_TRACEMALLOC = False
+MEMORY_TRACEMALLOC_TOP = 10
+
+# Report the requests, bytes, and parsed pages spent per kept article, per URL section, in `data/$TOPIC/$OUTLET/efficiency.json`
+EFFICIENCY_REPORT_ENABLED = True
+# Number of seconds between two reports while the spider runs; 0 writes the report only when the spider closes
+EFFICIENCY_REPORT_INTERVAL = 0
+EFFICIENCY_SECTION_DEPTH = 1
+EFFICIENCY_MAX_SECTIONS = 100
+
 EXTENSIONS = {
+        'news_crawler.extensions.StageTimingExtension': 400,
+        'news_crawler.extensions.CrawlEfficiencyExtension': 450,
         'scrapy.extensions.closespider.CloseSpider': 500,
-        'news_crawler.extensions.PersistStatsExtension': 500
+        'news_crawler.extensions.PersistStatsExtension': 500,
+        'news_crawler.extensions.CheckpointExtension': 510,
+        'news_crawler.extensions.MetricsExtension': 520,
+        'news_crawler.extensions.ProfilingExtension': 530,
+        'news_crawler.extensions.MemoryTrackingExtension': 540
 }
 
 # Configure item pipelines
 # See http://scrapy.readthedocs.org/en/latest/topics/item-pipeline.html
 ITEM_PIPELINES = {
+    'news_crawler.pipelines.NearDuplicatePipeline': 50,
     'news_crawler.pipelines.HtmlWriterPipeline': 100,
     'news_crawler.pipelines.JsonWriterPipeline': 200,
 }
 
+# Detect near-duplicate articles (e.g. syndicated wire pieces) across outlets and crawls
+# Action for near-duplicates: 'drop', 'flag' (store with reference to the original), or 'link' (store metadata only)
+NEAR_DUPLICATE_ENABLED = True
+NEAR_DUPLICATE_ACTION = 'flag'
+NEAR_DUPLICATE_THRESHOLD = 0.8
+
 # Enable and configure the AutoThrottle extension (disabled by default)
 # See http://doc.scrapy.org/en/latest/topics/autothrottle.html
 #AUTOTHROTTLE_ENABLED = True
@@ -113,7 +180,17 @@ ITEM_PIPELINES = {
 # Enableand configure HTTP caching (disabled by default)
 # See http://scrapy.readthedocs.org/en/latest/topics/downloader-middleware.html#httpcache-middleware-settings
 #HTTPCACHE_ENABLED = True
-#HTTPCACHE_EXPIRATION_SECS = 0
-#HTTPCACHE_DIR = 'httpcache'
+HTTPCACHE_EXPIRATION_SECS = 900
+HTTPCACHE_DIR = 'httpcache'
 #HTTPCACHE_IGNORE_HTTP_CODES = []
-#HTTPCACHE_STORAGE = 'scrapy.extensions.httpcache.FilesystemCacheStorage' 
+HTTPCACHE_STORAGE = 'news_crawler.httpcache.SegmentCacheStorage'
+# Expiration time (in seconds) per URL class, first match wins; other pages (e.g. hubs, sections) expire after HTTPCACHE_EXPIRATION_SECS
+HTTPCACHE_TTL_RULES = [
+    (r'\/\d{4}\/\d{1,2}\/', 0),                         # dated article pages never expire
+    (r'\/[^\/?#]*(-[^\/?#-]+){3,}(\.html?)?\/?$', 0)   # article pages with a slug never expire
+]
+HTTPCACHE_SEGMENT_SIZE = 64*1024*1024
+HTTPCACHE_COMPRESSION_LEVEL = 6
+# Replay a cached crawl offline (read-only cache, no expiration)
+#HTTPCACHE_REPLAY = True
+#HTTPCACHE_IGNORE_MISSING = True
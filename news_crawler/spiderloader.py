@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+# Spider loader for news_crawler project
+
+import importlib
+from importlib.util import find_spec
+from zope.interface import implementer
+from scrapy.interfaces import ISpiderLoader
+from scrapy.spiderloader import SpiderLoader
+from scrapy.utils.spider import iter_spider_classes
+from typing import Dict, List, Optional
+
+
+@implementer(ISpiderLoader)
+class LazySpiderLoader(object):
+    """
+    Spider loader which imports only the module of the requested spider (i.e. the module named after the spider,
+    e.g. `news_crawler.spiders.cnn`), instead of all spider modules, such that running a single spider starts faster.
+    Spiders not named after their module, the list of all spiders, and the lookup of spiders by request fall back
+    to Scrapy's :obj:`SpiderLoader`, which imports all spider modules.
+
+    Args:
+        settings (:obj:`Settings`):
+            The project settings (i.e. `SPIDER_MODULES`).
+    """
+
+    def __init__(self, settings):
+        self.settings = settings
+        self.spider_modules = settings.getlist('SPIDER_MODULES')
+        self._spiders: Dict[str, type] = dict()
+        self._loader: Optional[SpiderLoader] = None
+
+    @classmethod
+    def from_settings(cls, settings):
+        return cls(settings)
+
+    def load(self, spider_name: str) -> type:
+        """ Returns the spider class of the given name, and raises a :obj:`KeyError` if there is none. """
+        if spider_name not in self._spiders:
+            self._spiders[spider_name] = self._load_module(spider_name) or self._all_spiders().load(spider_name)
+        return self._spiders[spider_name]
+
+    def list(self) -> List[str]:
+        return self._all_spiders().list()
+
+    def find_by_request(self, request) -> List[str]:
+        return self._all_spiders().find_by_request(request)
+
+    def _load_module(self, spider_name: str) -> Optional[type]:
+        for package in self.spider_modules:
+            module_name = '{}.{}'.format(package, spider_name)
+            try:
+                if find_spec(module_name) is None:
+                    continue
+            except (ImportError, ValueError):
+                continue
+            for spidercls in iter_spider_classes(importlib.import_module(module_name)):
+                if spidercls.name == spider_name:
+                    return spidercls
+        return None
+
+    def _all_spiders(self) -> SpiderLoader:
+        if self._loader is None:
+            self._loader = SpiderLoader.from_settings(self.settings)
+        return self._loader
@@ -1,11 +1,14 @@
 # -*- coding: utf-8 -*-
 
 from datetime import datetime
-from itertools import combinations
+from random import randrange
 from scrapy.spiders import CrawlSpider
-from scrapy.exceptions import NotConfigured
 from scrapy.utils.project import get_project_settings
-from typing import List
+from news_crawler.extraction import ExtractionSpec, Extraction
+from news_crawler.topics import TopicProfile, load_topic_profiles
+from news_crawler.keywords import KeywordMatcher
+from news_crawler.timing import StageTimings, timed
+from typing import Dict, List, Optional, Tuple
 
 
 class BaseSpider(CrawlSpider):
@@ -13,78 +16,153 @@ class BaseSpider(CrawlSpider):
     Base class for all spiders; inherits from CrawlSpider and implements article validation methods.
 
     Args:
-        start_date (:obj:`str`):
-            The date from which an article is relevant.
-        end_date (:obj:`str`):
-            The date until which an article is relevant.
-        article_length (:obj:`int`):
-            Minimum article length required.
-        keywords (:obj:`List[str]`):
-            Query keyword stems. 
-        keywords_min_frequency (:obj:`int`):
-            Minimum number of keyword stems that should be contained in a relevant article.
-        keywords_min_distance (:obj:`int`):
-            Minimum token difference between any two words containing a keyword stem.
+        topics (:obj:`List[TopicProfile]`):
+            The relevance criteria (i.e. date range, article length, and keywords) of each crawled topic, all evaluated in the same pass.
+        keyword_matcher (:obj:`KeywordMatcher`):
+            Matcher of the single-token and compound keyword stems of all topics, with compound keywords of any length.
+        candidate_topics (:obj:`List[TopicProfile]`):
+            The topics whose criteria the current article met so far.
+        matched_topics (:obj:`Dict[str, List[str]]`):
+            The topics whose criteria the current article meets, with the keyword stems found in the article for each topic.
         query_keywords (:obj:`List[str]`):
-            List of keyword stems found in the article.
+            List of keyword stems found in the article, for any matched topic.
+        resume (:obj:`bool`):
+            Whether to resume the crawl from the last checkpoint (e.g. `scrapy crawl $OUTLET -a resume=true`).
+        recrawl (:obj:`bool`):
+            Whether to skip pages not modified since the previous crawl, using conditional requests (e.g. `scrapy crawl $OUTLET -a recrawl=true`).
+        extraction_spec (:obj:`Dict[str, str]`):
+            XPath expressions of the article's fields, declared per outlet and compiled once.
+        structured_data_spec (:obj:`Dict[str, str]`):
+            JSON-LD properties of the article's fields (e.g. `{'creation_date': 'datePublished'}`), preferred over their XPaths when available.
+        timings (:obj:`Optional[StageTimings]`):
+            Latencies of the article processing stages, set by the :obj:`StageTimingExtension` if enabled.
+        settings (:obj:`Optional[Settings]`):
+            The settings of the crawl, passed by :obj:`from_crawler`; the project settings are read if the spider is created without a crawler (e.g. to re-extract archived pages).
+        stats (:obj:`Optional[StatsCollector]`):
+            The crawler statistics, in which the article funnel (i.e. `funnel/responses`, `funnel/accepted`, and
+            `funnel/rejected/$REASON` with a sample of the rejected URLs) is counted.
     """
 
-    def __init__(self):
-        settings = get_project_settings()
-
-        if not settings.get('START_DATE'):
-            raise NotConfigured
-        self.start_date = settings.get('START_DATE')
-        self.start_date = datetime.strptime(self.start_date, '%d.%m.%Y')
-    
-        if not settings.get('END_DATE'):
-            raise NotConfigured
-        self.end_date = settings.get('END_DATE')
-        self.end_date = datetime.strptime(self.end_date, '%d.%m.%Y')
-        
-        if not settings.get('ARTICLE_LENGTH'):
-            raise NotConfigured
-        self.article_length = settings.get('ARTICLE_LENGTH')
-
-        if not settings.get('KEYWORDS'):
-            raise NotConfigured
-        self.keywords = settings.get('KEYWORDS')
-
-        # Check if there are compound keywords (e.g. bedingungslos* einkommen*), and if so, separate single-token and multiple-token keywords
-        self.compound_keywords = [keyword for keyword in self.keywords if len(keyword.split())>1]
-        if self.compound_keywords:
-            self.keywords = [keyword for keyword in self.keywords if not keyword in self.compound_keywords]
-        
-        if not settings.get('KEYWORDS_MIN_FREQUENCY'):
-            raise NotConfigured
-        self.keywords_min_frequency = settings.get('KEYWORDS_MIN_FREQUENCY')
-
-        if not settings.get('KEYWORDS_MIN_DISTANCE'):
-            raise NotConfigured
-        self.keywords_min_distance = settings.get('KEYWORDS_MIN_DISTANCE')
+    extraction_spec: Dict[str, str] = dict()
+    structured_data_spec: Dict[str, str] = dict()
+    timings: Optional[StageTimings] = None
+    stats = None
 
+    def __init__(self, *args, settings=None, resume: str = None, recrawl: str = None, **kwargs):
+        if settings is None:
+            settings = get_project_settings()
+
+        # Resume from the last checkpoint, if requested
+        self.resume = str(resume).lower() in ('1', 'true', 'yes')
+
+        # Only fetch pages modified since the previous crawl, if requested
+        self.recrawl = str(recrawl).lower() in ('1', 'true', 'yes')
+
+        # Topics whose articles are collected in the same crawl, the crawl's topic first
+        self.topics = load_topic_profiles(settings)
+        self.keyword_matcher = KeywordMatcher(self.topics)
+        self.candidate_topics = self.topics
+        self.matched_topics = dict()
         self.query_keywords= list()
 
-        super(BaseSpider, self).__init__()
+        # Number of URLs sampled per funnel stage
+        self.funnel_sample_size = settings.getint('FUNNEL_SAMPLE_SIZE', 5)
+        self.current_url = None
+
+        self.spec = ExtractionSpec(self.extraction_spec, self.structured_data_spec)
+
+        super(BaseSpider, self).__init__(*args, **kwargs)
+
+    @classmethod
+    def from_crawler(cls, crawler, *args, **kwargs):
+        spider = super(BaseSpider, cls).from_crawler(crawler, *args, settings=crawler.settings, **kwargs)
+        spider.stats = crawler.stats
+        return spider
+
+    def extract(self, response) -> Extraction:
+        """
+        Run the outlet's extraction spec on the response.
+
+        Args:
+            response (:obj:`Response`):
+                The article's response.
 
+        Returns:
+            :obj:`Extraction`:
+                The lazily evaluated fields of the article.
+        """
+        self.start_article(response.url)
+        self._count_funnel('responses')
+        return self.spec(response, self.timings)
+
+    def start_article(self, url: Optional[str] = None):
+        """
+        Reset the validation state of the spider for a new article, i.e. all topics are candidates again.
+
+        Args:
+            url (:obj:`Optional[str]`):
+                The article's URL, sampled in the funnel stats.
+        """
+        self.current_url = url
+        self.candidate_topics = self.topics
+        self.matched_topics = dict()
+        self.query_keywords = list()
+
+    def reject(self, reason: str):
+        """
+        Count the rejection of the current article in the funnel stats, and sample its URL.
+        The validation methods count their rejections themselves; spiders count the other ones (e.g. a missing date).
 
-    def is_out_of_date(self, date: str) -> bool:
+        Args:
+            reason (:obj:`str`):
+                The reason of the rejection (e.g. `no_date`, `out_of_date`, `too_short`).
+        """
+        self._count_funnel('rejected/' + reason)
+
+    def _count_funnel(self, key: str):
+        """ Increment the funnel counter, and keep a uniform sample of its URLs (i.e. reservoir sampling). """
+        if self.stats is None:
+            return
+        key = 'funnel/' + key
+        self.stats.inc_value(key)
+        if key == 'funnel/responses' or not self.funnel_sample_size:
+            return
+
+        samples = self.stats.get_value(key + '/samples')
+        if samples is None:
+            samples = list()
+            self.stats.set_value(key + '/samples', samples)
+        if len(samples) < self.funnel_sample_size:
+            samples.append(self.current_url)
+        else:
+            i = randrange(self.stats.get_value(key))
+            if i < self.funnel_sample_size:
+                samples[i] = self.current_url
+
+    @timed('date')
+    def is_out_of_date(self, date: datetime) -> bool:
         """ 
-        Check if the article's date is in the required range.
+        Check if the article's date is in the required range of any candidate topic.
 
         Args: 
-            date (:obj:`str`):
+            date (:obj:`datetime`):
                 The publication date of the article.
 
         Returns:
             :obj:`bool`:
-                "onj:`True` if date is inside required range, :obj:`False` otherwise.
+                :obj:`True` if date is outside the required range of every topic, :obj:`False` otherwise.
         """
-        return date < self.start_date or date > self.end_date
+        ordinal = date.toordinal()
+        self.candidate_topics = [profile for profile in self.candidate_topics if profile.is_in_date_range(ordinal)]
+        if not self.candidate_topics:
+            self.reject('out_of_date')
+            return True
+        return False
 
+    @timed('length')
     def has_min_length(self, text):
         """ 
-        Check if the article's length has minimum required length.
+        Check if the article's length has minimum required length of any candidate topic.
 
         Args:
             text (:obj:`str`):
@@ -93,8 +171,14 @@ class BaseSpider(CrawlSpider):
             :obj:`bool`: 
                 :obj:`True` if the length meets minimum required length, :obj:`False` otherwise.
         """
-        return len(text.split()) >= self.article_length
-
+        length = len(text.split())
+        self.candidate_topics = [profile for profile in self.candidate_topics if length >= profile.article_length]
+        if not self.candidate_topics:
+            self.reject('too_short')
+            return False
+        return True
+
+    @timed('keywords')
     def has_valid_keywords(self, text: str) -> bool:
         """ 
         Check if any of the required keywords are found at least twice in the article.
@@ -114,7 +198,8 @@ class BaseSpider(CrawlSpider):
 
     def _has_valid_keywords(self, tokens: List[str]) -> bool:
         """
-        Check if single or compound keywords appear in the given list of tokens and meet the validity requirements.
+        Check if single or compound keywords appear in the given list of tokens and meet the validity requirements of
+        any candidate topic. The keywords of all topics are matched in a single scan of the tokens.
 
         Args: 
             tokens (:obj:`List[str]`):
@@ -123,62 +208,92 @@ class BaseSpider(CrawlSpider):
             "obj:`bool`: 
                 "obj:`True` if keyword requirements met, :obj:`False` otherwise.
         """
-        # Extract matching positions and tokens
-        matching_pos_tokens = [(tokens.index(token), token) for token in tokens if any(keyword in token for keyword in self.keywords)]
+        matches = self.keyword_matcher.match(tokens, [profile.name for profile in self.candidate_topics])
+
+        reasons = list()
+        self.matched_topics = dict()
+        for profile in self.candidate_topics:
+            reason, query_keywords = self._validate_topic(profile, tokens, *matches[profile.name])
+            if reason:
+                reasons.append(reason)
+            else:
+                self.matched_topics[profile.name] = query_keywords
+        self.candidate_topics = [profile for profile in self.candidate_topics if profile.name in self.matched_topics]
+
+        # The article is rejected for the reason of the first topic (i.e. the crawl's topic, if it was a candidate)
+        if not self.matched_topics:
+            self.reject(reasons[0] if reasons else 'no_keywords')
+            return False
+
+        # Update the list of query keyword stems used, for any topic
+        self.query_keywords = list(dict.fromkeys(keyword for keywords in self.matched_topics.values() for keyword in keywords))
+        self._count_funnel('accepted')
+        if len(self.topics) > 1:
+            for name in self.matched_topics:
+                self._count_funnel('accepted/' + name)
+        return True
+
+    def _validate_topic(self, profile: TopicProfile, tokens: List[str], matching_pos_tokens: List[Tuple[int, str]],
+            matching_compound_matches: List[Tuple[int, int, str]]) -> Tuple[Optional[str], List[str]]:
+        """
+        Check if the keyword matches of the article meet the validity requirements of the topic.
 
-        # Extract matching positions and tokens for compound keyword stems (e.g. bedingungslos* einkommen*)
+        Args:
+            profile (:obj:`TopicProfile`):
+                The topic's relevance criteria.
+            tokens (:obj:`List[str]`):
+                The article's body of text as list of tokens.
+            matching_pos_tokens (:obj:`List[Tuple[int, str]]`):
+                The matching positions and tokens of the topic's single keywords.
+            matching_compound_matches (:obj:`List[Tuple[int, int, str]]`):
+                The matching positions, number of tokens, and keywords of the topic's compound keywords.
+        Returns:
+            :obj:`Tuple[Optional[str], List[str]]`:
+                The reason of the rejection (:obj:`None` if the requirements are met), and the query keywords found.
+        """
         compound_query_keywords = list()
 
-        if self.compound_keywords:
-            double_keywords = [keyword for keyword in self.compound_keywords if len(keyword.split())==2]
-            triple_keywords = [keyword for keyword in self.compound_keywords if len(keyword.split())==3]
+        if matching_compound_matches:
+            # Keywords matching the same tokens
+            spans = dict()
+            for (start, length, keyword) in matching_compound_matches:
+                spans.setdefault((start, length), list()).append(keyword)
 
-            if double_keywords:
-                matching_double_pos_tokens = [(tokens.index(token), token, keyword) for token in tokens for keyword in double_keywords if ((keyword.split()[0] in token) and (keyword.split()[1] in tokens[tokens.index(token)+1]))]
-                if matching_double_pos_tokens:
-                    matching_double_pos = [pos for (pos, _, _) in matching_double_pos_tokens]
-                
-                    # Remove matches that might result from querying using both 'keywords' and 'double keywords'
-                    matching_pos_tokens = [(pos, token) for (pos, token) in matching_pos_tokens if (pos-1) not in matching_double_pos]
+            # Remove matches that might result from querying using both shorter and longer compound keywords (i.e. keep the longest match)
+            matching_compound_pos_tokens, matching_compound_pos, end = list(), set(), -1
+            for (start, length) in sorted(spans, key=lambda span: (span[0], -span[1])):
+                if start + length <= end:
+                    continue
+                end = start + length
+                matching_compound_pos.update(range(start, end))
+                matching_compound_pos_tokens.append((start, tokens[start]))
 
-                    # Add matches from compound keywords to all matches
-                    matching_pos_tokens.extend(list(set([(pos, token) for (pos, token, _) in matching_double_pos_tokens])))
+                # Update used query compound keywords
+                compound_query_keywords.extend(spans[(start, length)])
 
-                    # Update used query compound keywords
-                    compound_query_keywords.extend(list(set([keyword for (_, _, keyword) in matching_double_pos_tokens])))
+            # Remove matches that might result from querying using both 'keywords' and 'compound keywords'
+            matching_pos_tokens = [(pos, token) for (pos, token) in matching_pos_tokens if pos not in matching_compound_pos]
 
-            
-            if triple_keywords:
-                matching_triple_pos_tokens = [(tokens.index(token), token, keyword) for token in tokens for keyword in triple_keywords if ((keyword.split()[0] in token) and (keyword.split()[1] in tokens[tokens.index(token)+1]) and (keyword.split()[-1] in tokens[tokens.index(token)+2]))]
-            
-                if matching_triple_pos_tokens:
-                    matching_triple_pos = [pos for (pos, _, _) in matching_triple_pos_tokens]
-                
-                    # Remove matches that might result from querying using both 'double keywords' and 'triple keywords'
-                    matching_pos_tokens = [(pos, token) for (pos, token) in matching_pos_tokens if ((pos not in matching_triple_pos) and ((pos+1) not in matching_triple_pos))]
+            # Add matches from compound keywords to all matches
+            matching_pos_tokens.extend(matching_compound_pos_tokens)
 
-                    # Add matches from compound keywords to all matches
-                    matching_pos_tokens.extend(list(set([(pos, token) for (pos, token, _) in matching_triple_pos_tokens])))
+        # Check if there are any query keyword stems in the text
+        if not matching_pos_tokens:
+            return 'no_keywords', list()
+        matching_positions, matching_tokens = map(list, zip(*matching_pos_tokens))
 
-                    # Update used query compound keywords
-                    compound_query_keywords.extend([keyword for (_, _, keyword) in matching_triple_pos_tokens])
+        # Check the frequency of query keyword stems in the text
+        if len(matching_positions) < profile.keywords_min_frequency:
+            return 'keywords_min_frequency', list()
 
-        # Check if there are any query keyword stems in the text
-        if matching_pos_tokens:
-            matching_positions, matching_tokens = map(list, zip(*matching_pos_tokens))
-
-            # Check the frequency of query keyword stems in the text
-            if len(matching_positions) >= self.keywords_min_frequency:
-                
-                # Check the token difference between query keyword stems 
-                if any(abs(pos_1-pos_2) >= self.keywords_min_distance for (pos_1, pos_2) in list(combinations(matching_positions, 2))):
-                    
-                    # Update the list of query keyword stems used
-                    self.query_keywords = list(set(filter(lambda x: any(x in token for token in matching_tokens), self.keywords)))
-                    if compound_query_keywords:
-                        self.query_keywords.extend(list(set(compound_query_keywords)))
-                    return True
-        return False
+        # Check the token difference between query keyword stems, i.e. between the first and the last one
+        if max(matching_positions) - min(matching_positions) < profile.keywords_min_distance:
+            return 'keywords_min_distance', list()
+
+        query_keywords = list(set(filter(lambda x: any(x in token for token in matching_tokens), profile.keywords)))
+        if compound_query_keywords:
+            query_keywords.extend(list(set(compound_query_keywords)))
+        return None, query_keywords
 
     def get_query_keywords(self) -> List:
         """
@@ -188,5 +303,13 @@ class BaseSpider(CrawlSpider):
         """
         return self.query_keywords
 
+    def get_topics(self) -> Dict[str, List[str]]:
+        """
+        Returns:
+            :obj:`Dict[str, List[str]]`:
+                The topics whose criteria the article meets, with the query keywords found for each topic.
+        """
+        return self.matched_topics
+
     def parse(self, response):
         pass
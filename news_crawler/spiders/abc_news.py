@@ -4,12 +4,12 @@ import os
 import sys
 from news_crawler.spiders import BaseSpider
 from scrapy.spiders import Rule 
-from scrapy.linkextractors import LinkExtractor
-from datetime import datetime
+from news_crawler.linkextractors import CompiledLinkExtractor
 
 sys.path.insert(0, os.path.join(os.getcwd(), "..",))
 from news_crawler.items import NewsCrawlerItem
-from news_crawler.utils import remove_empty_paragraphs
+from news_crawler.utils import remove_empty_paragraphs, parse_date, format_date, crawl_date
+from news_crawler.bylines import parse_authors
 
 class ABCNewsSpider(BaseSpider):
     """ Spider for ABCNews"""
@@ -21,7 +21,7 @@ class ABCNewsSpider(BaseSpider):
     # Exclude irelevant pages
     rules = (
             Rule(
-                LinkExtractor(
+                CompiledLinkExtractor(
                     allow=(r'abcnews\.go\.com\/\w.*$'),
                     deny=(
                         r'abcnews\.go\.com\/Video',
@@ -38,21 +38,35 @@ class ABCNewsSpider(BaseSpider):
                 ),
             )
 
+    # XPaths of the article's fields
+    extraction_spec = {
+            'creation_date': '//div[@class="xTlfF  Vxqj "]/text()',
+            'paragraphs': '//article/p[not(child::em) and not(child::strong)]',
+            'authors': '//div[@class="iDmZj bGbFC xjUv wIScF ukJKQ zZhuN VfZP "]//span[not[contains(@text, "by")]]/text() | //div[@class="iDmZj bGbFC xjUv wIScF ukJKQ zZhuN VfZP "]//span/a/text()',
+            'news_keywords': '//meta[@name="keywords"]/@content',
+            'title': '//meta[@property="og:title"]/@content',
+            'description': '//meta[@property="og:description"]/@content',
+            'headlines': '//article/p/strong',
+            'body': '//article/p[not(child::em) and not(child::strong)] | //article/p/strong'
+            }
+
     def parse_item(self, response):
         """
         Checks article validity. If valid, it parses it.
         """
+        fields = self.extract(response)
 
-        creation_date = response.xpath('//div[@class="xTlfF  Vxqj "]/text()').get()
+        creation_date = fields.get('creation_date')
         if not creation_date:
+            self.reject('no_date')
             return
         creation_date = creation_date.rsplit(', ', 1)[0]
-        creation_date = datetime.strptime(creation_date,'%B %d, %Y')
+        creation_date = parse_date(creation_date,'%B %d, %Y')
         if self.is_out_of_date(creation_date):
             return
 
         # Extract the article's paragraphs
-        paragraphs = [node.xpath('string()').get().strip() for node in response.xpath('//article/p[not(child::em) and not(child::strong)]')]
+        paragraphs = fields.texts('paragraphs')
         paragraphs = remove_empty_paragraphs(paragraphs)
         text = ' '.join([para for para in paragraphs])
 
@@ -70,48 +84,30 @@ class ABCNewsSpider(BaseSpider):
         item['news_outlet'] = 'abc_news'
         item['provenance'] = response.url
         item['query_keywords'] = self.get_query_keywords()
+        item['topics'] = self.get_topics()
 
         # Get creation, modification, and crawling dates
-        item['creation_date'] = creation_date.strftime('%d.%m.%Y')
-        item['last_modified'] = creation_date.strftime('%d.%m.%Y')
-        item['crawl_date'] = datetime.now().strftime('%d.%m.%Y')
+        item['creation_date'] = format_date(creation_date)
+        item['last_modified'] = format_date(creation_date)
+        item['crawl_date'] = crawl_date()
 
         # Get authors
-        authors = response.xpath('//div[@class="iDmZj bGbFC xjUv wIScF ukJKQ zZhuN VfZP "]//span[not[contains(@text, "by")]]/text() | //div[@class="iDmZj bGbFC xjUv wIScF ukJKQ zZhuN VfZP "]//span/a/text()').getall()
-        if authors:
-            item['author_person'] = authors
-            item['author_organization'] = ["Associated Press"] if any("Associated Press" in x for x in authors) else list()
-        else:
-            item['author_person'] = list()
-            item['author_organization'] = list()
+        item['author_person'], item['author_organization'] = parse_authors(fields.getall('authors'))
        
         # Extract keywords, if available
-        news_keywords = response.xpath('//meta[@name="keywords"]/@content').get()
+        news_keywords = fields.get('news_keywords')
         item['news_keywords'] = news_keywords.split(', ') if news_keywords else list()
 
         # Get title, description, and body of article
-        title = response.xpath('//meta[@property="og:title"]/@content').get()
-        description = response.xpath('//meta[@property="og:description"]/@content').get().strip()
+        title = fields.get('title')
+        description = fields.get('description').strip()
 
          # Body as dictionary: key = headline (if available, otherwise empty string), values = list of corresponding paragraphs
         body = dict()
         
-        if response.xpath('//article/p/strong'):
-            # Extract headlines
-            headlines = [h.xpath('string()').get().strip() for h in response.xpath('//article/p/strong')]
-
-            # Extract paragraphs with headlines
-            text = [node.xpath('string()').get().strip() for node in response.xpath('//article/p[not(child::em) and not(child::strong)] | //article/p/strong')]
-
-            # Extract paragraphs between the abstract and the first headline
-            body[''] = remove_empty_paragraphs(text[:text.index(headlines[0])])
-
-            # Extract paragraphs corresponding to each headline, except the last one
-            for i in range(len(headlines)-1):
-                body[headlines[i]] = remove_empty_paragraphs(text[text.index(headlines[i])+1:text.index(headlines[i+1])])
-
-            # Extract the paragraphs belonging to the last headline
-            body[headlines[-1]] = remove_empty_paragraphs(text[text.index(headlines[-1])+1:])
+        if fields.exists('headlines'):
+            # Extract paragraphs grouped by their preceding headline
+            body = fields.sections('body', 'headlines')
 
         else:
             # The article has no headlines, just paragraphs
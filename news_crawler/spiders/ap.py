@@ -2,15 +2,14 @@
 
 import os
 import sys
-import json
 from news_crawler.spiders import BaseSpider
 from scrapy.spiders import Rule 
-from scrapy.linkextractors import LinkExtractor
-from datetime import datetime
+from news_crawler.linkextractors import CompiledLinkExtractor
 
 sys.path.insert(0, os.path.join(os.getcwd(), "..",))
 from news_crawler.items import NewsCrawlerItem
-from news_crawler.utils import remove_empty_paragraphs
+from news_crawler.utils import remove_empty_paragraphs, parse_date, format_date, crawl_date
+from news_crawler.bylines import parse_authors
 
 class APSpider(BaseSpider):
     """ Spider for AP """
@@ -22,7 +21,7 @@ class APSpider(BaseSpider):
     # Exclude irelevant pages
     rules = (
             Rule(
-                LinkExtractor(
+                CompiledLinkExtractor(
                     allow=(r'apnews\.com\/article\/\w.*$'),
                     deny=(
                         r'apnews\.com\/hub\/photography',
@@ -38,20 +37,41 @@ class APSpider(BaseSpider):
                 ),
             )
 
+    # XPaths of the article's fields
+    extraction_spec = {
+            'creation_date': '//meta[@property="article:published_time"]/@content',
+            'paragraphs': '//div[@class="Article"]/p',
+            'last_modified': '//meta[@property="article:modified_time"]/@content',
+            'news_keywords': '//meta[@name="keywords"]/@content',
+            'title': '//meta[@property="og:title"]/@content',
+            'description': '//meta[@name="description"]/@content'
+            }
+
+    # JSON-LD properties of the article's fields, preferred over their XPaths
+    structured_data_spec = {
+            'creation_date': 'datePublished',
+            'last_modified': 'dateModified',
+            'authors': 'author',
+            'title': 'headline',
+            'description': 'description'
+            }
+
     def parse_item(self, response):
         """
         Checks article validity. If valid, it parses it.
         """
+        fields = self.extract(response)
 
-        creation_date = response.xpath('//meta[@property="article:published_time"]/@content').get()
+        creation_date = fields.get('creation_date')
         if not creation_date:
+            self.reject('no_date')
             return
-        creation_date = datetime.fromisoformat(creation_date.split('T')[0])
+        creation_date = parse_date(creation_date)
         if self.is_out_of_date(creation_date):
             return
 
         # Extract the article's paragraphs
-        paragraphs = [node.xpath('string()').get().strip() for node in response.xpath('//div[@class="Article"]/p')]
+        paragraphs = fields.texts('paragraphs')
         paragraphs = remove_empty_paragraphs(paragraphs)
         paragraphs = paragraphs[:-1] # Remove advertisement in last line
         text = ' '.join([para for para in paragraphs])
@@ -70,33 +90,25 @@ class APSpider(BaseSpider):
         item['news_outlet'] = 'ap'
         item['provenance'] = response.url
         item['query_keywords'] = self.get_query_keywords()
+        item['topics'] = self.get_topics()
 
         # Get creation, modification, and crawling dates
-        item['creation_date'] = creation_date.strftime('%d.%m.%Y')
-        last_modified = response.xpath('//meta[@property="article:modified_time"]/@content').get()
-        last_modified = datetime.fromisoformat(last_modified.split('T')[0])
-        item['last_modified'] = last_modified.strftime('%d.%m.%Y')
-        item['crawl_date'] = datetime.now().strftime('%d.%m.%Y')
+        item['creation_date'] = format_date(creation_date)
+        last_modified = fields.get('last_modified')
+        last_modified = parse_date(last_modified)
+        item['last_modified'] = format_date(last_modified)
+        item['crawl_date'] = crawl_date()
 
         # Get authors
-        data_json = response.xpath('//script[@type="application/ld+json"]/text()').get()
-        if data_json:
-            data = json.loads(data_json)
-            authors = data['author'][0]
-            authors = authors.split(', ')
-            item['author_person'] = [author for author in authors if author!='The Associated Press']
-            item['author_organization'] = ['The Associated Press'] if 'The Associated Press' in authors else list()
-        else:
-            item['author_person'] = list()
-            item['author_organization'] = list()      
+        item['author_person'], item['author_organization'] = parse_authors(fields.getall('authors'))
         
         # Extract keywords, if available
-        news_keywords = response.xpath('//meta[@name="keywords"]/@content').get()
+        news_keywords = fields.get('news_keywords')
         item['news_keywords'] = news_keywords.split(',') if news_keywords else list()
 
         # Get title, description, and body of article
-        title = response.xpath('//meta[@property="og:title"]/@content').get().strip()
-        description = response.xpath('//meta[@name="description"]/@content').get().strip()
+        title = fields.get('title').strip()
+        description = fields.get('description').strip()
 
          # Body as dictionary: key = headline (if available, otherwise empty string), values = list of corresponding paragraphs
         body = dict()
@@ -4,12 +4,12 @@ import os
 import sys
 from news_crawler.spiders import BaseSpider
 from scrapy.spiders import Rule 
-from scrapy.linkextractors import LinkExtractor
-from datetime import datetime
+from news_crawler.linkextractors import CompiledLinkExtractor
 
 sys.path.insert(0, os.path.join(os.getcwd(), "..",))
 from news_crawler.items import NewsCrawlerItem
-from news_crawler.utils import remove_empty_paragraphs
+from news_crawler.utils import remove_empty_paragraphs, parse_date, format_date, crawl_date
+from news_crawler.bylines import parse_authors
 
 class AxiosSpider(BaseSpider):
     """ Spider for Axios """
@@ -21,7 +21,7 @@ class AxiosSpider(BaseSpider):
     # Exclude irelevant pages
     rules = (
             Rule(
-                LinkExtractor(
+                CompiledLinkExtractor(
                     allow=(r'www\.axios\.com\/\d+\/\d+\/\d+\/\w.*$'),
                     deny=(
                         r'www\.axios\.com\/pro\/\w.*',
@@ -44,20 +44,34 @@ class AxiosSpider(BaseSpider):
                 ),
             )
 
+    # XPaths of the article's fields
+    extraction_spec = {
+            'creation_date': '//meta[@property="article:published_time"]/@content',
+            'paragraphs': '//p | //ul/li[not(descendant::span)]',
+            'last_modified': '//meta[@property="article:modified_time"]/@content',
+            'authors': '//meta[@name="author"]/@content',
+            'news_keywords': '//meta[@name="keywords"]/@content',
+            'title': '//meta[@property="og:title"]/@content',
+            'description': '//meta[@name="description"]/@content',
+            'recommendations': '//a[@class="gtmContentClick"]/@data-vars-click-url'
+            }
+
     def parse_item(self, response):
         """
         Checks article validity. If valid, it parses it.
         """
+        fields = self.extract(response)
 
-        creation_date = response.xpath('//meta[@property="article:published_time"]/@content').get()
+        creation_date = fields.get('creation_date')
         if not creation_date:
+            self.reject('no_date')
             return
-        creation_date = datetime.fromisoformat(creation_date.split('T')[0])
+        creation_date = parse_date(creation_date)
         if self.is_out_of_date(creation_date):
             return
 
         # Extract the article's paragraphs
-        paragraphs = [node.xpath('string()').get().strip() for node in response.xpath('//p | //ul/li[not(descendant::span)]')]
+        paragraphs = fields.texts('paragraphs')
         paragraphs = remove_empty_paragraphs(paragraphs)
         text = ' '.join([para for para in paragraphs])
 
@@ -75,31 +89,25 @@ class AxiosSpider(BaseSpider):
         item['news_outlet'] = 'axios'
         item['provenance'] = response.url
         item['query_keywords'] = self.get_query_keywords()
+        item['topics'] = self.get_topics()
 
         # Get creation, modification, and crawling dates
-        item['creation_date'] = creation_date.strftime('%d.%m.%Y')
-        last_modified = response.xpath('//meta[@property="article:modified_time"]/@content').get()
-        last_modified = datetime.fromisoformat(last_modified.split('T')[0])
-        item['last_modified'] = last_modified.strftime('%d.%m.%Y')
-        item['crawl_date'] = datetime.now().strftime('%d.%m.%Y')
+        item['creation_date'] = format_date(creation_date)
+        last_modified = fields.get('last_modified')
+        last_modified = parse_date(last_modified)
+        item['last_modified'] = format_date(last_modified)
+        item['crawl_date'] = crawl_date()
 
         # Get authors
-        authors = response.xpath('//meta[@name="author"]/@content').get()
-        if authors:
-            authors = authors.split(',')
-            item['author_person'] = [author for author in authors if author != 'Axios']  
-            item['author_organization'] = ['Axios'] if 'Axios' in authors else list()
-        else:
-            item['author_person'] = list()
-            item['author_organization'] = list()
+        item['author_person'], item['author_organization'] = parse_authors(fields.get('authors'))
        
         # Extract keywords, if available
-        news_keywords = response.xpath('//meta[@name="keywords"]/@content').get()
+        news_keywords = fields.get('news_keywords')
         item['news_keywords'] = news_keywords.split(',') if news_keywords else list()
 
         # Get title, description, and body of article
-        title = response.xpath('//meta[@property="og:title"]/@content').get().strip()
-        description = response.xpath('//meta[@name="description"]/@content').get().strip()
+        title = fields.get('title').strip()
+        description = fields.get('description').strip()
 
          # Body as dictionary: key = headline (if available, otherwise empty string), values = list of corresponding paragraphs
         body = dict()
@@ -110,7 +118,7 @@ class AxiosSpider(BaseSpider):
         item['content'] = {'title': title, 'description': description, 'body':body}
 
         # There are no recommendations to other related articles
-        recommendations = response.xpath('//a[@class="gtmContentClick"]/@data-vars-click-url').getall()
+        recommendations = fields.getall('recommendations')
         item['recommendations'] = list(set([rec for rec in recommendations if 'www.axios.com' in rec]))[:5] if recommendations else list()
 
         item['response_body'] = response.body
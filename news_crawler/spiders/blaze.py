@@ -4,12 +4,12 @@ import os
 import sys
 from news_crawler.spiders import BaseSpider
 from scrapy.spiders import Rule 
-from scrapy.linkextractors import LinkExtractor
-from datetime import datetime
+from news_crawler.linkextractors import CompiledLinkExtractor
 
 sys.path.insert(0, os.path.join(os.getcwd(), "..",))
 from news_crawler.items import NewsCrawlerItem
-from news_crawler.utils import remove_empty_paragraphs
+from news_crawler.utils import remove_empty_paragraphs, parse_date, format_date, crawl_date
+from news_crawler.bylines import parse_authors
 
 class BlazeSpider(BaseSpider):
     """ Spider for The Blaze """
@@ -21,7 +21,7 @@ class BlazeSpider(BaseSpider):
     # Exclude irelevant pages
     rules = (
             Rule(
-                LinkExtractor(
+                CompiledLinkExtractor(
                     allow=(r'www\.theblaze\.com\/\w.*\/\w.*$'),
                     deny=(
                         r'www\.theblaze\.com\/newsletters\/',
@@ -40,20 +40,35 @@ class BlazeSpider(BaseSpider):
                 ),
             )
 
+    # XPaths of the article's fields
+    extraction_spec = {
+            'creation_date': '//meta[@property="article:published_time"]/@content',
+            'paragraphs': '//div[@class="body-description"]/p',
+            'last_modified': '//meta[@property="article:modified_time"]/@content',
+            'authors': '//div[@class="post-author"]/a[@class="post-author__name"]/text()',
+            'news_keywords': '//meta[@name="keywords"]/@content',
+            'title': '//meta[@property="og:title"]/@content',
+            'description': '//meta[@name="description"]/@content',
+            'headlines': '//h3',
+            'body': '//div[@class="body-description"]/p | //h3'
+            }
+
     def parse_item(self, response):
         """
         Checks article validity. If valid, it parses it.
         """
+        fields = self.extract(response)
 
-        creation_date = response.xpath('//meta[@property="article:published_time"]/@content').get()
+        creation_date = fields.get('creation_date')
         if not creation_date:
+            self.reject('no_date')
             return
-        creation_date = datetime.fromisoformat(creation_date.split('T')[0])
+        creation_date = parse_date(creation_date)
         if self.is_out_of_date(creation_date):
             return
 
         # Extract the article's paragraphs
-        paragraphs = [node.xpath('string()').get().strip() for node in response.xpath('//div[@class="body-description"]/p')]
+        paragraphs = fields.texts('paragraphs')
         paragraphs = remove_empty_paragraphs(paragraphs)
         text = ' '.join([para for para in paragraphs])
 
@@ -71,46 +86,32 @@ class BlazeSpider(BaseSpider):
         item['news_outlet'] = 'blaze'
         item['provenance'] = response.url
         item['query_keywords'] = self.get_query_keywords()
+        item['topics'] = self.get_topics()
 
         # Get creation, modification, and crawling dates
-        item['creation_date'] = creation_date.strftime('%d.%m.%Y')
-        last_modified = response.xpath('//meta[@property="article:modified_time"]/@content').get()
-        last_modified = datetime.fromisoformat(last_modified.split('T')[0])
-        item['last_modified'] = last_modified.strftime('%d.%m.%Y')
-        item['crawl_date'] = datetime.now().strftime('%d.%m.%Y')
+        item['creation_date'] = format_date(creation_date)
+        last_modified = fields.get('last_modified')
+        last_modified = parse_date(last_modified)
+        item['last_modified'] = format_date(last_modified)
+        item['crawl_date'] = crawl_date()
 
         # Get authors
-        authors = response.xpath('//div[@class="post-author"]/a[@class="post-author__name"]/text()').getall()
-        item['author_person'] = authors if authors else list()
-        item['author_organization'] = list()
+        item['author_person'], item['author_organization'] = parse_authors(fields.getall('authors'))
        
         # Extract keywords, if available
-        news_keywords = response.xpath('//meta[@name="keywords"]/@content').get()
+        news_keywords = fields.get('news_keywords')
         item['news_keywords'] = news_keywords.split(', ') if news_keywords else list()
 
         # Get title, description, and body of article
-        title = response.xpath('//meta[@property="og:title"]/@content').get().strip()
-        description = response.xpath('//meta[@name="description"]/@content').get().strip()
+        title = fields.get('title').strip()
+        description = fields.get('description').strip()
 
          # Body as dictionary: key = headline (if available, otherwise empty string), values = list of corresponding paragraphs
         body = dict()
         
-        if response.xpath('//h3'):
-            # Extract headlines
-            headlines = [h3.xpath('string()').get().strip() for h3 in response.xpath('//h3')]
-
-            # Extract paragraphs with headlines
-            text = [node.xpath('string()').get().strip() for node in response.xpath('//div[@class="body-description"]/p | //h3')]
-
-            # Extract paragraphs between the abstract and the first headline
-            body[''] = remove_empty_paragraphs(text[:text.index(headlines[0])])
-
-            # Extract paragraphs corresponding to each headline, except the last one
-            for i in range(len(headlines)-1):
-                body[headlines[i]] = remove_empty_paragraphs(text[text.index(headlines[i])+1:text.index(headlines[i+1])])
-
-            # Extract the paragraphs belonging to the last headline
-            body[headlines[-1]] = remove_empty_paragraphs(text[text.index(headlines[-1])+1:])
+        if fields.exists('headlines'):
+            # Extract paragraphs grouped by their preceding headline
+            body = fields.sections('body', 'headlines')
 
         else:
             # The article has no headlines, just paragraphs
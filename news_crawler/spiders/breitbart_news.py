@@ -4,12 +4,12 @@ import os
 import sys
 from news_crawler.spiders import BaseSpider
 from scrapy.spiders import Rule 
-from scrapy.linkextractors import LinkExtractor
-from datetime import datetime
+from news_crawler.linkextractors import CompiledLinkExtractor
 
 sys.path.insert(0, os.path.join(os.getcwd(), "..",))
 from news_crawler.items import NewsCrawlerItem
-from news_crawler.utils import remove_empty_paragraphs
+from news_crawler.utils import remove_empty_paragraphs, parse_date, format_date, crawl_date
+from news_crawler.bylines import parse_authors
 
 class BreaitbartNewsSpider(BaseSpider):
     """ Spider for Breaitbart News` """
@@ -21,7 +21,7 @@ class BreaitbartNewsSpider(BaseSpider):
     # Exclude irelevant pages
     rules = (
             Rule(
-                LinkExtractor(
+                CompiledLinkExtractor(
                     allow=(r'www\.breitbart\.com\/\w.*\/\d+\/\d+\/\d+\/\w.*$'),
                     deny=(
                         r'www\.breitbart\.com\/masthead\/',
@@ -45,20 +45,33 @@ class BreaitbartNewsSpider(BaseSpider):
                 ),
             )
 
+    # XPaths of the article's fields
+    extraction_spec = {
+            'creation_date': '//meta[@name="pubdate"]/@content',
+            'paragraphs': '//div[@class="entry-content"]/p',
+            'last_modified': '//meta[@name="lastmod"]/@content',
+            'authors': '//meta[@name="author"]/@content',
+            'news_keywords': '//meta[@property="article:tag"]/@content',
+            'title': '//meta[@property="og:title"]/@content',
+            'description': '//meta[@name="description"]/@content'
+            }
+
     def parse_item(self, response):
         """
         Checks article validity. If valid, it parses it.
         """
+        fields = self.extract(response)
 
-        creation_date = response.xpath('//meta[@name="pubdate"]/@content').get()
+        creation_date = fields.get('creation_date')
         if not creation_date:
+            self.reject('no_date')
             return
-        creation_date = datetime.fromisoformat(creation_date.split('T')[0])
+        creation_date = parse_date(creation_date)
         if self.is_out_of_date(creation_date):
             return
 
         # Extract the article's paragraphs
-        paragraphs = [node.xpath('string()').get().strip() for node in response.xpath('//div[@class="entry-content"]/p')]
+        paragraphs = fields.texts('paragraphs')
         paragraphs = remove_empty_paragraphs(paragraphs)
         text = ' '.join([para for para in paragraphs])
 
@@ -76,31 +89,25 @@ class BreaitbartNewsSpider(BaseSpider):
         item['news_outlet'] = 'breitbart_news'
         item['provenance'] = response.url
         item['query_keywords'] = self.get_query_keywords()
+        item['topics'] = self.get_topics()
 
         # Get creation, modification, and crawling dates
-        item['creation_date'] = creation_date.strftime('%d.%m.%Y')
-        last_modified = response.xpath('//meta[@name="lastmod"]/@content').get()
-        last_modified = datetime.fromisoformat(last_modified.split('T')[0])
-        item['last_modified'] = last_modified.strftime('%d.%m.%Y')
-        item['crawl_date'] = datetime.now().strftime('%d.%m.%Y')
+        item['creation_date'] = format_date(creation_date)
+        last_modified = fields.get('last_modified')
+        last_modified = parse_date(last_modified)
+        item['last_modified'] = format_date(last_modified)
+        item['crawl_date'] = crawl_date()
 
         # Get authors
-        authors = response.xpath('//meta[@name="author"]/@content').get()
-        if authors:
-            authors = authors.split(' and ')
-            item['author_person'] = [author for author in authors if author != 'AP'] 
-            item['author_organization'] = ['AP'] if 'AP' in authors else list()
-        else:
-            item['author_person'] = list()
-            item['author_organization'] = list()
+        item['author_person'], item['author_organization'] = parse_authors(fields.get('authors'))
        
         # Extract keywords, if available
-        news_keywords = response.xpath('//meta[@property="article:tag"]/@content').getall()
+        news_keywords = fields.getall('news_keywords')
         item['news_keywords'] = news_keywords if news_keywords else list()
 
         # Get title, description, and body of article
-        title = response.xpath('//meta[@property="og:title"]/@content').get().strip()
-        description = response.xpath('//meta[@name="description"]/@content').get().strip()
+        title = fields.get('title').strip()
+        description = fields.get('description').strip()
 
          # Body as dictionary: key = headline (if available, otherwise empty string), values = list of corresponding paragraphs
         body = dict()
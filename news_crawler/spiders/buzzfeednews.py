@@ -4,12 +4,12 @@ import os
 import sys
 from news_crawler.spiders import BaseSpider
 from scrapy.spiders import Rule 
-from scrapy.linkextractors import LinkExtractor
-from datetime import datetime
+from news_crawler.linkextractors import CompiledLinkExtractor
 
 sys.path.insert(0, os.path.join(os.getcwd(), "..",))
 from news_crawler.items import NewsCrawlerItem
-from news_crawler.utils import remove_empty_paragraphs
+from news_crawler.utils import remove_empty_paragraphs, parse_date, format_date, crawl_date
+from news_crawler.bylines import parse_authors
 
 class BuzzfeednewsSpider(BaseSpider):
     """ Spider for BuzzfeednewsSpider """
@@ -21,7 +21,7 @@ class BuzzfeednewsSpider(BaseSpider):
     # Exclude irelevant pages
     rules = (
             Rule(
-                LinkExtractor(
+                CompiledLinkExtractor(
                     allow=(r'www\.buzzfeednews\.com\/article\/\w.*$'),
                     deny=(
                         r'www\.buzzfeednews\.com\/article\/buzzfeednews\/about-buzzfeed-news',
@@ -34,26 +34,43 @@ class BuzzfeednewsSpider(BaseSpider):
                 ),
             )
 
+    # XPaths of the article's fields
+    extraction_spec = {
+            'creation_date': '//span[contains(@class, "headline-timestamp_timestampNews")]/time/@datetime',
+            'creation_date_fallback': '//div/p[@class="news-article-header__timestamps-posted"]/text()',
+            'paragraphs': '//p[not(ancestor::div[contains(@class, "subbuzz__description")]) and not(@class) and not(ancestor::span[@class="FF__grid-cred"])] | //ul/li/p',
+            'authors': '//meta[@property="author"]/@content',
+            'authors_fallback': '//div[contains(@class, "news-article-header")]/p/a/text()',
+            'news_keywords': '//ul[preceding-sibling::h2[contains(@class, "topic-tags_heading")]]/li/a/text()',
+            'title': '//meta[@property="og:title"]/@content',
+            'description': '//meta[@name="description"]/@content',
+            'headlines': '//h2/span[@class="js-subbuzz__title-text"]',
+            'body': '//p[not(ancestor::div[contains(@class, "subbuzz__description")]) and not(@class) and not(ancestor::span[@class="FF__grid-cred"])] | //ul/li/p | //h2/span[@class="js-subbuzz__title-text"]',
+            'recommendations': '//li[@class="bfp-related-links__list-item"]/div/a/@href'
+            }
+
     def parse_item(self, response):
         """
         Checks article validity. If valid, it parses it.
         """
+        fields = self.extract(response)
 
-        creation_date = response.xpath('//span[contains(@class, "headline-timestamp_timestampNews")]/time/@datetime').get()
+        creation_date = fields.get('creation_date')
         if not creation_date:
-            creation_date = response.xpath('//div/p[@class="news-article-header__timestamps-posted"]/text()').get()
+            creation_date = fields.get('creation_date_fallback')
             if not creation_date:
+                self.reject('no_date')
                 return
             else:
                 creation_date = creation_date.strip().split('Posted on ')[1].split(', at')[0]
-                creation_date = datetime.strptime(creation_date, '%B %d, %Y')
+                creation_date = parse_date(creation_date, '%B %d, %Y')
         else:
-            creation_date = datetime.fromisoformat(creation_date.split('T')[0])
+            creation_date = parse_date(creation_date)
         if self.is_out_of_date(creation_date):
             return
 
         # Extract the article's paragraphs
-        paragraphs = [node.xpath('string()').get().strip() for node in response.xpath('//p[not(ancestor::div[contains(@class, "subbuzz__description")]) and not(@class) and not(ancestor::span[@class="FF__grid-cred"])] | //ul/li/p')]
+        paragraphs = fields.texts('paragraphs')
         paragraphs = remove_empty_paragraphs(paragraphs)
         text = ' '.join([para for para in paragraphs])
 
@@ -71,48 +88,30 @@ class BuzzfeednewsSpider(BaseSpider):
         item['news_outlet'] = 'buzzfeednews'
         item['provenance'] = response.url
         item['query_keywords'] = self.get_query_keywords()
+        item['topics'] = self.get_topics()
 
         # Get creation, modification, and crawling dates
-        item['creation_date'] = creation_date.strftime('%d.%m.%Y')
-        item['last_modified'] = creation_date.strftime('%d.%m.%Y')
-        item['crawl_date'] = datetime.now().strftime('%d.%m.%Y')
+        item['creation_date'] = format_date(creation_date)
+        item['last_modified'] = format_date(creation_date)
+        item['crawl_date'] = crawl_date()
 
         # Get authors
-        authors = response.xpath('//meta[@property="author"]/@content').get()
-        if authors:
-            item['author_person'] = authors.split(', ')
-        else:
-            authors = response.xpath('//div[contains(@class, "news-article-header")]/p/a/text()').getall()
-            item['author_person'] = authors if authors else list()
-        item['author_organization'] = list()
+        item['author_person'], item['author_organization'] = parse_authors(fields.get('authors') or fields.getall('authors_fallback'))
        
         # Extract keywords, if available
-        news_keywords = response.xpath('//ul[preceding-sibling::h2[contains(@class, "topic-tags_heading")]]/li/a/text()').getall()
+        news_keywords = fields.getall('news_keywords')
         item['news_keywords'] = news_keywords if news_keywords else list()
 
         # Get title, description, and body of article
-        title = response.xpath('//meta[@property="og:title"]/@content').get().strip()
-        description = response.xpath('//meta[@name="description"]/@content').get().strip()
+        title = fields.get('title').strip()
+        description = fields.get('description').strip()
 
          # Body as dictionary: key = headline (if available, otherwise empty string), values = list of corresponding paragraphs
         body = dict()
         
-        if response.xpath('//h2/span[@class="js-subbuzz__title-text"]'):
-            # Extract headlines
-            headlines = [h.xpath('string()').get().strip() for h in response.xpath('//h2/span[@class="js-subbuzz__title-text"]')]
-
-            # Extract paragraphs with headlines
-            text = [node.xpath('string()').get().strip() for node in response.xpath('//p[not(ancestor::div[contains(@class, "subbuzz__description")]) and not(@class) and not(ancestor::span[@class="FF__grid-cred"])] | //ul/li/p | //h2/span[@class="js-subbuzz__title-text"]')]
-
-            # Extract paragraphs between the abstract and the first headline
-            body[''] = remove_empty_paragraphs(text[:text.index(headlines[0])])
-
-            # Extract paragraphs corresponding to each headline, except the last one
-            for i in range(len(headlines)-1):
-                body[headlines[i]] = remove_empty_paragraphs(text[text.index(headlines[i])+1:text.index(headlines[i+1])])
-
-            # Extract the paragraphs belonging to the last headline
-            body[headlines[-1]] = remove_empty_paragraphs(text[text.index(headlines[-1])+1:])
+        if fields.exists('headlines'):
+            # Extract paragraphs grouped by their preceding headline
+            body = fields.sections('body', 'headlines')
 
         else:
             # The article has no headlines, just paragraphs
@@ -121,7 +120,7 @@ class BuzzfeednewsSpider(BaseSpider):
         item['content'] = {'title': title, 'description': description, 'body':body}
 
         # Top 5 recommendations to other related news articles from the same outlet
-        recommendations = response.xpath('//li[@class="bfp-related-links__list-item"]/div/a/@href').getall()
+        recommendations = fields.getall('recommendations')
         if recommendations:
             item['recommendations'] = list(set(recommendations))[:5]
         else:
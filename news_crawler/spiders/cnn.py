@@ -4,12 +4,12 @@ import os
 import sys
 from news_crawler.spiders import BaseSpider
 from scrapy.spiders import Rule 
-from scrapy.linkextractors import LinkExtractor
-from datetime import datetime
+from news_crawler.linkextractors import CompiledLinkExtractor
 
 sys.path.insert(0, os.path.join(os.getcwd(), "..",))
 from news_crawler.items import NewsCrawlerItem
-from news_crawler.utils import remove_empty_paragraphs
+from news_crawler.utils import remove_empty_paragraphs, parse_date, format_date, crawl_date
+from news_crawler.bylines import parse_authors
 
 class CNNSpider(BaseSpider):
     """ Spider for CNN """
@@ -21,7 +21,7 @@ class CNNSpider(BaseSpider):
     # Exclude irelevant pages
     rules = (
             Rule(
-                LinkExtractor(
+                CompiledLinkExtractor(
                     allow=(r'edition\.cnn\.com\/\w.*$'),
                     deny=(
                         r'edition\.cnn\.com\/sitemap\.html',
@@ -44,20 +44,35 @@ class CNNSpider(BaseSpider):
                 ),
             )
 
+    # XPaths of the article's fields
+    extraction_spec = {
+            'creation_date': '//meta[@property="og:pubdate"]/@content',
+            'paragraphs': '//div[@class="zn-body__paragraph" and not(descendant::h3)]',
+            'last_modified': '//meta[@name="lastmod"]/@content',
+            'authors': '//meta[@name="author"]/@content',
+            'news_keywords': '//meta[@name="keywords"]/@content',
+            'title': '//meta[@property="og:title"]/@content',
+            'description': '//meta[@name="description"]/@content',
+            'headlines': '//div[@class="zn-body__paragraph"]/h3',
+            'body': '//div[@class="zn-body__paragraph" and not(descendant::h3)] | //div[@class="zn-body__paragraph"]/h3'
+            }
+
     def parse_item(self, response):
         """
         Checks article validity. If valid, it parses it.
         """
+        fields = self.extract(response)
 
-        creation_date = response.xpath('//meta[@property="og:pubdate"]/@content').get()
+        creation_date = fields.get('creation_date')
         if not creation_date:
+            self.reject('no_date')
             return
-        creation_date = datetime.fromisoformat(creation_date.split('T')[0])
+        creation_date = parse_date(creation_date)
         if self.is_out_of_date(creation_date):
             return
 
         # Extract the article's paragraphs
-        paragraphs = [node.xpath('string()').get().strip() for node in response.xpath('//div[@class="zn-body__paragraph" and not(descendant::h3)]')]
+        paragraphs = fields.texts('paragraphs')
         paragraphs = remove_empty_paragraphs(paragraphs)
         text = ' '.join([para for para in paragraphs])
 
@@ -75,59 +90,33 @@ class CNNSpider(BaseSpider):
         item['news_outlet'] = 'cnn'
         item['provenance'] = response.url
         item['query_keywords'] = self.get_query_keywords()
+        item['topics'] = self.get_topics()
 
         # Get creation, modification, and crawling dates
-        item['creation_date'] = creation_date.strftime('%d.%m.%Y')
-        last_modified = response.xpath('//meta[@name="lastmod"]/@content').get()
-        last_modified = datetime.fromisoformat(last_modified.split('T')[0])
-        item['last_modified'] = last_modified.strftime('%d.%m.%Y')
-        item['crawl_date'] = datetime.now().strftime('%d.%m.%Y')
+        item['creation_date'] = format_date(creation_date)
+        last_modified = fields.get('last_modified')
+        last_modified = parse_date(last_modified)
+        item['last_modified'] = format_date(last_modified)
+        item['crawl_date'] = crawl_date()
 
         # Get authors
-        authors = response.xpath('//meta[@name="author"]/@content').get()
-        if authors:
-            authors = authors.split(', CNN')[0]
-            authors = authors.split('Written by ')[-1].split(';')[0] if 'Written by ' in authors else authors
-            authors = authors.split('Opinion by ')[-1] if 'Opinion by ' in authors else authors
-            if ' and ' in authors:
-                other_authors, last_author = authors.split(' and ')
-                other_authors = other_authors.split(', ')
-                authors = other_authors + [last_author]
-            else:
-                authors = authors.split(', ')
-            item['author_person'] = authors 
-            item['author_organization'] = list()
-        else:
-            item['author_person'] = list()
-            item['author_organization'] = list()
+        authors = fields.get('authors')
+        item['author_person'], item['author_organization'] = parse_authors(authors.split(', CNN')[0] if authors else None)
        
         # Extract keywords, if available
-        news_keywords = response.xpath('//meta[@name="keywords"]/@content').get()
+        news_keywords = fields.get('news_keywords')
         item['news_keywords'] = news_keywords.split(' - CNN')[0].split(', ', 1) if news_keywords else list()
 
         # Get title, description, and body of article
-        title = response.xpath('//meta[@property="og:title"]/@content').get().strip()
-        description = response.xpath('//meta[@name="description"]/@content').get().strip()
+        title = fields.get('title').strip()
+        description = fields.get('description').strip()
 
          # Body as dictionary: key = headline (if available, otherwise empty string), values = list of corresponding paragraphs
         body = dict()
         
-        if response.xpath('//div[@class="zn-body__paragraph"]/h3'):
-            # Extract headlines
-            headlines = [h3.xpath('string()').get().strip() for h3 in response.xpath('//div[@class="zn-body__paragraph"]/h3')]
-
-            # Extract paragraphs with headlines
-            text = [node.xpath('string()').get().strip() for node in response.xpath('//div[@class="zn-body__paragraph" and not(descendant::h3)] | //div[@class="zn-body__paragraph"]/h3')]
-
-            # Extract paragraphs between the abstract and the first headline
-            body[''] = remove_empty_paragraphs(text[:text.index(headlines[0])])
-
-            # Extract paragraphs corresponding to each headline, except the last one
-            for i in range(len(headlines)-1):
-                body[headlines[i]] = remove_empty_paragraphs(text[text.index(headlines[i])+1:text.index(headlines[i+1])])
-
-            # Extract the paragraphs belonging to the last headline
-            body[headlines[-1]] = remove_empty_paragraphs(text[text.index(headlines[-1])+1:])
+        if fields.exists('headlines'):
+            # Extract paragraphs grouped by their preceding headline
+            body = fields.sections('body', 'headlines')
 
         else:
             # The article has no headlines, just paragraphs
@@ -4,12 +4,12 @@ import os
 import sys
 from news_crawler.spiders import BaseSpider
 from scrapy.spiders import Rule 
-from scrapy.linkextractors import LinkExtractor
-from datetime import datetime
+from news_crawler.linkextractors import CompiledLinkExtractor
 
 sys.path.insert(0, os.path.join(os.getcwd(), "..",))
 from news_crawler.items import NewsCrawlerItem
-from news_crawler.utils import remove_empty_paragraphs
+from news_crawler.utils import remove_empty_paragraphs, parse_date, format_date, crawl_date
+from news_crawler.bylines import parse_authors
 
 class CommonDreamsSpider(BaseSpider):
     """ Spider for Common Dreams News Center """
@@ -21,7 +21,7 @@ class CommonDreamsSpider(BaseSpider):
     # Exclude irelevant pages
     rules = (
             Rule(
-                LinkExtractor(
+                CompiledLinkExtractor(
                     allow=(r'www\.commondreams\.org\/\w.*$'),
                     deny=(
                         r'www\.commondreams\.org\/about-us',
@@ -42,20 +42,31 @@ class CommonDreamsSpider(BaseSpider):
                 ),
             )
 
+    # XPaths of the article's fields
+    extraction_spec = {
+            'creation_date': '//meta[@property="article:modified_time"]/@content',
+            'paragraphs': '//div[contains(@class, "node__body") or contains(@class, "newswire__body")]/p[not(@class="pullquote")] | //blockquote/p | //ul/li/p',
+            'authors': '//span[@typeof="schema:Person" and @property="schema:name"]/a/text()',
+            'title': '//meta[@property="og:title"]/@content',
+            'description': '//meta[@name="description"]/@content'
+            }
+
     def parse_item(self, response):
         """
         Checks article validity. If valid, it parses it.
         """
+        fields = self.extract(response)
 
-        creation_date = response.xpath('//meta[@property="article:modified_time"]/@content').get()
+        creation_date = fields.get('creation_date')
         if not creation_date:
+            self.reject('no_date')
             return
-        creation_date = datetime.fromisoformat(creation_date.split('T')[0])
+        creation_date = parse_date(creation_date)
         if self.is_out_of_date(creation_date):
             return
 
         # Extract the article's paragraphs
-        paragraphs = [node.xpath('string()').get().strip() for node in response.xpath('//div[contains(@class, "node__body") or contains(@class, "newswire__body")]/p[not(@class="pullquote")] | //blockquote/p | //ul/li/p')]
+        paragraphs = fields.texts('paragraphs')
         paragraphs = remove_empty_paragraphs(paragraphs)
         text = ' '.join([para for para in paragraphs])
 
@@ -73,25 +84,24 @@ class CommonDreamsSpider(BaseSpider):
         item['news_outlet'] = 'common_dreams'
         item['provenance'] = response.url
         item['query_keywords'] = self.get_query_keywords()
+        item['topics'] = self.get_topics()
 
         # Get creation, modification, and crawling dates
-        item['creation_date'] = creation_date.strftime('%d.%m.%Y')
-        last_modified = response.xpath('//meta[@property="article:modified_time"]/@content').get()
-        last_modified = datetime.fromisoformat(last_modified.split('T')[0])
-        item['last_modified'] = last_modified.strftime('%d.%m.%Y')
-        item['crawl_date'] = datetime.now().strftime('%d.%m.%Y')
+        item['creation_date'] = format_date(creation_date)
+        last_modified = fields.get('creation_date')
+        last_modified = parse_date(last_modified)
+        item['last_modified'] = format_date(last_modified)
+        item['crawl_date'] = crawl_date()
 
         # Get authors
-        authors = response.xpath('//span[@typeof="schema:Person" and @property="schema:name"]/a/text()').getall()
-        item['author_person'] = [author for author in authors if author != 'Common Dreams staff'] if authors else list()
-        item['author_organization'] = ['Common Dreams staff'] if authors and 'Common Dreams staff' in authors else list()
+        item['author_person'], item['author_organization'] = parse_authors(fields.getall('authors'))
        
         # Extract keywords, if available
         item['news_keywords'] = list()
 
         # Get title, description, and body of article
-        title = response.xpath('//meta[@property="og:title"]/@content').get().strip()
-        description = response.xpath('//meta[@name="description"]/@content').get().strip()
+        title = fields.get('title').strip()
+        description = fields.get('description').strip()
 
          # Body as dictionary: key = headline (if available, otherwise empty string), values = list of corresponding paragraphs
         body = dict()
@@ -4,12 +4,11 @@ import os
 import sys
 from news_crawler.spiders import BaseSpider
 from scrapy.spiders import Rule 
-from scrapy.linkextractors import LinkExtractor
-from datetime import datetime
+from news_crawler.linkextractors import CompiledLinkExtractor
 
 sys.path.insert(0, os.path.join(os.getcwd(), "..",))
 from news_crawler.items import NewsCrawlerItem
-from news_crawler.utils import remove_empty_paragraphs
+from news_crawler.utils import remove_empty_paragraphs, parse_date, format_date, crawl_date
 
 class ConsortiumNewsSpider(BaseSpider):
     """ Spider for Consortium News """
@@ -21,7 +20,7 @@ class ConsortiumNewsSpider(BaseSpider):
     # Exclude irelevant pages
     rules = (
             Rule(
-                LinkExtractor(
+                CompiledLinkExtractor(
                     allow=(r'consortiumnews\.com\/\d+\/\d+\/\d+\/\w.*$'),
                     deny=(
                         r'consortiumnews\.com\/about\/',
@@ -38,20 +37,32 @@ class ConsortiumNewsSpider(BaseSpider):
                 ),
             )
 
+    # XPaths of the article's fields
+    extraction_spec = {
+            'creation_date': '//meta[@property="article:published_time"]/@content',
+            'paragraphs': '//p/span[contains(@style, "font-family: georgia, palatino, serif; font-size: 14pt;")]',
+            'last_modified': '//meta[@property="article:modified_time"]/@content',
+            'news_keywords': '//p[@class="tags"]/a[@rel="tag"]/text()',
+            'title': '//meta[@property="og:title"]/@content',
+            'description': '//meta[@property="og:description"]/@content'
+            }
+
     def parse_item(self, response):
         """
         Checks article validity. If valid, it parses it.
         """
+        fields = self.extract(response)
 
-        creation_date = response.xpath('//meta[@property="article:published_time"]/@content').get()
+        creation_date = fields.get('creation_date')
         if not creation_date:
+            self.reject('no_date')
             return
-        creation_date = datetime.fromisoformat(creation_date.split('T')[0])
+        creation_date = parse_date(creation_date)
         if self.is_out_of_date(creation_date):
             return
 
         # Extract the article's paragraphs
-        paragraphs = [node.xpath('string()').get().strip() for node in response.xpath('//p/span[contains(@style, "font-family: georgia, palatino, serif; font-size: 14pt;")]')]
+        paragraphs = fields.texts('paragraphs')
         paragraphs = remove_empty_paragraphs(paragraphs)
         text = ' '.join([para for para in paragraphs])
 
@@ -69,25 +80,26 @@ class ConsortiumNewsSpider(BaseSpider):
         item['news_outlet'] = 'consortium_news'
         item['provenance'] = response.url
         item['query_keywords'] = self.get_query_keywords()
+        item['topics'] = self.get_topics()
 
         # Get creation, modification, and crawling dates
-        item['creation_date'] = creation_date.strftime('%d.%m.%Y')
-        last_modified = response.xpath('//meta[@property="article:modified_time"]/@content').get()
-        last_modified = datetime.fromisoformat(last_modified.split('T')[0])
-        item['last_modified'] = last_modified.strftime('%d.%m.%Y')
-        item['crawl_date'] = datetime.now().strftime('%d.%m.%Y')
+        item['creation_date'] = format_date(creation_date)
+        last_modified = fields.get('last_modified')
+        last_modified = parse_date(last_modified)
+        item['last_modified'] = format_date(last_modified)
+        item['crawl_date'] = crawl_date()
 
         # Get authors
         item['author_person'] = list()
         item['author_organization'] = list()
        
         # Extract keywords, if available
-        news_keywords = response.xpath('//p[@class="tags"]/a[@rel="tag"]/text()').getall()
+        news_keywords = fields.getall('news_keywords')
         item['news_keywords'] = news_keywords if news_keywords else list()
 
         # Get title, description, and body of article
-        title = response.xpath('//meta[@property="og:title"]/@content').get().strip()
-        description = response.xpath('//meta[@property="og:description"]/@content').get().strip()
+        title = fields.get('title').strip()
+        description = fields.get('description').strip()
 
          # Body as dictionary: key = headline (if available, otherwise empty string), values = list of corresponding paragraphs
         body = dict()
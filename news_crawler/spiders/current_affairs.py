@@ -4,12 +4,12 @@ import os
 import sys
 from news_crawler.spiders import BaseSpider
 from scrapy.spiders import Rule 
-from scrapy.linkextractors import LinkExtractor
-from datetime import datetime
+from news_crawler.linkextractors import CompiledLinkExtractor
 
 sys.path.insert(0, os.path.join(os.getcwd(), "..",))
 from news_crawler.items import NewsCrawlerItem
-from news_crawler.utils import remove_empty_paragraphs
+from news_crawler.utils import remove_empty_paragraphs, parse_date, format_date, crawl_date
+from news_crawler.bylines import parse_authors
 
 class CurrentAffairsSpider(BaseSpider):
     """ Spider for Current Affairs """
@@ -21,7 +21,7 @@ class CurrentAffairsSpider(BaseSpider):
     # Exclude irelevant pages
     rules = (
             Rule(
-                LinkExtractor(
+                CompiledLinkExtractor(
                     allow=(r'www\.currentaffairs\.org\/\d+\/\d+\/\w.*$'),
                     deny=(
                         r'www\.currentaffairs\.org\/\d+\/\d+\/about-us\/',
@@ -36,21 +36,34 @@ class CurrentAffairsSpider(BaseSpider):
                 ),
             )
 
+    # XPaths of the article's fields
+    extraction_spec = {
+            'creation_date': '//mark[@class="dateline"]/span/text()',
+            'paragraphs': '//section[contains(@class, "essay-block")]/p | //h3/strong',
+            'authors': '//div[@class="bylines"]/ul/li/a[contains(@href, "/author/")]/text()',
+            'title': '//meta[@property="og:title"]/@content',
+            'description': '//meta[@name="description"]/@content',
+            'headlines': '//h2[not(@*) and not(ancestor::div[@class="teaser"])]',
+            'body': '//section[contains(@class, "essay-block")]/p | //h3/strong | //h2[not(@*) and not(ancestor::div[@class="teaser"])]'
+            }
+
     def parse_item(self, response):
         """
         Checks article validity. If valid, it parses it.
         """
+        fields = self.extract(response)
 
-        creation_date = response.xpath('//mark[@class="dateline"]/span/text()').get()
+        creation_date = fields.get('creation_date')
         if not creation_date:
+            self.reject('no_date')
             return
         creation_date = creation_date.lstrip('filed ').rstrip(' in')
-        creation_date = datetime.strptime(creation_date, '%d %B %Y')
+        creation_date = parse_date(creation_date, '%d %B %Y')
         if self.is_out_of_date(creation_date):
             return
 
         # Extract the article's paragraphs
-        paragraphs = [node.xpath('string()').get().strip() for node in response.xpath('//section[contains(@class, "essay-block")]/p | //h3/strong')]
+        paragraphs = fields.texts('paragraphs')
         paragraphs = remove_empty_paragraphs(paragraphs)
         text = ' '.join([para for para in paragraphs])
 
@@ -68,44 +81,30 @@ class CurrentAffairsSpider(BaseSpider):
         item['news_outlet'] = 'current_affairs'
         item['provenance'] = response.url
         item['query_keywords'] = self.get_query_keywords()
+        item['topics'] = self.get_topics()
 
         # Get creation, modification, and crawling dates
-        item['creation_date'] = creation_date.strftime('%d.%m.%Y')
-        item['last_modified'] = creation_date.strftime('%d.%m.%Y')
-        item['crawl_date'] = datetime.now().strftime('%d.%m.%Y')
+        item['creation_date'] = format_date(creation_date)
+        item['last_modified'] = format_date(creation_date)
+        item['crawl_date'] = crawl_date()
 
         # Get authors
-        authors = response.xpath('//div[@class="bylines"]/ul/li/a[contains(@href, "/author/")]/text()').getall()
-        item['author_person'] = [author for author in authors if author != 'Current Affairs'] if authors else list()
-        item['author_organization'] = ['Current Affairs'] if authors and 'Current Affairs' in authors else list()
+        item['author_person'], item['author_organization'] = parse_authors(fields.getall('authors'))
        
         # Extract keywords, if available
         item['news_keywords'] = list()
 
         # Get title, description, and body of article
-        title = response.xpath('//meta[@property="og:title"]/@content').get().strip()
-        description = response.xpath('//meta[@name="description"]/@content').get().strip()
+        title = fields.get('title').strip()
+        description = fields.get('description').strip()
         description = description.lstrip('<p>').rstrip(' </p>')
 
          # Body as dictionary: key = headline (if available, otherwise empty string), values = list of corresponding paragraphs
         body = dict()
         
-        if response.xpath('//h2[not(@*) and not(ancestor::div[@class="teaser"])]'):
-            # Extract headlines
-            headlines = [h2.xpath('string()').get().strip() for h2 in response.xpath('//h2[not(@*) and not(ancestor::div[@class="teaser"])]')]
-
-            # Extract paragraphs with headlines
-            text = [node.xpath('string()').get().strip() for node in response.xpath('//section[contains(@class, "essay-block")]/p | //h3/strong | //h2[not(@*) and not(ancestor::div[@class="teaser"])]')]
-
-            # Extract paragraphs between the abstract and the first headline
-            body[''] = remove_empty_paragraphs(text[:text.index(headlines[0])])
-
-            # Extract paragraphs corresponding to each headline, except the last one
-            for i in range(len(headlines)-1):
-                body[headlines[i]] = remove_empty_paragraphs(text[text.index(headlines[i])+1:text.index(headlines[i+1])])
-
-            # Extract the paragraphs belonging to the last headline
-            body[headlines[-1]] = remove_empty_paragraphs(text[text.index(headlines[-1])+1:])
+        if fields.exists('headlines'):
+            # Extract paragraphs grouped by their preceding headline
+            body = fields.sections('body', 'headlines')
 
         else:
             # The article has no headlines, just paragraphs
@@ -2,15 +2,14 @@
 
 import os
 import sys
-import json
 from news_crawler.spiders import BaseSpider
 from scrapy.spiders import Rule 
-from scrapy.linkextractors import LinkExtractor
-from datetime import datetime
+from news_crawler.linkextractors import CompiledLinkExtractor
 
 sys.path.insert(0, os.path.join(os.getcwd(), "..",))
 from news_crawler.items import NewsCrawlerItem
-from news_crawler.utils import remove_empty_paragraphs
+from news_crawler.utils import remove_empty_paragraphs, parse_date, format_date, crawl_date
+from news_crawler.bylines import parse_authors
 
 class DailyCallerSpider(BaseSpider):
     """ Spider for The Daily Caller """
@@ -22,7 +21,7 @@ class DailyCallerSpider(BaseSpider):
     # Exclude irelevant pages
     rules = (
             Rule(
-                LinkExtractor(
+                CompiledLinkExtractor(
                     allow=(r'dailycaller\.com\/\d+\/\d+\/\d+\/\w.*$'),
                     deny=(
                         r'dailycaller\.com\/shows\/',
@@ -45,27 +44,40 @@ class DailyCallerSpider(BaseSpider):
                 ),
             )
 
+    # XPaths of the article's fields
+    extraction_spec = {
+            'paragraphs': '//p[not(@*)]',
+            'title': '//meta[@property="og:title"]/@content',
+            'description': '//meta[@name="description"]/@content'
+            }
+
+    # JSON-LD properties of the article's fields, preferred over their XPaths
+    structured_data_spec = {
+            'creation_date': 'datePublished',
+            'last_modified': 'dateModified',
+            'authors': 'author',
+            'news_keywords': 'keywords',
+            'title': 'headline',
+            'description': 'description'
+            }
+
     def parse_item(self, response):
         """
         Checks article validity. If valid, it parses it.
         """
+        fields = self.extract(response)
 
-        data_json = response.xpath('//script[@type="application/ld+json"]/text()').get()
-        if data_json:
-            data = json.loads(data_json)
-        else:
-            return
-        
-        creation_date = data['datePublished']
+        creation_date = fields.get('creation_date')
         if not creation_date:
+            self.reject('no_date')
             return
-        creation_date = datetime.fromisoformat(creation_date.split('T')[0])
+        creation_date = parse_date(creation_date)
         
         if self.is_out_of_date(creation_date):
             return
 
         # Extract the article's paragraphs
-        paragraphs = [node.xpath('string()').get().strip() for node in response.xpath('//p[not(@*)]')]
+        paragraphs = fields.texts('paragraphs')
         paragraphs = remove_empty_paragraphs(paragraphs)
         text = ' '.join([para for para in paragraphs])
 
@@ -83,26 +95,25 @@ class DailyCallerSpider(BaseSpider):
         item['news_outlet'] = 'daily_caller'
         item['provenance'] = response.url
         item['query_keywords'] = self.get_query_keywords()
+        item['topics'] = self.get_topics()
 
         # Get creation, modification, and crawling dates
-        item['creation_date'] = creation_date.strftime('%d.%m.%Y')
-        last_modified = data['dateModified']
-        last_modified = datetime.fromisoformat(last_modified.split('T')[0])
-        item['last_modified'] = last_modified.strftime('%d.%m.%Y')
-        item['crawl_date'] = datetime.now().strftime('%d.%m.%Y')
+        item['creation_date'] = format_date(creation_date)
+        last_modified = fields.get('last_modified')
+        last_modified = parse_date(last_modified)
+        item['last_modified'] = format_date(last_modified)
+        item['crawl_date'] = crawl_date()
 
         # Get authors
-        authors = data['author']['name']
-        item['author_person'] = [authors] if authors else list()
-        item['author_organization'] = list()
+        item['author_person'], item['author_organization'] = parse_authors(fields.get('authors'))
        
         # Extract keywords, if available
-        news_keywords = data['keywords'] 
+        news_keywords = fields.getall('news_keywords')
         item['news_keywords'] = news_keywords if news_keywords else list()
 
         # Get title, description, and body of article
-        title = response.xpath('//meta[@property="og:title"]/@content').get().strip()
-        description = response.xpath('//meta[@name="description"]/@content').get().strip()
+        title = fields.get('title').strip()
+        description = fields.get('description').strip()
 
          # Body as dictionary: key = headline (if available, otherwise empty string), values = list of corresponding paragraphs
         body = dict()
@@ -4,12 +4,11 @@ import os
 import sys
 from news_crawler.spiders import BaseSpider
 from scrapy.spiders import Rule 
-from scrapy.linkextractors import LinkExtractor
-from datetime import datetime
+from news_crawler.linkextractors import CompiledLinkExtractor
 
 sys.path.insert(0, os.path.join(os.getcwd(), "..",))
 from news_crawler.items import NewsCrawlerItem
-from news_crawler.utils import remove_empty_paragraphs
+from news_crawler.utils import remove_empty_paragraphs, parse_date, format_date, crawl_date
 
 class DailyKosSpider(BaseSpider):
     """ Spider for Daily Kos """
@@ -21,7 +20,7 @@ class DailyKosSpider(BaseSpider):
     # Exclude irelevant pages
     rules = (
             Rule(
-                LinkExtractor(
+                CompiledLinkExtractor(
                     allow=(r'www\.dailykos\.com\/stories\/\d+\/\d+\/\d+\/\w.*$'),
                     deny=(
                         r'www\.dailykos\.com\/jobs\/',
@@ -39,20 +38,35 @@ class DailyKosSpider(BaseSpider):
                 ),
             )
 
+    # XPaths of the article's fields
+    extraction_spec = {
+            'creation_date': '//div[@class="author-date visible-sm-block"]/span/text()',
+            'paragraphs': '//p[not(@*)]',
+            'author_person': '//div[@class="author-byline name-heading"]/span[@class="author-name"]/a/text()',
+            'author_organization': '//div[@class="author-byline designation"]/span/text()',
+            'news_keywords': '//div[@class="story-tags-wrapper"]/ul/li/a[@class="tag-name"]/text()',
+            'title': '//meta[@property="og:title"]/@content',
+            'description': '//meta[@name="description"]/@content',
+            'headlines': '//h3[not(@*)]',
+            'body': '//p[not(@*)] | //h3[not(@*)]'
+            }
+
     def parse_item(self, response):
         """
         Checks article validity. If valid, it parses it.
         """
+        fields = self.extract(response)
 
-        creation_date = response.xpath('//div[@class="author-date visible-sm-block"]/span/text()').get()
+        creation_date = fields.get('creation_date')
         if not creation_date:
+            self.reject('no_date')
             return
-        creation_date = datetime.strptime(creation_date, '%Y/%m/%d')
+        creation_date = parse_date(creation_date, '%Y/%m/%d')
         if self.is_out_of_date(creation_date):
             return
 
         # Extract the article's paragraphs
-        paragraphs = [node.xpath('string()').get().strip() for node in response.xpath('//p[not(@*)]')]
+        paragraphs = fields.texts('paragraphs')
         paragraphs = remove_empty_paragraphs(paragraphs)
         text = ' '.join([para for para in paragraphs])
 
@@ -70,45 +84,33 @@ class DailyKosSpider(BaseSpider):
         item['news_outlet'] = 'daily_kos'
         item['provenance'] = response.url
         item['query_keywords'] = self.get_query_keywords()
+        item['topics'] = self.get_topics()
 
         # Get creation, modification, and crawling dates
-        item['creation_date'] = creation_date.strftime('%d.%m.%Y')
-        item['last_modified'] = creation_date.strftime('%d.%m.%Y')
-        item['crawl_date'] = datetime.now().strftime('%d.%m.%Y')
+        item['creation_date'] = format_date(creation_date)
+        item['last_modified'] = format_date(creation_date)
+        item['crawl_date'] = crawl_date()
 
         # Get authors
-        author_person = response.xpath('//div[@class="author-byline name-heading"]/span[@class="author-name"]/a/text()').get()
-        author_organization = response.xpath('//div[@class="author-byline designation"]/span/text()').get()
+        author_person = fields.get('author_person')
+        author_organization = fields.get('author_organization')
         item['author_person'] = [author_person] if author_person else list()
         item['author_organization'] = [author_organization] if author_organization else list()
        
         # Extract keywords, if available
-        news_keywords = response.xpath('//div[@class="story-tags-wrapper"]/ul/li/a[@class="tag-name"]/text()').getall()
+        news_keywords = fields.getall('news_keywords')
         item['news_keywords'] = news_keywords if news_keywords else list()
 
         # Get title, description, and body of article
-        title = response.xpath('//meta[@property="og:title"]/@content').get().strip()
-        description = response.xpath('//meta[@name="description"]/@content').get().strip()
+        title = fields.get('title').strip()
+        description = fields.get('description').strip()
 
          # Body as dictionary: key = headline (if available, otherwise empty string), values = list of corresponding paragraphs
         body = dict()
         
-        if response.xpath('//h3[not(@*)]'):
-            # Extract headlines
-            headlines = [h3.xpath('string()').get().strip() for h3 in response.xpath('//h3[not(@*)]')]
-
-            # Extract paragraphs with headlines
-            text = [node.xpath('string()').get().strip() for node in response.xpath('//p[not(@*)] | //h3[not(@*)]')]
-
-            # Extract paragraphs between the abstract and the first headline
-            body[''] = remove_empty_paragraphs(text[:text.index(headlines[0])])
-
-            # Extract paragraphs corresponding to each headline, except the last one
-            for i in range(len(headlines)-1):
-                body[headlines[i]] = remove_empty_paragraphs(text[text.index(headlines[i])+1:text.index(headlines[i+1])])
-
-            # Extract the paragraphs belonging to the last headline
-            body[headlines[-1]] = remove_empty_paragraphs(text[text.index(headlines[-1])+1:])
+        if fields.exists('headlines'):
+            # Extract paragraphs grouped by their preceding headline
+            body = fields.sections('body', 'headlines')
 
         else:
             # The article has no headlines, just paragraphs
@@ -5,12 +5,12 @@ import sys
 import json
 from news_crawler.spiders import BaseSpider
 from scrapy.spiders import Rule 
-from scrapy.linkextractors import LinkExtractor
-from datetime import datetime
+from news_crawler.linkextractors import CompiledLinkExtractor
 
 sys.path.insert(0, os.path.join(os.getcwd(), "..",))
 from news_crawler.items import NewsCrawlerItem
-from news_crawler.utils import remove_empty_paragraphs
+from news_crawler.utils import remove_empty_paragraphs, parse_date, format_date, crawl_date
+from news_crawler.bylines import parse_authors
 
 class DailyWireSpider(BaseSpider):
     """ Spider for The Daily Wire """
@@ -22,7 +22,7 @@ class DailyWireSpider(BaseSpider):
     # Exclude irelevant pages
     rules = (
             Rule(
-                LinkExtractor(
+                CompiledLinkExtractor(
                     allow=(r'www\.dailywire\.com\/news\/\w.*$'),
                     deny=(
                         r'www\.dailywire\.com\/about',
@@ -43,27 +43,49 @@ class DailyWireSpider(BaseSpider):
                 ),
             )
 
+    # XPaths of the article's fields
+    extraction_spec = {
+            'data_json': '//script[@type="application/json"]/text()',
+            'creation_date': '//meta[@name="parsely-pub-date"]/@content',
+            'paragraphs': '//div[@id="post-body-text"]//p',
+            'authors': '//span/a/strong[@class="css-1srl04s"]/text()',
+            'news_keywords': '//meta[@name="parsely-tags"]/@content',
+            'title': '//meta[@property="og:title"]/@content'
+            }
+
+    # JSON-LD properties of the article's fields, preferred over their XPaths
+    structured_data_spec = {
+            'creation_date': 'datePublished',
+            'last_modified': 'dateModified',
+            'news_keywords': 'keywords',
+            'title': 'headline',
+            'description': 'description'
+            }
+
     def parse_item(self, response):
         """
         Checks article validity. If valid, it parses it.
         """
+        fields = self.extract(response)
 
-        # Ignore articles for members only
-        data_json = response.xpath('//script[@type="application/json"]/text()').get()
-        if data_json:
-            data = json.loads(data_json)
-            if data['props']['pageProps']['post']['members_only']==True:
-                return
-
-        creation_date = response.xpath('//meta[@name="parsely-pub-date"]/@content').get()
+        creation_date = fields.get('creation_date')
         if not creation_date:
+            self.reject('no_date')
             return
-        creation_date = datetime.fromisoformat(creation_date.split('T')[0])
+        creation_date = parse_date(creation_date)
         if self.is_out_of_date(creation_date):
             return
 
+        # Ignore articles for members only, once the date (found in the structured data) is in range
+        data_json = fields.get('data_json')
+        if data_json:
+            data = json.loads(data_json)
+            if data['props']['pageProps']['post']['members_only']==True:
+                self.reject('members_only')
+                return
+
         # Extract the article's paragraphs
-        paragraphs = [node.xpath('string()').get().strip() for node in response.xpath('//div[@id="post-body-text"]//p')]
+        paragraphs = fields.texts('paragraphs')
         paragraphs = remove_empty_paragraphs(paragraphs)
         text = ' '.join([para for para in paragraphs])
 
@@ -81,29 +103,23 @@ class DailyWireSpider(BaseSpider):
         item['news_outlet'] = 'daily_wire'
         item['provenance'] = response.url
         item['query_keywords'] = self.get_query_keywords()
+        item['topics'] = self.get_topics()
 
         # Get creation, modification, and crawling dates
-        item['creation_date'] = creation_date.strftime('%d.%m.%Y')
-        item['last_modified'] = creation_date.strftime('%d.%m.%Y')
-        item['crawl_date'] = datetime.now().strftime('%d.%m.%Y')
+        item['creation_date'] = format_date(creation_date)
+        last_modified = fields.get('last_modified')
+        item['last_modified'] = format_date(parse_date(last_modified)) if last_modified else format_date(creation_date)
+        item['crawl_date'] = crawl_date()
 
         # Get authors
-        authors = response.xpath('//span/a/strong[@class="css-1srl04s"]/text()').getall()
-        item['author_person'] = authors if authors else list()
-        item['author_organization'] = list()
+        item['author_person'], item['author_organization'] = parse_authors(fields.getall('authors'))
        
         # Extract keywords, if available
-        news_keywords = response.xpath('//meta[@name="parsely-tags"]/@content').get()
-        item['news_keywords'] = news_keywords.split(',') if news_keywords else list()
+        item['news_keywords'] = [keyword for keywords in fields.getall('news_keywords') for keyword in keywords.split(',') if keyword]
 
         # Get title, description, and body of article
-        title = response.xpath('//meta[@property="og:title"]/@content').get().strip()
-        desc_json = response.xpath('//script[@type="application/ld+json"]/text()').get()
-        if desc_json:
-            desc_data = json.loads(desc_json)
-            description = desc_data['description']
-        else:
-            description = ''
+        title = fields.get('title').strip()
+        description = fields.get('description') or ''
 
          # Body as dictionary: key = headline (if available, otherwise empty string), values = list of corresponding paragraphs
         body = dict()
@@ -4,12 +4,11 @@ import os
 import sys
 from news_crawler.spiders import BaseSpider
 from scrapy.spiders import Rule 
-from scrapy.linkextractors import LinkExtractor
-from datetime import datetime
+from news_crawler.linkextractors import CompiledLinkExtractor
 
 sys.path.insert(0, os.path.join(os.getcwd(), "..",))
 from news_crawler.items import NewsCrawlerItem
-from news_crawler.utils import remove_empty_paragraphs
+from news_crawler.utils import remove_empty_paragraphs, parse_date, format_date, crawl_date
 
 class DemocracyNowSpider(BaseSpider):
     """ Spider for Democracy Now """
@@ -21,7 +20,7 @@ class DemocracyNowSpider(BaseSpider):
     # Exclude irelevant pages
     rules = (
             Rule(
-                LinkExtractor(
+                CompiledLinkExtractor(
                     allow=(r'www\.democracynow\.org\/\d+\/\d+\/\d+\/\w.*$'),
                     deny=(
                         r'www\.democracynow\.org\/about',
@@ -40,20 +39,32 @@ class DemocracyNowSpider(BaseSpider):
                 ),
             )
 
+    # XPaths of the article's fields
+    extraction_spec = {
+            'creation_date': '//div[@id="story_content"]//span[@class="date"]/text()',
+            'paragraphs': '//p[not(descendant::span[@class="plea"])]',
+            'news_keywords': '//a[@data-ga-action="Story: Topic"]/text()',
+            'title': '//meta[@property="og:title"]/@content',
+            'description': '//meta[@property="og:description"]/@content',
+            'recommendations': '//a[@data-ga-action="Story: Recommended"]/@href'
+            }
+
     def parse_item(self, response):
         """
         Checks article validity. If valid, it parses it.
         """
+        fields = self.extract(response)
 
-        creation_date = response.xpath('//div[@id="story_content"]//span[@class="date"]/text()').get()
+        creation_date = fields.get('creation_date')
         if not creation_date:
+            self.reject('no_date')
             return
-        creation_date = datetime.strptime(creation_date, '%B %d, %Y')
+        creation_date = parse_date(creation_date, '%B %d, %Y')
         if self.is_out_of_date(creation_date):
             return
 
         # Extract the article's paragraphs
-        paragraphs = [node.xpath('string()').get().strip() for node in response.xpath('//p[not(descendant::span[@class="plea"])]')]
+        paragraphs = fields.texts('paragraphs')
         paragraphs = paragraphs[:-1]
         paragraphs = remove_empty_paragraphs(paragraphs)
         text = ' '.join([para for para in paragraphs])
@@ -72,23 +83,24 @@ class DemocracyNowSpider(BaseSpider):
         item['news_outlet'] = 'democracy_now'
         item['provenance'] = response.url
         item['query_keywords'] = self.get_query_keywords()
+        item['topics'] = self.get_topics()
 
         # Get creation, modification, and crawling dates
-        item['creation_date'] = creation_date.strftime('%d.%m.%Y')
-        item['last_modified'] = creation_date.strftime('%d.%m.%Y')
-        item['crawl_date'] = datetime.now().strftime('%d.%m.%Y')
+        item['creation_date'] = format_date(creation_date)
+        item['last_modified'] = format_date(creation_date)
+        item['crawl_date'] = crawl_date()
 
         # Get authors
         item['author_person'] = list()
         item['author_organization'] = list()
        
         # Extract keywords, if available
-        news_keywords = response.xpath('//a[@data-ga-action="Story: Topic"]/text()').getall()
+        news_keywords = fields.getall('news_keywords')
         item['news_keywords'] = list(set(news_keywords)) if news_keywords else list()
 
         # Get title, description, and body of article
-        title = response.xpath('//meta[@property="og:title"]/@content').get().strip()
-        description = response.xpath('//meta[@property="og:description"]/@content').get().strip()
+        title = fields.get('title').strip()
+        description = fields.get('description').strip()
 
          # Body as dictionary: key = headline (if available, otherwise empty string), values = list of corresponding paragraphs
         body = dict()
@@ -99,7 +111,7 @@ class DemocracyNowSpider(BaseSpider):
         item['content'] = {'title': title, 'description': description, 'body':body}
 
         # Recommendations to top 5 other related articles from the same outlet
-        recommendations = response.xpath('//a[@data-ga-action="Story: Recommended"]/@href').getall()
+        recommendations = fields.getall('recommendations')
         if recommendations:
             recommendations = list(set(recommendations))
             recommendations = ['www.democracynow.org' + rec for rec in recommendations]
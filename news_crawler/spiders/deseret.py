@@ -2,15 +2,14 @@
 
 import os
 import sys
-import json
 from news_crawler.spiders import BaseSpider
 from scrapy.spiders import Rule 
-from scrapy.linkextractors import LinkExtractor
-from datetime import datetime
+from news_crawler.linkextractors import CompiledLinkExtractor
 
 sys.path.insert(0, os.path.join(os.getcwd(), "..",))
 from news_crawler.items import NewsCrawlerItem
-from news_crawler.utils import remove_empty_paragraphs
+from news_crawler.utils import remove_empty_paragraphs, parse_date, format_date, crawl_date
+from news_crawler.bylines import parse_authors
 
 class DeseretSpider(BaseSpider):
     """ Spider for Deseret News """
@@ -22,7 +21,7 @@ class DeseretSpider(BaseSpider):
     # Exclude irelevant pages
     rules = (
             Rule(
-                LinkExtractor(
+                CompiledLinkExtractor(
                     allow=(r'www\.deseret\.com\/\w.*$'),
                     deny=(
                         r'www\.deseret\.com\/pages\/legal-notices',
@@ -43,20 +42,44 @@ class DeseretSpider(BaseSpider):
                 ),
             )
 
+    # XPaths of the article's fields
+    extraction_spec = {
+            'creation_date': '//meta[@property="article:published_time"]/@content',
+            'paragraphs': '//div[@class="RichTextArticleBody RichTextBody"]/p | //div[@class="RichTextArticleBody RichTextBody"]/ul/li',
+            'last_modified': '//meta[@property="article:modified_time"]/@content',
+            'authors': '//meta[@name="parsely-author"]/@content',
+            'title': '//meta[@property="og:title"]/@content',
+            'description': '//meta[@name="description"]/@content',
+            'headlines': '//h3',
+            'body': '//div[@class="RichTextArticleBody RichTextBody"]/p | //div[@class="RichTextArticleBody RichTextBody"]/ul/li | //h3',
+            'recommendations': '//ul[@class="RelatedList-items"]/li/a/@href'
+            }
+
+    # JSON-LD properties of the article's fields, preferred over their XPaths
+    structured_data_spec = {
+            'creation_date': 'datePublished',
+            'last_modified': 'dateModified',
+            'news_keywords': 'keywords',
+            'title': 'headline',
+            'description': 'description'
+            }
+
     def parse_item(self, response):
         """
         Checks article validity. If valid, it parses it.
         """
+        fields = self.extract(response)
 
-        creation_date = response.xpath('//meta[@property="article:published_time"]/@content').get()
+        creation_date = fields.get('creation_date')
         if not creation_date:
+            self.reject('no_date')
             return
-        creation_date = datetime.fromisoformat(creation_date.split('T')[0])
+        creation_date = parse_date(creation_date)
         if self.is_out_of_date(creation_date):
             return
 
         # Extract the article's paragraphs
-        paragraphs = [node.xpath('string()').get().strip() for node in response.xpath('//div[@class="RichTextArticleBody RichTextBody"]/p | //div[@class="RichTextArticleBody RichTextBody"]/ul/li')]
+        paragraphs = fields.texts('paragraphs')
         paragraphs = remove_empty_paragraphs(paragraphs)
         text = ' '.join([para for para in paragraphs])
 
@@ -74,51 +97,31 @@ class DeseretSpider(BaseSpider):
         item['news_outlet'] = 'deseret_news'
         item['provenance'] = response.url
         item['query_keywords'] = self.get_query_keywords()
+        item['topics'] = self.get_topics()
 
         # Get creation, modification, and crawling dates
-        item['creation_date'] = creation_date.strftime('%d.%m.%Y')
-        last_modified = response.xpath('//meta[@property="article:modified_time"]/@content').get()
-        last_modified = datetime.fromisoformat(last_modified.split('T')[0])
-        item['last_modified'] = last_modified.strftime('%d.%m.%Y')
-        item['crawl_date'] = datetime.now().strftime('%d.%m.%Y')
+        item['creation_date'] = format_date(creation_date)
+        last_modified = fields.get('last_modified')
+        last_modified = parse_date(last_modified)
+        item['last_modified'] = format_date(last_modified)
+        item['crawl_date'] = crawl_date()
 
         # Get authors
-        authors = response.xpath('//meta[@name="parsely-author"]/@content').getall()
-        item['author_person'] = [author for author in authors if author != "Readers' Forum"] if authors else list()
-        item['author_organization'] = ["Readers' Forum"] if "Readers' Forum" in authors and authors else list()
+        item['author_person'], item['author_organization'] = parse_authors(fields.getall('authors'))
        
         # Extract keywords, if available
-        data_json = response.xpath('//script[@type="application/ld+json"]/text()').get()
-        if data_json:
-            data = json.loads(data_json)
-            news_keywords = data['keywords']
-        else:
-            news_keywords = list()
-        item['news_keywords'] = news_keywords
+        item['news_keywords'] = fields.getall('news_keywords')
 
         # Get title, description, and body of article
-        title = response.xpath('//meta[@property="og:title"]/@content').get().strip()
-        description = response.xpath('//meta[@name="description"]/@content').get().strip()
+        title = fields.get('title').strip()
+        description = fields.get('description').strip()
 
          # Body as dictionary: key = headline (if available, otherwise empty string), values = list of corresponding paragraphs
         body = dict()
         
-        if response.xpath('//h3'):
-            # Extract headlines
-            headlines = [h3.xpath('string()').get().strip() for h3 in response.xpath('//h3')]
-
-            # Extract paragraphs with headlines
-            text = [node.xpath('string()').get().strip() for node in response.xpath('//div[@class="RichTextArticleBody RichTextBody"]/p | //div[@class="RichTextArticleBody RichTextBody"]/ul/li | //h3')]
-
-            # Extract paragraphs between the abstract and the first headline
-            body[''] = remove_empty_paragraphs(text[:text.index(headlines[0])])
-
-            # Extract paragraphs corresponding to each headline, except the last one
-            for i in range(len(headlines)-1):
-                body[headlines[i]] = remove_empty_paragraphs(text[text.index(headlines[i])+1:text.index(headlines[i+1])])
-
-            # Extract the paragraphs belonging to the last headline
-            body[headlines[-1]] = remove_empty_paragraphs(text[text.index(headlines[-1])+1:])
+        if fields.exists('headlines'):
+            # Extract paragraphs grouped by their preceding headline
+            body = fields.sections('body', 'headlines')
 
         else:
             # The article has no headlines, just paragraphs
@@ -127,7 +130,7 @@ class DeseretSpider(BaseSpider):
         item['content'] = {'title': title, 'description': description, 'body':body}
 
         # There are no recommendations to other related articles
-        recommendations = response.xpath('//ul[@class="RelatedList-items"]/li/a/@href').getall()
+        recommendations = fields.getall('recommendations')
         item['recommendations'] = list(set(recommendations))[:5] if recommendations else list()
 
         item['response_body'] = response.body
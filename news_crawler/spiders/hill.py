@@ -4,12 +4,12 @@ import os
 import sys
 from news_crawler.spiders import BaseSpider
 from scrapy.spiders import Rule 
-from scrapy.linkextractors import LinkExtractor
-from datetime import datetime
+from news_crawler.linkextractors import CompiledLinkExtractor
 
 sys.path.insert(0, os.path.join(os.getcwd(), "..",))
 from news_crawler.items import NewsCrawlerItem
-from news_crawler.utils import remove_empty_paragraphs
+from news_crawler.utils import remove_empty_paragraphs, parse_date, format_date, crawl_date
+from news_crawler.bylines import parse_authors
 
 class HillSpider(BaseSpider):
     """ Spider for The Hill"""
@@ -21,7 +21,7 @@ class HillSpider(BaseSpider):
     # Exclude irelevant pages
     rules = (
             Rule(
-                LinkExtractor(
+                CompiledLinkExtractor(
                     allow=(r'thehill\.com\/\w.*$'),
                     deny=(
                         r'thehill\.com\/people',
@@ -42,20 +42,34 @@ class HillSpider(BaseSpider):
                 ),
             )
 
+    # XPaths of the article's fields
+    extraction_spec = {
+            'creation_date': '//meta[@name="dcterms.date"]/@content',
+            'paragraphs': '//div[contains(@class, "article__text")]/p[not(child::strong)]',
+            'authors': '//meta[@name="dcterms.creator"]/@content',
+            'news_keywords': '//section[@class="text-300 text-transform-upper"]//a',
+            'title': '//meta[@name="dcterms.title"]/@content',
+            'description': '//meta[@name="dcterms.description"]/@content',
+            'headlines': '//h2[not(@class)]',
+            'body': '//div[contains(@class, "article__text")]/p[not(child::strong)] | //h2[not(@class)]'
+            }
+
     def parse_item(self, response):
         """
         Checks article validity. If valid, it parses it.
         """
+        fields = self.extract(response)
 
-        creation_date = response.xpath('//meta[@name="dcterms.date"]/@content').get()
+        creation_date = fields.get('creation_date')
         if not creation_date:
+            self.reject('no_date')
             return
-        creation_date = datetime.fromisoformat(creation_date.split('T')[0])
+        creation_date = parse_date(creation_date)
         if self.is_out_of_date(creation_date):
             return
 
         # Extract the article's paragraphs
-        paragraphs = [node.xpath('string()').get().strip() for node in response.xpath('//div[contains(@class, "article__text")]/p[not(child::strong)]')]
+        paragraphs = fields.texts('paragraphs')
         paragraphs = remove_empty_paragraphs(paragraphs)
         text = ' '.join([para for para in paragraphs])
 
@@ -73,49 +87,30 @@ class HillSpider(BaseSpider):
         item['news_outlet'] = 'hill'
         item['provenance'] = response.url
         item['query_keywords'] = self.get_query_keywords()
+        item['topics'] = self.get_topics()
 
         # Get creation, modification, and crawling dates
-        item['creation_date'] = creation_date.strftime('%d.%m.%Y')
-        item['last_modified'] = creation_date.strftime('%d.%m.%Y')
-        item['crawl_date'] = datetime.now().strftime('%d.%m.%Y')
+        item['creation_date'] = format_date(creation_date)
+        item['last_modified'] = format_date(creation_date)
+        item['crawl_date'] = crawl_date()
 
         # Get authors
-        authors = response.xpath('//meta[@name="dcterms.creator"]/@content').get()
-        if authors:
-            authors = authors.split(', ')
-            authors = [author for author in authors if not 'opinion contributor' in author]
-        else:
-            authors = list()
-        item['author_person'] = authors
-        item['author_organization'] = list()
+        item['author_person'], item['author_organization'] = parse_authors(fields.get('authors'))
        
         # Extract keywords, if available
-        news_keywords = [node.xpath('string()').get().strip() for node in response.xpath('//section[@class="text-300 text-transform-upper"]//a')]
+        news_keywords = fields.texts('news_keywords')
         item['news_keywords'] = news_keywords if news_keywords else list()
 
         # Get title, description, and body of article
-        title = response.xpath('//meta[@name="dcterms.title"]/@content').get().strip()
-        description = response.xpath('//meta[@name="dcterms.description"]/@content').get().strip()
+        title = fields.get('title').strip()
+        description = fields.get('description').strip()
 
          # Body as dictionary: key = headline (if available, otherwise empty string), values = list of corresponding paragraphs
         body = dict()
         
-        if response.xpath('//h2[not(@class)]'):
-            # Extract headlines
-            headlines = [h2.xpath('string()').get().strip() for h2 in response.xpath('//h2[not(@class)]')]
-
-            # Extract paragraphs with headlines
-            text = [node.xpath('string()').get().strip() for node in response.xpath('//div[contains(@class, "article__text")]/p[not(child::strong)] | //h2[not(@class)]')]
-
-            # Extract paragraphs between the abstract and the first headline
-            body[''] = remove_empty_paragraphs(text[:text.index(headlines[0])])
-
-            # Extract paragraphs corresponding to each headline, except the last one
-            for i in range(len(headlines)-1):
-                body[headlines[i]] = remove_empty_paragraphs(text[text.index(headlines[i])+1:text.index(headlines[i+1])])
-
-            # Extract the paragraphs belonging to the last headline
-            body[headlines[-1]] = remove_empty_paragraphs(text[text.index(headlines[-1])+1:])
+        if fields.exists('headlines'):
+            # Extract paragraphs grouped by their preceding headline
+            body = fields.sections('body', 'headlines')
 
         else:
             # The article has no headlines, just paragraphs
@@ -4,12 +4,12 @@ import os
 import sys
 from news_crawler.spiders import BaseSpider
 from scrapy.spiders import Rule 
-from scrapy.linkextractors import LinkExtractor
-from datetime import datetime
+from news_crawler.linkextractors import CompiledLinkExtractor
 
 sys.path.insert(0, os.path.join(os.getcwd(), "..",))
 from news_crawler.items import NewsCrawlerItem
-from news_crawler.utils import remove_empty_paragraphs
+from news_crawler.utils import remove_empty_paragraphs, parse_date, format_date, crawl_date
+from news_crawler.bylines import parse_authors
 
 class HuffpostSpider(BaseSpider):
     """ Spider for Huffpost """
@@ -21,7 +21,7 @@ class HuffpostSpider(BaseSpider):
     # Exclude irelevant pages
     rules = (
             Rule(
-                LinkExtractor(
+                CompiledLinkExtractor(
                     allow=(r'www\.huffpost\.com\/entry\/\w.*$'),
                     deny=(
                         r'www\.huffpost\.com\/section\/video',
@@ -37,20 +37,33 @@ class HuffpostSpider(BaseSpider):
                 ),
             )
 
+    # XPaths of the article's fields
+    extraction_spec = {
+            'creation_date': '//time/@datetime',
+            'paragraphs': '//div[@class="primary-cli cli cli-text "]',
+            'authors': '//div[@class="entry__byline__author"]/a/@data-vars-item-name | //div[@class="entry__wirepartner entry-wirepartner"]/span/text()',
+            'news_keywords': '//meta[@name="keywords"]/@content',
+            'title': '//meta[@property="og:title"]/@content',
+            'description': '//meta[@name="description"]/@content',
+            'recommendations': '//div[@class="cli-related-articles__content-wrapper"]/div/a/@href'
+            }
+
     def parse_item(self, response):
         """
         Checks article validity. If valid, it parses it.
         """
+        fields = self.extract(response)
 
-        creation_date = response.xpath('//time/@datetime').get()
+        creation_date = fields.get('creation_date')
         if not creation_date:
+            self.reject('no_date')
             return
-        creation_date = datetime.fromisoformat(creation_date.split('T')[0])
+        creation_date = parse_date(creation_date)
         if self.is_out_of_date(creation_date):
             return
 
         # Extract the article's paragraphs
-        paragraphs = [node.xpath('string()').get().strip() for node in response.xpath('//div[@class="primary-cli cli cli-text "]')]
+        paragraphs = fields.texts('paragraphs')
         paragraphs = remove_empty_paragraphs(paragraphs)
         paragraphs = paragraphs[:-1] # Remove advertisement in last line
         text = ' '.join([para for para in paragraphs])
@@ -69,24 +82,23 @@ class HuffpostSpider(BaseSpider):
         item['news_outlet'] = 'huffpost'
         item['provenance'] = response.url
         item['query_keywords'] = self.get_query_keywords()
+        item['topics'] = self.get_topics()
 
         # Get creation, modification, and crawling dates
-        item['creation_date'] = creation_date.strftime('%d.%m.%Y')
-        item['last_modified'] = creation_date.strftime('%d.%m.%Y')
-        item['crawl_date'] = datetime.now().strftime('%d.%m.%Y')
+        item['creation_date'] = format_date(creation_date)
+        item['last_modified'] = format_date(creation_date)
+        item['crawl_date'] = crawl_date()
 
         # Get authors
-        authors = response.xpath('//div[@class="entry__byline__author"]/a/@data-vars-item-name | //div[@class="entry__wirepartner entry-wirepartner"]/span/text()').getall()        
-        item['author_person'] = authors if authors else list()
-        item['author_organization'] = list()
+        item['author_person'], item['author_organization'] = parse_authors(fields.getall('authors'))
        
         # Extract keywords, if available
-        news_keywords = response.xpath('//meta[@name="keywords"]/@content').get()
+        news_keywords = fields.get('news_keywords')
         item['news_keywords'] = news_keywords.split(',') if news_keywords else list()
 
         # Get title, description, and body of article
-        title = response.xpath('//meta[@property="og:title"]/@content').get().strip()
-        description = response.xpath('//meta[@name="description"]/@content').get().strip()
+        title = fields.get('title').strip()
+        description = fields.get('description').strip()
 
          # Body as dictionary: key = headline (if available, otherwise empty string), values = list of corresponding paragraphs
         body = dict()
@@ -97,7 +109,7 @@ class HuffpostSpider(BaseSpider):
         item['content'] = {'title': title, 'description': description, 'body':body}
 
         # Top 5 recommendations to other related news articles from the same outlet
-        recommendations = response.xpath('//div[@class="cli-related-articles__content-wrapper"]/div/a/@href').getall()
+        recommendations = fields.getall('recommendations')
         if recommendations:
             item['recommendations'] = list(set(recommendations))[:5]
         else:
@@ -4,12 +4,12 @@ import os
 import sys
 from news_crawler.spiders import BaseSpider
 from scrapy.spiders import Rule 
-from scrapy.linkextractors import LinkExtractor
-from datetime import datetime
+from news_crawler.linkextractors import CompiledLinkExtractor
 
 sys.path.insert(0, os.path.join(os.getcwd(), "..",))
 from news_crawler.items import NewsCrawlerItem
-from news_crawler.utils import remove_empty_paragraphs
+from news_crawler.utils import remove_empty_paragraphs, parse_date, format_date, crawl_date
+from news_crawler.bylines import parse_authors
 
 class MotherJonesSpider(BaseSpider):
     """ Spider for Mother Jones """
@@ -21,7 +21,7 @@ class MotherJonesSpider(BaseSpider):
     # Exclude irelevant pages
     rules = (
             Rule(
-                LinkExtractor(
+                CompiledLinkExtractor(
                     allow=(r'www\.motherjones\.com\/\w.*\/\d+\/\d+\/\w.*$'),
                     deny=(
                         r'www\.motherjones\.com\/newsletters\/',
@@ -40,20 +40,34 @@ class MotherJonesSpider(BaseSpider):
                 ),
             )
 
+    # XPaths of the article's fields
+    extraction_spec = {
+            'creation_date': '//meta[@property="article:published"]/@content',
+            'paragraphs': '//*[@id="fullwidth-body"]/p | //*[contains(@id, "post-")]/article/p | //ol/li',
+            'last_modified': '//meta[@property="article:modified"]/@content',
+            'authors': '//meta[@property="article:author"]/@content',
+            'news_keywords': '//meta[@property="article:tag"]/@content',
+            'title': '//meta[@property="og:title"]/@content',
+            'description': '//meta[@property="og:description"]/@content',
+            'recommendations': '//li/div/a[contains(@data-ga-label, "RelatedArticle") and contains(@data-ga-label, "headline")]/@data-ga-action'
+            }
+
     def parse_item(self, response):
         """
         Checks article validity. If valid, it parses it.
         """
+        fields = self.extract(response)
 
-        creation_date = response.xpath('//meta[@property="article:published"]/@content').get()
+        creation_date = fields.get('creation_date')
         if not creation_date:
+            self.reject('no_date')
             return
-        creation_date = datetime.fromisoformat(creation_date.split('T')[0])
+        creation_date = parse_date(creation_date)
         if self.is_out_of_date(creation_date):
             return
 
         # Extract the article's paragraphs
-        paragraphs = [node.xpath('string()').get().strip() for node in response.xpath('//*[@id="fullwidth-body"]/p | //*[contains(@id, "post-")]/article/p | //ol/li')]
+        paragraphs = fields.texts('paragraphs')
         paragraphs = remove_empty_paragraphs(paragraphs)
         text = ' '.join([para for para in paragraphs])
 
@@ -71,26 +85,25 @@ class MotherJonesSpider(BaseSpider):
         item['news_outlet'] = 'mother_jones'
         item['provenance'] = response.url
         item['query_keywords'] = self.get_query_keywords()
+        item['topics'] = self.get_topics()
 
         # Get creation, modification, and crawling dates
-        item['creation_date'] = creation_date.strftime('%d.%m.%Y')
-        last_modified = response.xpath('//meta[@property="article:modified"]/@content').get()
-        last_modified = datetime.fromisoformat(last_modified.split('T')[0])
-        item['last_modified'] = last_modified.strftime('%d.%m.%Y')
-        item['crawl_date'] = datetime.now().strftime('%d.%m.%Y')
+        item['creation_date'] = format_date(creation_date)
+        last_modified = fields.get('last_modified')
+        last_modified = parse_date(last_modified)
+        item['last_modified'] = format_date(last_modified)
+        item['crawl_date'] = crawl_date()
 
         # Get authors
-        authors = response.xpath('//meta[@property="article:author"]/@content').getall()
-        item['author_person'] = authors if authors else list() 
-        item['author_organization'] = list()
+        item['author_person'], item['author_organization'] = parse_authors(fields.getall('authors'))
        
         # Extract keywords, if available
-        news_keywords = response.xpath('//meta[@property="article:tag"]/@content').getall()
+        news_keywords = fields.getall('news_keywords')
         item['news_keywords'] = news_keywords if news_keywords else list()
 
         # Get title, description, and body of article
-        title = response.xpath('//meta[@property="og:title"]/@content').get().strip()
-        description = response.xpath('//meta[@property="og:description"]/@content').get().strip()
+        title = fields.get('title').strip()
+        description = fields.get('description').strip()
 
          # Body as dictionary: key = headline (if available, otherwise empty string), values = list of corresponding paragraphs
         body = dict()
@@ -101,7 +114,7 @@ class MotherJonesSpider(BaseSpider):
         item['content'] = {'title': title, 'description': description, 'body':body}
 
         # Recommendations to top 5 other related articles from the same outlet
-        recommendations = response.xpath('//li/div/a[contains(@data-ga-label, "RelatedArticle") and contains(@data-ga-label, "headline")]/@data-ga-action').getall()
+        recommendations = fields.getall('recommendations')
         item['recommendations'] = recommendations[:5] if recommendations else list()
 
         item['response_body'] = response.body
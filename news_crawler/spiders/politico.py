@@ -4,12 +4,12 @@ import os
 import sys
 from news_crawler.spiders import BaseSpider
 from scrapy.spiders import Rule 
-from scrapy.linkextractors import LinkExtractor
-from datetime import datetime
+from news_crawler.linkextractors import CompiledLinkExtractor
 
 sys.path.insert(0, os.path.join(os.getcwd(), "..",))
 from news_crawler.items import NewsCrawlerItem
-from news_crawler.utils import remove_empty_paragraphs
+from news_crawler.utils import remove_empty_paragraphs, parse_date, format_date, crawl_date
+from news_crawler.bylines import parse_authors
 
 class PoliticoSpider(BaseSpider):
     """ Spider for Politico"""
@@ -21,7 +21,7 @@ class PoliticoSpider(BaseSpider):
     # Exclude irelevant pages
     rules = (
             Rule(
-                LinkExtractor(
+                CompiledLinkExtractor(
                     allow=(r'www\.politico\.com\/news.*\/\w.*$'),
                     deny=(
                         r'www\.politico\.com\/minutes\/congress\/\w.*$',
@@ -51,20 +51,35 @@ class PoliticoSpider(BaseSpider):
                 ),
             )
 
+    # XPaths of the article's fields
+    extraction_spec = {
+            'creation_date': '//time/@datetime',
+            'paragraphs': '//p[contains(@class, "story-text__paragraph   ")] | //p[not(@*)]',
+            'authors': '//p[@class="story-meta__authors"]/span/a',
+            'authors_fallback': '//div[@itemprop="author"]/meta[@itemprop="name"]/@content',
+            'news_keywords': '//ul[@role="list" and @aria-label="Filed Under:"]/li[@class="story-tags__list-item"]/a | //ul[@class="categories-list"]/li/a',
+            'title': '//meta[@property="og:title"]/@content',
+            'description': '//meta[@property="og:description"]/@content',
+            'headlines': '//h3[contains(@class, "story-text__heading")] | //header[@class="block-header"]/h2',
+            'body': '//p[contains(@class, "story-text__paragraph   ")] | //p[not(@*)] | //h3[contains(@class, "story-text__heading")] | //header[@class="block-header"]/h2'
+            }
+
     def parse_item(self, response):
         """
         Checks article validity. If valid, it parses it.
         """
+        fields = self.extract(response)
 
-        creation_date = response.xpath('//time/@datetime').get()
+        creation_date = fields.get('creation_date')
         if not creation_date:
+            self.reject('no_date')
             return
-        creation_date = datetime.fromisoformat(creation_date)
+        creation_date = parse_date(creation_date)
         if self.is_out_of_date(creation_date):
             return
 
         # Extract the article's paragraphs
-        paragraphs = [node.xpath('string()').get().strip() for node in response.xpath('//p[contains(@class, "story-text__paragraph   ")] | //p[not(@*)]')]
+        paragraphs = fields.texts('paragraphs')
         paragraphs = remove_empty_paragraphs(paragraphs)
         text = ' '.join([para for para in paragraphs])
 
@@ -82,56 +97,31 @@ class PoliticoSpider(BaseSpider):
         item['news_outlet'] = 'politico'
         item['provenance'] = response.url
         item['query_keywords'] = self.get_query_keywords()
+        item['topics'] = self.get_topics()
 
         # Get creation, modification, and crawling dates
-        item['creation_date'] = creation_date.strftime('%d.%m.%Y')
-        item['last_modified'] = creation_date.strftime('%d.%m.%Y')
-        item['crawl_date'] = datetime.now().strftime('%d.%m.%Y')
+        item['creation_date'] = format_date(creation_date)
+        item['last_modified'] = format_date(creation_date)
+        item['crawl_date'] = crawl_date()
 
         # Get authors
-        authors = [node.xpath('string()').get().strip() for node in response.xpath('//p[@class="story-meta__authors"]/span/a')]
-        if not authors:
-            authors = response.xpath('//div[@itemprop="author"]/meta[@itemprop="name"]/@content').getall()
-        
-        if authors:
-            if not "Associated Press" in authors:
-                item['author_person'] = [author for author in authors]
-                item['author_organization'] = list()
-            else:
-                item['author_person'] = list()
-                item['author_organization'] = [author for author in authors]
-        else:
-            item['author_person'] = list()
-            item['author_organization'] = list()
+        item['author_person'], item['author_organization'] = parse_authors(fields.texts('authors') or fields.getall('authors_fallback'))
 
         # Extract keywords, if available
-        news_keywords = [node.xpath('string()').get().strip() for node in response.xpath('//ul[@role="list" and @aria-label="Filed Under:"]/li[@class="story-tags__list-item"]/a | //ul[@class="categories-list"]/li/a')]
+        news_keywords = fields.texts('news_keywords')
         item['news_keywords'] = news_keywords if news_keywords else list()
 
         # Get title, description, and body of article
-        title = response.xpath('//meta[@property="og:title"]/@content').get().strip()
-        description = response.xpath('//meta[@property="og:description"]/@content').get()
+        title = fields.get('title').strip()
+        description = fields.get('description')
         description = description.strip() if description else ''        
 
          # Body as dictionary: key = headline (if available, otherwise empty string), values = list of corresponding paragraphs
         body = dict()
         
-        if response.xpath('//h3[contains(@class, "story-text__heading")] | //header[@class="block-header"]/h2'):
-            # Extract headlines
-            headlines = [h3.xpath('string()').get().strip() for h3 in response.xpath('//h3[contains(@class, "story-text__heading")] | //header[@class="block-header"]/h2')]
-
-            # Extract paragraphs with headlines
-            text = [node.xpath('string()').get().strip() for node in response.xpath('//p[contains(@class, "story-text__paragraph   ")] | //p[not(@*)] | //h3[contains(@class, "story-text__heading")] | //header[@class="block-header"]/h2')]
-
-            # Extract paragraphs between the abstract and the first headline
-            body[''] = remove_empty_paragraphs(text[:text.index(headlines[0])])
-
-            # Extract paragraphs corresponding to each headline, except the last one
-            for i in range(len(headlines)-1):
-                body[headlines[i]] = remove_empty_paragraphs(text[text.index(headlines[i])+1:text.index(headlines[i+1])])
-
-            # Extract the paragraphs belonging to the last headline
-            body[headlines[-1]] = remove_empty_paragraphs(text[text.index(headlines[-1])+1:])
+        if fields.exists('headlines'):
+            # Extract paragraphs grouped by their preceding headline
+            body = fields.sections('body', 'headlines')
 
         else:
             # The article has no headlines, just paragraphs
@@ -4,12 +4,12 @@ import os
 import sys
 from news_crawler.spiders import BaseSpider
 from scrapy.spiders import Rule 
-from scrapy.linkextractors import LinkExtractor
-from datetime import datetime
+from news_crawler.linkextractors import CompiledLinkExtractor
 
 sys.path.insert(0, os.path.join(os.getcwd(), "..",))
 from news_crawler.items import NewsCrawlerItem
-from news_crawler.utils import remove_empty_paragraphs
+from news_crawler.utils import remove_empty_paragraphs, parse_date, format_date, crawl_date
+from news_crawler.bylines import parse_authors
 
 class RevealNewsSpider(BaseSpider):
     """ Spider for The Center for Investigative Reporting (CIR) """
@@ -21,7 +21,7 @@ class RevealNewsSpider(BaseSpider):
     # Exclude irelevant pages
     rules = (
             Rule(
-                LinkExtractor(
+                CompiledLinkExtractor(
                     allow=(r'revealnews\.org\/article\/\w.*$'),
                     deny=(
                         r'revealnews\.org\/podcast\/',
@@ -44,20 +44,35 @@ class RevealNewsSpider(BaseSpider):
                 ),
             )
 
+    # XPaths of the article's fields
+    extraction_spec = {
+            'creation_date': '//meta[@property="article:published_time"]/@content',
+            'paragraphs': '//p[not(@class) and not(ancestor::div[@class="wrapper"]) and not(ancestor::div[@class="author-bio"] and not(ancestor::div[@class="entry-wrapper"])) and not(descendant::aside/amp-analytics/script[@type="application/json"])] | //p[@data-ce-tag="paragraph" and contains(@class, "stk-reset wp-exclude-emoji")] | //p[@data-ce-tag="paragraph" and @class="stk-reset stk-theme_41108__mb_15 wp-exclude-emoji"]',
+            'last_modified': '//meta[@property="article:modified_time"]/@content',
+            'authors': '//span[@class="author vcard"]/a/text()',
+            'news_keywords': '//footer[@class="entry-footer"]/span[@class="tags-links"]/a[@rel="tag"]/text()',
+            'title': '//meta[@property="og:title"]/@content',
+            'description': '//meta[@name="description"]/@content',
+            'headlines': '//h3[not(@*)]',
+            'body': '//p[not(@class) and not(ancestor::div[@class="wrapper"]) and not(ancestor::div[@class="author-bio"] and not(ancestor::div[@class="entry-wrapper"])) and not(descendant::aside/amp-analytics/script[@type="application/json"])] | //p[@data-ce-tag="paragraph" and contains(@class, "stk-reset wp-exclude-emoji")] | //p[@data-ce-tag="paragraph" and @class="stk-reset stk-theme_41108__mb_15 wp-exclude-emoji"] | //h3[not(@*)]'
+            }
+
     def parse_item(self, response):
         """
         Checks article validity. If valid, it parses it.
         """
+        fields = self.extract(response)
 
-        creation_date = response.xpath('//meta[@property="article:published_time"]/@content').get()
+        creation_date = fields.get('creation_date')
         if not creation_date:
+            self.reject('no_date')
             return
-        creation_date = datetime.fromisoformat(creation_date.split('T')[0])
+        creation_date = parse_date(creation_date)
         if self.is_out_of_date(creation_date):
             return
 
         # Extract the article's paragraphs
-        paragraphs = [node.xpath('string()').get().strip() for node in response.xpath('//p[not(@class) and not(ancestor::div[@class="wrapper"]) and not(ancestor::div[@class="author-bio"] and not(ancestor::div[@class="entry-wrapper"])) and not(descendant::aside/amp-analytics/script[@type="application/json"])] | //p[@data-ce-tag="paragraph" and contains(@class, "stk-reset wp-exclude-emoji")] | //p[@data-ce-tag="paragraph" and @class="stk-reset stk-theme_41108__mb_15 wp-exclude-emoji"]')]
+        paragraphs = fields.texts('paragraphs')
         paragraphs = remove_empty_paragraphs(paragraphs)
         text = ' '.join([para for para in paragraphs])
 
@@ -75,46 +90,32 @@ class RevealNewsSpider(BaseSpider):
         item['news_outlet'] = 'reveal_news'
         item['provenance'] = response.url
         item['query_keywords'] = self.get_query_keywords()
+        item['topics'] = self.get_topics()
 
         # Get creation, modification, and crawling dates
-        item['creation_date'] = creation_date.strftime('%d.%m.%Y')
-        last_modified = response.xpath('//meta[@property="article:modified_time"]/@content').get()
-        last_modified = datetime.fromisoformat(last_modified.split('T')[0])
-        item['last_modified'] = last_modified.strftime('%d.%m.%Y')
-        item['crawl_date'] = datetime.now().strftime('%d.%m.%Y')
+        item['creation_date'] = format_date(creation_date)
+        last_modified = fields.get('last_modified')
+        last_modified = parse_date(last_modified)
+        item['last_modified'] = format_date(last_modified)
+        item['crawl_date'] = crawl_date()
 
         # Get authors
-        authors = response.xpath('//span[@class="author vcard"]/a/text()').getall()
-        item['author_person'] = authors if authors else list()
-        item['author_organization'] = list()
+        item['author_person'], item['author_organization'] = parse_authors(fields.getall('authors'))
        
         # Extract keywords, if available
-        news_keywords = response.xpath('//footer[@class="entry-footer"]/span[@class="tags-links"]/a[@rel="tag"]/text()').getall()
+        news_keywords = fields.getall('news_keywords')
         item['news_keywords'] = news_keywords if news_keywords else list()
 
         # Get title, description, and body of article
-        title = response.xpath('//meta[@property="og:title"]/@content').get().strip()
-        description = response.xpath('//meta[@name="description"]/@content').get().strip()
+        title = fields.get('title').strip()
+        description = fields.get('description').strip()
 
          # Body as dictionary: key = headline (if available, otherwise empty string), values = list of corresponding paragraphs
         body = dict()
         
-        if response.xpath('//h3[not(@*)]'):
-            # Extract headlines
-            headlines = [h3.xpath('string()').get().strip() for h3 in response.xpath('//h3[not(@*)]')]
-
-            # Extract paragraphs with headlines
-            text = [node.xpath('string()').get().strip() for node in response.xpath('//p[not(@class) and not(ancestor::div[@class="wrapper"]) and not(ancestor::div[@class="author-bio"] and not(ancestor::div[@class="entry-wrapper"])) and not(descendant::aside/amp-analytics/script[@type="application/json"])] | //p[@data-ce-tag="paragraph" and contains(@class, "stk-reset wp-exclude-emoji")] | //p[@data-ce-tag="paragraph" and @class="stk-reset stk-theme_41108__mb_15 wp-exclude-emoji"] | //h3[not(@*)]')]
-
-            # Extract paragraphs between the abstract and the first headline
-            body[''] = remove_empty_paragraphs(text[:text.index(headlines[0])])
-
-            # Extract paragraphs corresponding to each headline, except the last one
-            for i in range(len(headlines)-1):
-                body[headlines[i]] = remove_empty_paragraphs(text[text.index(headlines[i])+1:text.index(headlines[i+1])])
-
-            # Extract the paragraphs belonging to the last headline
-            body[headlines[-1]] = remove_empty_paragraphs(text[text.index(headlines[-1])+1:])
+        if fields.exists('headlines'):
+            # Extract paragraphs grouped by their preceding headline
+            body = fields.sections('body', 'headlines')
 
         else:
             # The article has no headlines, just paragraphs
@@ -4,12 +4,11 @@ import os
 import sys
 from news_crawler.spiders import BaseSpider
 from scrapy.spiders import Rule 
-from scrapy.linkextractors import LinkExtractor
-from datetime import datetime
+from news_crawler.linkextractors import CompiledLinkExtractor
 
 sys.path.insert(0, os.path.join(os.getcwd(), "..",))
 from news_crawler.items import NewsCrawlerItem
-from news_crawler.utils import remove_empty_paragraphs
+from news_crawler.utils import remove_empty_paragraphs, parse_date, format_date, crawl_date
 
 class TruthdigSpider(BaseSpider):
     """ Spider for Truthdig """
@@ -21,7 +20,7 @@ class TruthdigSpider(BaseSpider):
     # Exclude irelevant pages
     rules = (
             Rule(
-                LinkExtractor(
+                CompiledLinkExtractor(
                     allow=(r'www\.truthdig\.com\/\w.*$'),
                     deny=(
                         r'www\.truthdig\.com\/about-us\/',
@@ -37,20 +36,35 @@ class TruthdigSpider(BaseSpider):
                 ),
             )
 
+    # XPaths of the article's fields
+    extraction_spec = {
+            'creation_date': '//time[@class="article-item__date"]/@datetime',
+            'paragraphs': '//div[contains(@class, "article-item__content")]/p[not(@*)] | //blockquote/p[not(@*)] | //div/p[@data-pp-blocktype="copy"]',
+            'last_modified': '//meta[@property="article:modified_time"]/@content',
+            'authors': '//h5[@class="people__name people__name--no-divider"]/text() | //h5[contains(@class, "people__name")]/a/text()',
+            'news_keywords': '//div[@class="tags-list__list"]/a[@rel="tag"]/text()',
+            'title': '//meta[@property="og:title"]/@content',
+            'description': '//meta[@name="description"]/@content',
+            'headlines': '//h2[not(@*)]',
+            'body': '//div[contains(@class, "article-item__content")]/p[not(@*)] | //blockquote/p[not(@*)] | //div/p[@data-pp-blocktype="copy"] | //h2[not(@*)]'
+            }
+
     def parse_item(self, response):
         """
         Checks article validity. If valid, it parses it.
         """
+        fields = self.extract(response)
 
-        creation_date = response.xpath('//time[@class="article-item__date"]/@datetime').get()
+        creation_date = fields.get('creation_date')
         if not creation_date:
+            self.reject('no_date')
             return
-        creation_date = datetime.fromisoformat(creation_date.split(' ')[0])
+        creation_date = parse_date(creation_date)
         if self.is_out_of_date(creation_date):
             return
 
         # Extract the article's paragraphs
-        paragraphs = [node.xpath('string()').get().strip() for node in response.xpath('//div[contains(@class, "article-item__content")]/p[not(@*)] | //blockquote/p[not(@*)] | //div/p[@data-pp-blocktype="copy"]')]
+        paragraphs = fields.texts('paragraphs')
         paragraphs = remove_empty_paragraphs(paragraphs)
         text = ' '.join([para for para in paragraphs])
 
@@ -68,16 +82,17 @@ class TruthdigSpider(BaseSpider):
         item['news_outlet'] = 'truthdig'
         item['provenance'] = response.url
         item['query_keywords'] = self.get_query_keywords()
+        item['topics'] = self.get_topics()
 
         # Get creation, modification, and crawling dates
-        item['creation_date'] = creation_date.strftime('%d.%m.%Y')
-        last_modified = response.xpath('//meta[@property="article:modified_time"]/@content').get()
-        last_modified = datetime.fromisoformat(last_modified.split('T')[0])
-        item['last_modified'] = last_modified.strftime('%d.%m.%Y')
-        item['crawl_date'] = datetime.now().strftime('%d.%m.%Y')
+        item['creation_date'] = format_date(creation_date)
+        last_modified = fields.get('last_modified')
+        last_modified = parse_date(last_modified)
+        item['last_modified'] = format_date(last_modified)
+        item['crawl_date'] = crawl_date()
 
         # Get authors
-        authors = response.xpath('//h5[@class="people__name people__name--no-divider"]/text() | //h5[contains(@class, "people__name")]/a/text()').getall()
+        authors = fields.getall('authors')
         if authors:
             authors = [author.strip() for author in authors]
             authors = [author for author in authors if author != '']
@@ -107,32 +122,19 @@ class TruthdigSpider(BaseSpider):
             item['author_organization'] = list()
        
         # Extract keywords, if available
-        news_keywords = response.xpath('//div[@class="tags-list__list"]/a[@rel="tag"]/text()').getall()
+        news_keywords = fields.getall('news_keywords')
         item['news_keywords'] = news_keywords if news_keywords else list()
 
         # Get title, description, and body of article
-        title = response.xpath('//meta[@property="og:title"]/@content').get().strip()
-        description = response.xpath('//meta[@name="description"]/@content').get().strip()
+        title = fields.get('title').strip()
+        description = fields.get('description').strip()
 
          # Body as dictionary: key = headline (if available, otherwise empty string), values = list of corresponding paragraphs
         body = dict()
         
-        if response.xpath('//h2[not(@*)]'):
-            # Extract headlines
-            headlines = [h2.xpath('string()').get().strip() for h2 in response.xpath('//h2[not(@*)]')]
-
-            # Extract paragraphs with headlines
-            text = [node.xpath('string()').get().strip() for node in response.xpath('//div[contains(@class, "article-item__content")]/p[not(@*)] | //blockquote/p[not(@*)] | //div/p[@data-pp-blocktype="copy"] | //h2[not(@*)]')]
-
-            # Extract paragraphs between the abstract and the first headline
-            body[''] = remove_empty_paragraphs(text[:text.index(headlines[0])])
-
-            # Extract paragraphs corresponding to each headline, except the last one
-            for i in range(len(headlines)-1):
-                body[headlines[i]] = remove_empty_paragraphs(text[text.index(headlines[i])+1:text.index(headlines[i+1])])
-
-            # Extract the paragraphs belonging to the last headline
-            body[headlines[-1]] = remove_empty_paragraphs(text[text.index(headlines[-1])+1:])
+        if fields.exists('headlines'):
+            # Extract paragraphs grouped by their preceding headline
+            body = fields.sections('body', 'headlines')
 
         else:
             # The article has no headlines, just paragraphs
@@ -4,12 +4,11 @@ import os
 import sys
 from news_crawler.spiders import BaseSpider
 from scrapy.spiders import Rule 
-from scrapy.linkextractors import LinkExtractor
-from datetime import datetime
+from news_crawler.linkextractors import CompiledLinkExtractor
 
 sys.path.insert(0, os.path.join(os.getcwd(), "..",))
 from news_crawler.items import NewsCrawlerItem
-from news_crawler.utils import remove_empty_paragraphs
+from news_crawler.utils import remove_empty_paragraphs, parse_date, format_date, crawl_date
 
 class TruthoutSpider(BaseSpider):
     """ Spider for Truthout """
@@ -21,7 +20,7 @@ class TruthoutSpider(BaseSpider):
     # Exclude irelevant pages
     rules = (
             Rule(
-                LinkExtractor(
+                CompiledLinkExtractor(
                     allow=(r'truthout\.org\/articles\/\w.*$'),
                     deny=(
                         r'truthout\.org\/articles\/keeley-schenwar-memorial-essay-prize',
@@ -40,20 +39,37 @@ class TruthoutSpider(BaseSpider):
                 ),
             )
 
+    # XPaths of the article's fields
+    extraction_spec = {
+            'creation_date': '//time[@itemprop="datePublished dateCreated"]/@content',
+            'paragraphs': '//p[not(@*) and not(ancestor::div[@class="truth-post-content-after"]) and not(ancestor::div[@class="authorcontent columns"]) and not(ancestor::div[@class="textwidget custom-html-widget"]) and not(ancestor::div[@data-callout-id="modalSubscribe"])] | //ul[not(@*)]/li',
+            'last_modified': '//meta[@property="article:modified_time"]/@content',
+            'authors_person': '//dl[@class="article__authors byline" and not(ancestor::aside[@class="related articles"])]/dd[@itemprop="author"]/span/a[@rel="author"]/text()',
+            'authors_organization': '//dl[@class="article__authors byline" and not(ancestor::aside[@class="related articles"])]/dd[@itemprop="sourceOrganization"]/span/a/text()',
+            'news_keywords': '//article[@itemprop="mainEntity"]/@class',
+            'title': '//meta[@property="og:title"]/@content',
+            'description': '//meta[@name="description"]/@content',
+            'headlines': '//h2[not(@*)]',
+            'body': '//p[not(@*) and not(ancestor::div[@class="truth-post-content-after"]) and not(ancestor::div[@class="authorcontent columns"]) and not(ancestor::div[@class="textwidget custom-html-widget"]) and not(ancestor::div[@data-callout-id="modalSubscribe"])] | //ul[not(@*)]/li | //h2[not(@*)]',
+            'recommendations': '//aside[@class="related articles"]//a[@class="archive-image"]/@href'
+            }
+
     def parse_item(self, response):
         """
         Checks article validity. If valid, it parses it.
         """
+        fields = self.extract(response)
 
-        creation_date = response.xpath('//time[@itemprop="datePublished dateCreated"]/@content').get()
+        creation_date = fields.get('creation_date')
         if not creation_date:
+            self.reject('no_date')
             return
-        creation_date = datetime.fromisoformat(creation_date.split('T')[0])
+        creation_date = parse_date(creation_date)
         if self.is_out_of_date(creation_date):
             return
 
         # Extract the article's paragraphs
-        paragraphs = [node.xpath('string()').get().strip() for node in response.xpath('//p[not(@*) and not(ancestor::div[@class="truth-post-content-after"]) and not(ancestor::div[@class="authorcontent columns"]) and not(ancestor::div[@class="textwidget custom-html-widget"]) and not(ancestor::div[@data-callout-id="modalSubscribe"])] | //ul[not(@*)]/li')]
+        paragraphs = fields.texts('paragraphs')
         paragraphs = remove_empty_paragraphs(paragraphs)
         text = ' '.join([para for para in paragraphs])
 
@@ -71,22 +87,23 @@ class TruthoutSpider(BaseSpider):
         item['news_outlet'] = 'truthout'
         item['provenance'] = response.url
         item['query_keywords'] = self.get_query_keywords()
+        item['topics'] = self.get_topics()
 
         # Get creation, modification, and crawling dates
-        item['creation_date'] = creation_date.strftime('%d.%m.%Y')
-        last_modified = response.xpath('//meta[@property="article:modified_time"]/@content').get()
-        last_modified = datetime.fromisoformat(last_modified.split('T')[0])
-        item['last_modified'] = last_modified.strftime('%d.%m.%Y')
-        item['crawl_date'] = datetime.now().strftime('%d.%m.%Y')
+        item['creation_date'] = format_date(creation_date)
+        last_modified = fields.get('last_modified')
+        last_modified = parse_date(last_modified)
+        item['last_modified'] = format_date(last_modified)
+        item['crawl_date'] = crawl_date()
 
         # Get authors
-        authors_person = response.xpath('//dl[@class="article__authors byline" and not(ancestor::aside[@class="related articles"])]/dd[@itemprop="author"]/span/a[@rel="author"]/text()').getall()
-        authors_organization = response.xpath('//dl[@class="article__authors byline" and not(ancestor::aside[@class="related articles"])]/dd[@itemprop="sourceOrganization"]/span/a/text()').getall()
+        authors_person = fields.getall('authors_person')
+        authors_organization = fields.getall('authors_organization')
         item['author_person'] = authors_person if authors_person else list()
         item['author_organization'] = authors_organization if authors_organization else list()
        
         # Extract keywords, if available
-        news_keywords = response.xpath('//article[@itemprop="mainEntity"]/@class').get()
+        news_keywords = fields.get('news_keywords')
         if news_keywords:
             news_keywords = news_keywords.split(' ')
             news_keywords = [keyword for keyword in news_keywords if 'tag-' in keyword]
@@ -96,28 +113,15 @@ class TruthoutSpider(BaseSpider):
             item['news_keywords'] = list()
 
         # Get title, description, and body of article
-        title = response.xpath('//meta[@property="og:title"]/@content').get().strip()
-        description = response.xpath('//meta[@name="description"]/@content').get().strip()
+        title = fields.get('title').strip()
+        description = fields.get('description').strip()
 
          # Body as dictionary: key = headline (if available, otherwise empty string), values = list of corresponding paragraphs
         body = dict()
         
-        if response.xpath('//h2[not(@*)]'):
-            # Extract headlines
-            headlines = [h2.xpath('string()').get().strip() for h2 in response.xpath('//h2[not(@*)]')]
-
-            # Extract paragraphs with headlines
-            text = [node.xpath('string()').get().strip() for node in response.xpath('//p[not(@*) and not(ancestor::div[@class="truth-post-content-after"]) and not(ancestor::div[@class="authorcontent columns"]) and not(ancestor::div[@class="textwidget custom-html-widget"]) and not(ancestor::div[@data-callout-id="modalSubscribe"])] | //ul[not(@*)]/li | //h2[not(@*)]')]
-
-            # Extract paragraphs between the abstract and the first headline
-            body[''] = remove_empty_paragraphs(text[:text.index(headlines[0])])
-
-            # Extract paragraphs corresponding to each headline, except the last one
-            for i in range(len(headlines)-1):
-                body[headlines[i]] = remove_empty_paragraphs(text[text.index(headlines[i])+1:text.index(headlines[i+1])])
-
-            # Extract the paragraphs belonging to the last headline
-            body[headlines[-1]] = remove_empty_paragraphs(text[text.index(headlines[-1])+1:])
+        if fields.exists('headlines'):
+            # Extract paragraphs grouped by their preceding headline
+            body = fields.sections('body', 'headlines')
 
         else:
             # The article has no headlines, just paragraphs
@@ -126,7 +130,7 @@ class TruthoutSpider(BaseSpider):
         item['content'] = {'title': title, 'description': description, 'body':body}
 
         # There are no recommendations to other related articles
-        recommendations = response.xpath('//aside[@class="related articles"]//a[@class="archive-image"]/@href').getall()
+        recommendations = fields.getall('recommendations')
         item['recommendations'] = recommendations if recommendations else list()
 
         item['response_body'] = response.body
@@ -2,16 +2,15 @@
 
 import os
 import sys
-import json
 import unicodedata
 from news_crawler.spiders import BaseSpider
 from scrapy.spiders import Rule 
-from scrapy.linkextractors import LinkExtractor
-from datetime import datetime
+from news_crawler.linkextractors import CompiledLinkExtractor
 
 sys.path.insert(0, os.path.join(os.getcwd(), "..",))
 from news_crawler.items import NewsCrawlerItem
-from news_crawler.utils import remove_empty_paragraphs
+from news_crawler.utils import remove_empty_paragraphs, parse_date, format_date, crawl_date
+from news_crawler.bylines import parse_authors
 
 class USATodaySpider(BaseSpider):
     """ Spider for USA Today"""
@@ -23,7 +22,7 @@ class USATodaySpider(BaseSpider):
     # Exclude irelevant pages
     rules = (
             Rule(
-                LinkExtractor(
+                CompiledLinkExtractor(
                     allow=(r'eu\.usatoday\.com\/story\/\w.*$'),
                     deny=(
                         r'games\.usatoday\.com\/\w.*',
@@ -40,20 +39,42 @@ class USATodaySpider(BaseSpider):
                 ),
             )
 
+    # XPaths of the article's fields
+    extraction_spec = {
+            'creation_date': '//div[@class="publish-date"]/lit-timestamp/@publishdate',
+            'paragraphs': '//p[not(child::span) and not(child::em)] | //ul[preceding::p[not(child::span) and not(child::em)]]/li[not(@class)]',
+            'authors': '//div/span[@class="author"]/a/text()',
+            'title': '//meta[@property="og:title"]/@content',
+            'description': '//meta[@name="description"]/@content',
+            'headlines': '//h2',
+            'body': '//p[not(child::span) and not(child::em)] | //ul[preceding::p[not(child::span) and not(child::em)]]/li[not(@class)] | //h2'
+            }
+
+    # JSON-LD properties of the article's fields, preferred over their XPaths
+    structured_data_spec = {
+            'creation_date': 'datePublished',
+            'last_modified': 'dateModified',
+            'news_keywords': 'keywords',
+            'title': 'headline',
+            'description': 'description'
+            }
+
     def parse_item(self, response):
         """
         Checks article validity. If valid, it parses it.
         """
+        fields = self.extract(response)
 
-        creation_date = response.xpath('//div[@class="publish-date"]/lit-timestamp/@publishdate').get()
+        creation_date = fields.get('creation_date')
         if not creation_date:
+            self.reject('no_date')
             return
-        creation_date = datetime.fromisoformat(creation_date.split('T')[0])
+        creation_date = parse_date(creation_date)
         if self.is_out_of_date(creation_date):
             return
 
         # Extract the article's paragraphs
-        paragraphs = [node.xpath('string()').get().strip() for node in response.xpath('//p[not(child::span) and not(child::em)] | //ul[preceding::p[not(child::span) and not(child::em)]]/li[not(@class)]')]
+        paragraphs = fields.texts('paragraphs')
         paragraphs = [unicodedata.normalize('NFKD', paragraph) for paragraph in paragraphs]
         paragraphs = remove_empty_paragraphs(paragraphs)
         text = ' '.join([para for para in paragraphs])
@@ -72,51 +93,30 @@ class USATodaySpider(BaseSpider):
         item['news_outlet'] = 'usa_today'
         item['provenance'] = response.url
         item['query_keywords'] = self.get_query_keywords()
+        item['topics'] = self.get_topics()
 
         # Get creation, modification, and crawling dates
-        item['creation_date'] = creation_date.strftime('%d.%m.%Y')
-        item['last_modified'] = creation_date.strftime('%d.%m.%Y')
-        item['crawl_date'] = datetime.now().strftime('%d.%m.%Y')
+        item['creation_date'] = format_date(creation_date)
+        last_modified = fields.get('last_modified')
+        item['last_modified'] = format_date(parse_date(last_modified)) if last_modified else format_date(creation_date)
+        item['crawl_date'] = crawl_date()
 
         # Get authors
-        authors = response.xpath('//div/span[@class="author"]/a/text()').getall()
-        item['author_person'] = [author for author in authors] if authors else list()
-        item['author_organization'] = list()
+        item['author_person'], item['author_organization'] = parse_authors(fields.getall('authors'))
        
         # Extract keywords, if available
-        data_json = response.xpath('//script[@type="application/json"]/text()').get()
-        if data_json:
-            data = json.loads(data_json)
-            news_keywords = data['keywords']
-            item['news_keywords'] = [keyword for keyword in news_keywords if keyword!=''] 
-        else:
-            item['news_keywords'] = list()
+        item['news_keywords'] = fields.getall('news_keywords')
 
         # Get title, description, and body of article
-        title = response.xpath('//meta[@property="og:title"]/@content').get().strip()
-        description = response.xpath('//meta[@name="description"]/@content').get().strip()
+        title = fields.get('title').strip()
+        description = fields.get('description').strip()
 
          # Body as dictionary: key = headline (if available, otherwise empty string), values = list of corresponding paragraphs
         body = dict()
         
-        if response.xpath('//h2'):
-            # Extract headlines
-            headlines = [h2.xpath('string()').get().strip() for h2 in response.xpath('//h2')]
-            headlines = [h for h in headlines if h!='']
-
-            # Extract paragraphs with headlines
-            text = [node.xpath('string()').get().strip() for node in response.xpath('//p[not(child::span) and not(child::em)] | //ul[preceding::p[not(child::span) and not(child::em)]]/li[not(@class)] | //h2')]
-            text = [unicodedata.normalize('NFKD', paragraph) for paragraph in text]
-
-            # Extract paragraphs between the abstract and the first headline
-            body[''] = remove_empty_paragraphs(text[:text.index(headlines[0])])
-
-            # Extract paragraphs corresponding to each headline, except the last one
-            for i in range(len(headlines)-1):
-                body[headlines[i]] = remove_empty_paragraphs(text[text.index(headlines[i])+1:text.index(headlines[i+1])])
-
-            # Extract the paragraphs belonging to the last headline
-            body[headlines[-1]] = remove_empty_paragraphs(text[text.index(headlines[-1])+1:])
+        if fields.exists('headlines'):
+            # Extract paragraphs grouped by their preceding headline
+            body = fields.sections('body', 'headlines', normalize=lambda paragraph: unicodedata.normalize('NFKD', paragraph))
 
         else:
             # The article has no headlines, just paragraphs
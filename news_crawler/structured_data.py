@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+# Structured data (JSON-LD) extraction for news_crawler project
+
+import re
+import json
+from typing import Dict, Iterator, List, Optional
+
+# JSON-LD blocks, found directly in the response body, without parsing the HTML
+JSON_LD_RE = re.compile(rb'<script[^>]*\stype\s*=\s*["\']?application/ld\+json["\']?[^>]*>(.*?)</script\s*>', re.IGNORECASE | re.DOTALL)
+
+# Schema.org types describing an article
+ARTICLE_TYPES = {
+        'Article', 'NewsArticle', 'AnalysisNewsArticle', 'BackgroundNewsArticle', 'OpinionNewsArticle',
+        'ReportageNewsArticle', 'ReviewNewsArticle', 'BlogPosting', 'LiveBlogPosting', 'Report'
+        }
+
+
+def iter_json_ld(body: bytes) -> Iterator[Dict]:
+    """
+    Iterates over the objects of the JSON-LD blocks of a page, including the objects nested in lists and graphs.
+    Blocks which are not valid JSON are skipped.
+
+    Args:
+        body (:obj:`bytes`):
+            The response body.
+
+    Returns:
+        :obj:`Iterator[Dict]`:
+            The JSON-LD objects.
+    """
+    for match in JSON_LD_RE.finditer(body):
+        try:
+            data = json.loads(match.group(1).strip(), strict=False)
+        except ValueError:
+            continue
+        stack = [data]
+        while stack:
+            data = stack.pop(0)
+            if isinstance(data, list):
+                stack.extend(data)
+            elif isinstance(data, dict):
+                yield data
+                if isinstance(data.get('@graph'), list):
+                    stack.extend(data['@graph'])
+
+
+def find_article(body: bytes) -> Optional[Dict]:
+    """
+    Finds the JSON-LD object describing the article of a page.
+
+    Args:
+        body (:obj:`bytes`):
+            The response body.
+
+    Returns:
+        :obj:`Optional[Dict]`:
+            The first JSON-LD object of an article type (otherwise, the first object with a publication date),
+            or :obj:`None` if the page has none.
+    """
+    fallback = None
+    for data in iter_json_ld(body):
+        types = data.get('@type')
+        types = types if isinstance(types, list) else [types]
+        if any(t in ARTICLE_TYPES for t in types if isinstance(t, str)):
+            return data
+        if fallback is None and 'datePublished' in data:
+            fallback = data
+    return fallback
+
+
+def property_values(data: Optional[Dict], name: str) -> List[str]:
+    """
+    Returns the values of a property of a JSON-LD object as strings. Nested objects (e.g. authors) are represented
+    by their name, and comma-separated keywords are split.
+
+    Args:
+        data (:obj:`Optional[Dict]`):
+            The JSON-LD object.
+        name (:obj:`str`):
+            The property (e.g. `datePublished`, `author`, `keywords`).
+
+    Returns:
+        :obj:`List[str]`:
+            The non-empty values of the property.
+    """
+    if not data:
+        return list()
+
+    values = list()
+    stack = [data.get(name)]
+    while stack:
+        value = stack.pop(0)
+        if isinstance(value, list):
+            stack.extend(value)
+        elif isinstance(value, dict):
+            stack.append(value.get('name'))
+        elif isinstance(value, str):
+            if name == 'keywords':
+                values.extend(keyword.strip() for keyword in value.split(','))
+            else:
+                values.append(value.strip())
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            values.append(str(value))
+    return [value for value in values if value]
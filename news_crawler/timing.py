@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+# Timing of the article processing stages for news_crawler project
+
+import math
+from time import perf_counter
+from functools import wraps
+from contextlib import contextmanager
+from typing import Dict, List, Sequence
+
+# Percentiles of the latencies reported per stage
+PERCENTILES = (50, 90, 99)
+
+
+class LatencyHistogram(object):
+    """
+    Histogram of latencies with logarithmic buckets, such that recording a latency takes constant time and memory,
+    and percentiles are estimated within the bucket resolution.
+
+    Args:
+        resolution (:obj:`float`):
+            Relative width of the buckets (e.g. 0.05 for 5%).
+        min_latency (:obj:`float`):
+            Lower bound (in seconds) of the first bucket.
+    """
+
+    def __init__(self, resolution: float = 0.05, min_latency: float = 1e-6):
+        self.log_base = math.log1p(resolution)
+        self.min_latency = min_latency
+        self.buckets: Dict[int, int] = dict()
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, latency: float):
+        bucket = int(math.log(latency / self.min_latency) / self.log_base) if latency > self.min_latency else 0
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += latency
+        if latency > self.max:
+            self.max = latency
+
+    def percentile(self, percentile: float) -> float:
+        """ Returns the upper bound of the bucket holding the percentile, in seconds. """
+        rank = math.ceil(self.count * percentile / 100)
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return min(self.min_latency * math.exp((bucket + 1) * self.log_base), self.max)
+        return self.max
+
+    def cumulative_counts(self, bounds: Sequence[float]) -> List[int]:
+        """
+        Returns the number of latencies up to each bound (in seconds), e.g. for the buckets of a Prometheus histogram.
+
+        The buckets below a bound are counted in full. The bucket straddling a bound is split in proportion to the part of
+        its range below the bound, assuming its latencies are spread uniformly on the logarithmic scale (linearly in the
+        first bucket, which starts at 0). Hence only the latencies of the straddling bucket, i.e. within `resolution` of
+        the bound, may be misattributed: the error on each count is at most the count of that bucket, and close to 0 when
+        the latencies are smoothly distributed.
+        """
+        counts = [0.0] * len(bounds)
+        for bucket, count in self.buckets.items():
+            lower = self.min_latency * math.exp(bucket * self.log_base) if bucket else 0.0
+            upper = self.min_latency * math.exp((bucket + 1) * self.log_base)
+            for i, bound in enumerate(bounds):
+                if upper <= bound:
+                    counts[i] += count
+                elif lower < bound:
+                    if lower > 0:
+                        counts[i] += count * math.log(bound / lower) / math.log(upper / lower)
+                    else:
+                        counts[i] += count * bound / upper
+        return [int(round(count)) for count in counts]
+
+
+class StageTimings(object):
+    """ Latency histograms of the stages an article goes through (e.g. download, date gate, keyword validation, pipelines). """
+
+    def __init__(self):
+        self.stages: Dict[str, LatencyHistogram] = dict()
+
+        # End of the last timed spider method (e.g. the keyword validation), from which the item is built
+        self.last_method_end = 0.0
+
+    def record(self, stage: str, latency: float):
+        if stage not in self.stages:
+            self.stages[stage] = LatencyHistogram()
+        self.stages[stage].record(latency)
+
+    @contextmanager
+    def time(self, stage: str):
+        """ Records the time spent in the block under the given stage. """
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, perf_counter() - start)
+
+    def summary(self, prefix: str = 'timing') -> Dict[str, float]:
+        """
+        Summarizes the latencies of each stage.
+
+        Args:
+            prefix (:obj:`str`):
+                Prefix of the summary keys.
+
+        Returns:
+            :obj:`Dict[str, float]`:
+                Count, total, maximum, and percentile latencies (in seconds) of each stage, e.g. `timing/keywords/p99`.
+        """
+        summary = dict()
+        for stage, histogram in self.stages.items():
+            key = '{}/{}/'.format(prefix, stage)
+            summary[key + 'count'] = histogram.count
+            summary[key + 'total'] = round(histogram.total, 6)
+            summary[key + 'max'] = round(histogram.max, 6)
+            for percentile in PERCENTILES:
+                summary[key + 'p{}'.format(percentile)] = round(histogram.percentile(percentile), 6)
+        return summary
+
+
+def timed(stage: str):
+    """
+    Decorates a spider method, such that its latency is recorded under the given stage whenever the spider is timed
+    (i.e. its `timings` are set by the :obj:`StageTimingExtension`).
+
+    Args:
+        stage (:obj:`str`):
+            The name of the stage.
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if self.timings is None:
+                return method(self, *args, **kwargs)
+            start = perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                end = perf_counter()
+                self.timings.record(stage, end - start)
+                self.timings.last_method_end = end
+        return wrapper
+    return decorator
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+# Topic profiles for news_crawler project
+
+from scrapy.exceptions import NotConfigured
+from news_crawler.utils import DATE_FORMAT, parse_date
+from typing import Dict, List
+
+# Settings of a topic profile, defaulting to the project-wide settings
+PROFILE_SETTINGS = ('START_DATE', 'END_DATE', 'ARTICLE_LENGTH', 'KEYWORDS', 'KEYWORDS_MIN_FREQUENCY', 'KEYWORDS_MIN_DISTANCE')
+
+
+class TopicProfile(object):
+    """
+    Relevance criteria of the articles of a topic.
+
+    Args:
+        name (:obj:`str`):
+            The name of the topic, i.e. the folder of its articles (`data/$TOPIC`).
+        start_date (:obj:`str`):
+            The date from which an article is relevant.
+        end_date (:obj:`str`):
+            The date until which an article is relevant.
+        article_length (:obj:`int`):
+            Minimum article length required.
+        keywords (:obj:`List[str]`):
+            Query keyword stems, single-token (e.g. refugee) or compound (e.g. asylum seeker).
+        keywords_min_frequency (:obj:`int`):
+            Minimum number of keyword stems that should be contained in a relevant article.
+        keywords_min_distance (:obj:`int`):
+            Minimum token difference between any two words containing a keyword stem.
+    """
+
+    def __init__(self, name: str, start_date: str, end_date: str, article_length: int, keywords: List[str],
+            keywords_min_frequency: int, keywords_min_distance: int):
+        self.name = name
+        self.start_date = parse_date(start_date, DATE_FORMAT)
+        self.end_date = parse_date(end_date, DATE_FORMAT)
+
+        # Compare the articles' dates as ordinals, regardless of their time
+        self.start_ordinal = self.start_date.toordinal()
+        self.end_ordinal = self.end_date.toordinal()
+
+        self.article_length = article_length
+
+        # Separate single-token and multiple-token keywords (e.g. bedingungslos* einkommen*)
+        self.compound_keywords = [keyword for keyword in keywords if len(keyword.split())>1]
+        self.keywords = [keyword for keyword in keywords if not keyword in self.compound_keywords]
+
+        self.keywords_min_frequency = keywords_min_frequency
+        self.keywords_min_distance = keywords_min_distance
+
+    def is_in_date_range(self, ordinal: int) -> bool:
+        """ Check if the ordinal of the article's date is in the topic's date range. """
+        return self.start_ordinal <= ordinal <= self.end_ordinal
+
+
+def load_topic_profiles(settings) -> List[TopicProfile]:
+    """
+    Returns the profiles of the crawled topics: the crawl's topic (`TOPIC`), followed by the additional topics of the
+    `TOPICS` setting. The settings of each topic default to the project-wide ones (e.g. `KEYWORDS`).
+
+    Args:
+        settings (:obj:`Settings`):
+            The settings of the crawl.
+
+    Returns:
+        :obj:`List[TopicProfile]`:
+            The topic profiles, the crawl's topic first.
+    """
+    topics: Dict[str, Dict] = {settings.get('TOPIC'): dict()}
+    topics.update(settings.getdict('TOPICS'))
+
+    profiles = list()
+    for (name, overrides) in topics.items():
+        values = {setting: overrides.get(setting, settings.get(setting)) for setting in PROFILE_SETTINGS}
+        if not name or not all(values.values()):
+            raise NotConfigured('Topic {!r} requires the settings {}.'.format(name, ', '.join(PROFILE_SETTINGS)))
+
+        keywords = values['KEYWORDS']
+        if isinstance(keywords, str):
+            keywords = keywords.split(',')
+
+        profiles.append(TopicProfile(name, values['START_DATE'], values['END_DATE'], int(values['ARTICLE_LENGTH']), list(keywords),
+                int(values['KEYWORDS_MIN_FREQUENCY']), int(values['KEYWORDS_MIN_DISTANCE'])))
+    return profiles
@@ -1,7 +1,10 @@
 # -*- coding: utf-8 -*-
 # Utils for news_crawler project
 
-from typing import List
+from time import time
+from functools import lru_cache
+from datetime import datetime, timedelta
+from typing import List, Optional
 
 
 def remove_empty_paragraphs(paragraphs: List[str]) -> List[str]:
@@ -17,3 +20,63 @@ def remove_empty_paragraphs(paragraphs: List[str]) -> List[str]:
             The list of paragraphs without empty paragraphs.
     """
     return [para for para in paragraphs if para != ' ' and para != '']
+
+
+# Output format of all dates
+DATE_FORMAT = '%d.%m.%Y'
+
+
+@lru_cache(maxsize=4096)
+def parse_date(date: str, date_format: Optional[str] = None) -> datetime:
+    """
+    Parses a date, memoizing the result, since many articles of an outlet share the same dates.
+
+    Args:
+        date (:obj:`str`):
+            The date, e.g. `2021-05-03T10:00:00Z` or `May 3, 2021`.
+        date_format (:obj:`Optional[str]`):
+            The format of the date (e.g. `%B %d, %Y`). If :obj:`None`, the date starts with an ISO 8601 date, and the time is ignored.
+
+    Returns:
+        :obj:`datetime`:
+            The parsed date.
+    """
+    if date_format is None:
+        return datetime.fromisoformat(date.strip()[:10])
+    return datetime.strptime(date, date_format)
+
+
+@lru_cache(maxsize=4096)
+def format_date(date: datetime) -> str:
+    """
+    Formats a date in the output format of the crawler (i.e. `DATE_FORMAT`).
+
+    Args:
+        date (:obj:`datetime`):
+            The date.
+
+    Returns:
+        :obj:`str`:
+            The formatted date.
+    """
+    return date.strftime(DATE_FORMAT)
+
+
+class _CrawlDate(object):
+    """ The current date, formatted once per day. """
+
+    def __init__(self):
+        self.date = None
+        self.expires = 0
+
+    def __call__(self) -> str:
+        now = time()
+        if now >= self.expires:
+            today = datetime.fromtimestamp(now)
+            self.date = format_date(today)
+            self.expires = datetime.combine(today.date() + timedelta(days=1), datetime.min.time()).timestamp()
+        return self.date
+
+
+# Returns the crawl date of an article, i.e. the current date in the output format
+crawl_date = _CrawlDate()
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+
+from news_crawler.dedup import MinHasher, MinHashLSHIndex
+
+TEXT = ' '.join('word{}'.format(i) for i in range(200))
+
+
+def test_reopened_index_does_not_match_the_same_url(tmp_path):
+    path = str(tmp_path / 'near_duplicates.jsonl')
+    hasher = MinHasher()
+    signature = hasher.signature(TEXT)
+
+    index = MinHashLSHIndex(path, num_perm=hasher.num_perm)
+    index.add(signature, 'http://x/a')
+    index.close()
+
+    index = MinHashLSHIndex(path, num_perm=hasher.num_perm)
+    assert index.query(signature, 'http://x/a') is None
+    assert index.query(signature, 'http://x/b') == 'http://x/a'
+    index.close()
+
+
+def test_readded_url_replaces_its_entry(tmp_path):
+    path = str(tmp_path / 'near_duplicates.jsonl')
+    hasher = MinHasher()
+    old, new = hasher.signature(TEXT), hasher.signature('other ' * 50 + TEXT[:200])
+
+    index = MinHashLSHIndex(path, num_perm=hasher.num_perm)
+    index.add(old, 'http://x/a')
+    index.add(new, 'http://x/a')
+    index.close()
+
+    index = MinHashLSHIndex(path, num_perm=hasher.num_perm)
+    assert len(index) == 1
+    assert index.query(old, 'http://x/b') is None
+    assert index.query(new, 'http://x/b') == 'http://x/a'
+    index.close()
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+
+import json
+from scrapy import Request
+from scrapy.http import HtmlResponse
+from scrapy.spiders import Rule
+from scrapy.utils.test import get_crawler
+from news_crawler.middlewares import ConditionalRequestMiddleware
+
+VALIDATORS = json.dumps({'etag': '"abc"', 'last_modified': None})
+
+
+class RecrawlSpider(object):
+    name = 'recrawl'
+    recrawl = True
+    _rules = [Rule(callback='parse_item'), Rule(follow=True)]
+
+
+def middleware(urls):
+    mw = ConditionalRequestMiddleware(get_crawler().stats, 'topic')
+    mw.recrawl = True
+    mw.db = {url: VALIDATORS for url in urls}
+    return mw
+
+
+def test_start_page_is_downloaded_and_followed():
+    spider, url = RecrawlSpider(), 'http://x/'
+    mw = middleware([url])
+    request = Request(url)
+    mw.process_request(request, spider)
+    assert b'If-None-Match' not in request.headers
+
+    # A start page answered with 304 (e.g. by a cache in between) is passed on, not ignored
+    response = HtmlResponse(url=url, status=304, request=request)
+    assert mw.process_response(request, response, spider) is response
+
+
+def test_only_article_pages_are_requested_conditionally():
+    spider = RecrawlSpider()
+    mw = middleware(['http://x/article', 'http://x/section'])
+    article = Request('http://x/article', meta={'rule': 0})
+    section = Request('http://x/section', meta={'rule': 1})
+    mw.process_request(article, spider)
+    mw.process_request(section, spider)
+    assert article.headers[b'If-None-Match'] == b'"abc"'
+    assert b'If-None-Match' not in section.headers
@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+
+from scrapy.http import HtmlResponse
+from news_crawler.spiders.oann import OANNSpider
+
+TEXT = ' '.join(['refugee'] + ['word'] * 100 + ['immigration'] + ['word'] * 100)
+
+
+def oann_item(first_paragraph: str):
+    body = (
+            '<html><head><meta property="og:article:published_time" content="2021-05-01T10:00:00+00:00">'
+            '<meta property="og:article:modified_time" content="2021-05-02T10:00:00+00:00">'
+            '<meta property="og:title" content="Title"><meta name="description" content="Description"></head>'
+            '<body><div class="entry-content clearfix"><p>{}</p><p>{}</p></div></body></html>'
+            ).format(first_paragraph, TEXT)
+    response = HtmlResponse(url='https://www.oann.com/article/', body=body, encoding='utf-8')
+    return next(OANNSpider().parse_item(response))
+
+
+def test_oann_byline_paragraph_is_parsed():
+    item = oann_item('By Jane Doe and The Associated Press')
+    assert item['author_person'] == ['Jane Doe']
+    assert item['author_organization'] == ['The Associated Press']
+
+
+def test_oann_dateline_paragraph_is_not_an_author():
+    item = oann_item('WASHINGTON, D.C. (AP) - Lawmakers and officials met on Monday to discuss refugee policy.')
+    assert item['author_person'] == []
+    assert item['author_organization'] == []
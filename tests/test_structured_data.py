@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+
+import json
+from scrapy.http import HtmlResponse
+from news_crawler.spiders.daily_wire import DailyWireSpider
+
+TEXT = ' '.join(['refugee'] + ['word'] * 100 + ['immigration'] + ['word'] * 100)
+
+
+def daily_wire_response(date: str, members_only: bool = False) -> HtmlResponse:
+    article = {'@type': 'NewsArticle', 'datePublished': date, 'dateModified': date, 'headline': 'Headline',
+            'description': 'Description', 'keywords': 'refugees,border'}
+    data = {'props': {'pageProps': {'post': {'members_only': members_only}}}}
+    body = (
+            '<html><head><script type="application/ld+json">{}</script><meta property="og:title" content="Title">'
+            '<script type="application/json">{}</script></head><body><div id="post-body-text"><p>{}</p></div></body></html>'
+            ).format(json.dumps(article), json.dumps(data), TEXT)
+    return HtmlResponse(url='https://www.dailywire.com/news/article', body=body, encoding='utf-8')
+
+
+def test_daily_wire_fields_from_structured_data():
+    item = next(DailyWireSpider().parse_item(daily_wire_response('2021-05-01T10:00:00Z')))
+    assert item['content']['title'] == 'Headline'
+    assert item['content']['description'] == 'Description'
+    assert item['news_keywords'] == ['refugees', 'border']
+
+
+def test_daily_wire_out_of_date_article_is_rejected_without_parsing_the_html():
+    response = daily_wire_response('2019-05-01T10:00:00Z', members_only=True)
+    assert list(DailyWireSpider().parse_item(response)) == []
+    assert getattr(response, '_cached_selector', None) is None
+
+
+def test_daily_wire_members_only_article_is_rejected():
+    assert list(DailyWireSpider().parse_item(daily_wire_response('2021-05-01T10:00:00Z', members_only=True))) == []